@@ -1,18 +1,16 @@
-from flask import Flask, jsonify, request, render_template, make_response
+from flask import Flask, jsonify, request, render_template, make_response, Response, send_file
 from flask_cors import CORS
 from generators.question_generator import QuestionGenerator
 from utils.evaluator import QuestionEvaluator
 from utils.question_db_manager import QuestionDBManager
+from utils.pdf_exporter import PDFExporter, PDFCatalogue
+from utils.job_queue import JobManager, JobQueueFullError
+from utils.metrics import MetricsRegistry
+import os
 import random
-from datetime import datetime
-from io import BytesIO
-
-# Importuri Reportlab pentru PDF
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT
+import shutil
+import threading
+from datetime import datetime, timedelta
 
 app = Flask(__name__)
 CORS(app)
@@ -26,9 +24,419 @@ DB_CONFIG = {
     'port': 5433
 }
 
-generator = QuestionGenerator()
-evaluator = QuestionEvaluator()
-db_manager = QuestionDBManager(DB_CONFIG)
+# Pool de conexiuni - reutilizăm conexiunile în loc de un handshake la fiecare cerere.
+# Sub gunicorn, max_size e partea fiecărui worker din bugetul de conexiuni (gunicorn.conf.py)
+DB_POOL_MAX_SIZE = int(os.environ.get('SMARTEST_DB_POOL_MAX_SIZE', 20))
+DB_POOL_CONFIG = {
+    'min_size': min(2, DB_POOL_MAX_SIZE),
+    'max_size': DB_POOL_MAX_SIZE,
+    'timeout': 10.0,
+    'max_idle_time': 300.0,
+    'max_lifetime': 3600.0,
+    'health_check_interval': 30.0
+}
+
+# Cache read-through pentru întrebări (citiri după ID). Fiecare worker are propriul cache;
+# ștergerile din alți workeri sunt observate după cel mult 'generation_check_interval'
+# secunde. Pentru un cache comun tuturor workerilor se adaugă 'shared_store' - un client
+# real (Redis/Memcached) cu get/set/delete/delete_prefix, nu LocalSharedStore.
+QUESTION_CACHE_CONFIG = {
+    'max_size': 5000,
+    'ttl': 600.0,
+    'generation_check_interval': 1.0
+}
+
+# Paginare pentru /api/questions
+QUESTIONS_PAGE_SIZE = 50
+QUESTIONS_MAX_PAGE_SIZE = 200
+
+# Sămânța de bază a generatorului: universul Nash e identic în toate procesele,
+# deci titlurile identifică unic jocurile și universul poate fi memoizat
+GENERATOR_SEED = 20240101
+
+# Export PDF: rânduri citite per bucată din cursorul pe server
+PDF_EXPORT_ITERSIZE = 500
+# Numărul maxim de ID-uri acceptate în filtrul `ids` al exportului
+PDF_EXPORT_MAX_IDS = 1000
+
+# PDF-ul complet se păstrează aici și se refolosește cât timp banca nu se schimbă
+PDF_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdf_cache')
+
+# Joburi în fundal: starea și rezultatele se păstrează pe disc în JOBS_DIR.
+# concurrency = câte joburi de acel tip rulează simultan; max_pending = limita cozii.
+JOBS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs')
+JOB_RESULT_TTL = 3600.0
+JOB_LIMITS = {
+    'export_pdf': {'concurrency': 1, 'max_pending': 5},
+    'batch_generate': {'concurrency': 2, 'max_pending': 20}
+}
+# /api/batch-generate cu mai multe întrebări decât atât rulează ca job
+BATCH_ASYNC_THRESHOLD = 200
+
+# Sesiunile de test (cheia de răspuns precalculată) expiră după atâtea secunde
+TEST_SESSION_TTL = 24 * 3600
+
+# Metrici: /metrics (format text Prometheus) este mereu disponibil; cu True, fiecare
+# răspuns primește și header-ul Server-Timing (db, generator, evaluator, total)
+SERVER_TIMING_HEADER = False
+
+# Registrul de metrici al procesului (fără resurse externe, sigur înainte de fork)
+metrics = MetricsRegistry()
+
+# Serviciile sunt construite de create_app() (partajate între workeri după fork),
+# iar cele legate de proces (cache-ul PDF, joburile) de init_worker()
+generator = None
+evaluator = None
+db_manager = None
+pdf_exporter = None
+pdf_catalogue = None
+job_manager = None
+
+
+# ============= OPERAȚII LUNGI (SINCRON SAU CA JOB) =============
+
+def run_batch_generate(data, progress=None):
+    """
+    Generează întrebări unice alegând din lista celor disponibile.
+    Folosită direct de ruta /api/batch-generate (cereri mici) și de jobul 'batch_generate'.
+    progress: opțional, funcție progress(done, total, message) pentru raportare
+    """
+    q_type = data.get('type', 'random')
+    count = data.get('count', 1)
+
+    # Opțional: altă sămânță pentru tipurile Nash (jocuri noi, titluri sufixate cu S<seed>)
+    seed = data.get('seed')
+
+    # Opțional pentru Nash: distribuția dorită a numărului de echilibre, ex. {"0": 1, "1": 2, "2": 1}.
+    # Jocurile sunt atunci construite direct cu numărul cerut de echilibre.
+    nash_distribution = data.get('nash_distribution') if q_type == 'nash' else None
+
+    def report(done, total, message):
+        if progress:
+            progress(done, total, message)
+
+    # 1. Obține specificațiile întrebărilor posibile (Universul, doar titluri - fără texte)
+    report(0, None, 'Se pregătesc întrebările posibile')
+    with metrics.track('generator', 'specs'):
+        if nash_distribution:
+            all_possible = list(generator.nash_generator.iter_targeted_nash_specs(
+                equilibrium_counts=[int(k) for k in nash_distribution],
+                seed=seed
+            ))
+        else:
+            all_possible = list(generator.iter_specs(q_type, seed=seed))
+
+    # 2. Filtrează pe server titlurile care există deja în DB (anti-join)
+    new_titles = set(db_manager.filter_new_titles(spec['title'] for spec in all_possible))
+    possible_new_questions = [spec for spec in all_possible if spec['title'] in new_titles]
+
+    # 3. Alege un subset de dimensiunea 'count' și construiește doar textele acestora
+    if nash_distribution:
+        selected_specs = generator.nash_generator.sample_by_distribution(
+            possible_new_questions, count, nash_distribution, rng=random
+        )
+    elif len(possible_new_questions) > count:
+        selected_specs = random.sample(possible_new_questions, count)
+    else:
+        selected_specs = possible_new_questions
+
+    questions_to_save = []
+    for spec in selected_specs:
+        with metrics.track('generator', 'render'):
+            questions_to_save.append(generator.render(spec))
+        report(len(questions_to_save), len(selected_specs), 'Se generează textele întrebărilor')
+
+    # 4. Salvează în DB într-o singură tranzacție (duplicatele apărute între timp sunt raportate)
+    report(len(questions_to_save), len(selected_specs), 'Se salvează în baza de date')
+    save_result = db_manager.save_questions_bulk(questions_to_save)
+    saved_count = save_result['saved_count']
+
+    return {
+        'success': True,
+        'message': f'Am generat și salvat {saved_count} întrebări noi. {len(possible_new_questions) - saved_count} întrebări posibile rămase din tipul {q_type}.',
+        'saved_count': saved_count,
+        'conflicts': save_result['conflicts']
+    }
+
+
+def batch_generate_job(job, data):
+    """Jobul 'batch_generate' - rulează generarea în fundal cu raportarea progresului"""
+    return run_batch_generate(
+        data,
+        progress=lambda done, total, message: job.update_progress(done, total, message)
+    )
+
+
+def log_pdf_question_error(index, q_error):
+    app.logger.error(f"Eroare la procesarea întrebării {index}: {q_error}")
+
+
+def parse_export_filters(params):
+    """
+    Citește filtrele exportului PDF din query string (sau din corpul JSON al unui POST).
+    Parametri: type (unul sau mai multe, separate prin virgulă), ids (listă de ID-uri),
+    date_from / date_to (YYYY-MM-DD, inclusiv), limit (număr maxim), answers (0 = fără răspunsuri).
+    Returnează (filtre pentru iter_questions_full, include_answers); ValueError pentru valori invalide.
+    """
+    def as_list(value):
+        if value is None or value == '':
+            return []
+        if isinstance(value, (list, tuple)):
+            return [str(v).strip() for v in value if str(v).strip()]
+        return [v.strip() for v in str(value).split(',') if v.strip()]
+
+    def as_date(name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.strptime(str(value), '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"{name} trebuie să aibă formatul YYYY-MM-DD")
+
+    filters = {}
+
+    q_types = as_list(params.get('type'))
+    if q_types:
+        filters['q_types'] = q_types
+
+    ids = as_list(params.get('ids'))
+    if ids:
+        try:
+            filters['ids'] = [int(v) for v in ids]
+        except ValueError:
+            raise ValueError("ids trebuie să conțină doar numere")
+        if len(filters['ids']) > PDF_EXPORT_MAX_IDS:
+            raise ValueError(f"Maxim {PDF_EXPORT_MAX_IDS} ID-uri per export")
+
+    date_from = as_date('date_from')
+    date_to = as_date('date_to')
+    if date_from:
+        filters['date_from'] = date_from
+    if date_to:
+        # date_to este inclusiv: filtrul SQL folosește < ziua următoare
+        filters['date_to'] = date_to + timedelta(days=1)
+
+    if params.get('limit') not in (None, ''):
+        try:
+            limit = int(params.get('limit'))
+        except (TypeError, ValueError):
+            raise ValueError("limit trebuie să fie un număr")
+        if limit < 1:
+            raise ValueError("limit trebuie să fie cel puțin 1")
+        filters['limit'] = limit
+
+    include_answers = str(params.get('answers', '1')).lower() not in ('0', 'false', 'no')
+    return filters, include_answers
+
+
+def export_pdf_names(include_answers):
+    """(titlul documentului, numele fișierului) pentru un export filtrat"""
+    if include_answers:
+        return "Intrebari SmartTest AI - Export Filtrat", 'SmartTest_Questions_Filtered.pdf'
+    return "Test SmartTest AI", 'SmartTest_Test.pdf'
+
+
+def export_pdf_job(job, filters=None, include_answers=True):
+    """
+    Jobul 'export_pdf' - scrie PDF-ul în fișierul rezultat al jobului.
+    Exportul complet refolosește PDF-ul din cache dacă banca nu s-a schimbat;
+    exporturile filtrate sunt randate direct (sunt de regulă mici).
+    """
+    filters = filters or {}
+    full_export = not filters and include_answers
+
+    if full_export:
+        fingerprint, total = db_manager.get_catalogue_fingerprint()
+    else:
+        total = db_manager.count_export_questions(**filters)
+    if total == 0:
+        raise ValueError('Nu există întrebări de exportat')
+
+    def tracked_rows():
+        # Progresul = rânduri citite din cursorul pe server (ReportLab le consumă pe rând)
+        rows = db_manager.iter_questions_full(itersize=PDF_EXPORT_ITERSIZE, **filters)
+        try:
+            for done, row in enumerate(rows, 1):
+                job.update_progress(done, total, 'Se generează PDF-ul')
+                yield row
+        finally:
+            rows.close()
+
+    if full_export:
+        pdf_file, entry = pdf_catalogue.open(fingerprint, tracked_rows, on_error=log_pdf_question_error)
+        with pdf_file, open(job.result_path('pdf'), 'wb') as result_file:
+            shutil.copyfileobj(pdf_file, result_file)
+        job.update_progress(total, total, force=True)
+        return {'filename': 'SmartTest_Questions.pdf', 'count': total, 'etag': entry['etag']}
+
+    title, filename = export_pdf_names(include_answers)
+    rows = tracked_rows()
+    try:
+        pdf_exporter.build(rows, job.result_path('pdf'), on_error=log_pdf_question_error,
+                           include_answers=include_answers, title=title)
+    finally:
+        rows.close()
+    return {'filename': filename, 'count': total}
+
+
+def submit_job(job_type, **params):
+    """Trimite un job și construiește răspunsul 202 (sau 429 dacă coada e plină)"""
+    try:
+        job_id = job_manager.submit(job_type, **params)
+    except JobQueueFullError as e:
+        return jsonify({'error': str(e)}), 429
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': f'/api/jobs/{job_id}'
+    }), 202
+
+
+# ============= LOGICĂ COMUNĂ (MODUL SINCRON ȘI ASGI) =============
+# Funcții fără I/O folosite atât de rutele Flask de mai jos, cât și de rutele async din asgi.py
+
+def public_question(question):
+    """Întrebarea fără câmpurile sensibile (răspuns, explicație), pentru client"""
+    return {k: v for k, v in question.items() if k not in ('correct_answer', 'explanation')}
+
+
+def public_test_question(q):
+    """Câmpurile necesare frontend-ului într-un test: id, title, question, type"""
+    return {'id': q['id'], 'title': q['title'], 'question': q['question'], 'type': q['type']}
+
+
+def evaluate_single_answer(q_id, user_answer, question_data):
+    """Răspunsul pentru /api/evaluate (question_data = rândul complet, necesar pentru Nash)"""
+    with metrics.track('evaluator', 'evaluate'):
+        evaluation_result = evaluator.evaluate(
+            user_answer,
+            question_data['correct_answer'],
+            question_data['type'],
+            question_data=question_data
+        )
+
+    # Întoarce rezultatul - folosim explicația din baza de date
+    return {
+        'questionId': q_id,
+        'score': evaluation_result['score'],
+        'feedback': evaluation_result['feedback'],
+        'correctAnswer': question_data['correct_answer'],
+        'explanation': question_data.get('explanation', '')
+    }
+
+
+def build_session_entries(test_questions):
+    """Intrările sesiunii de test, cu cheia de răspuns precalculată pentru fiecare întrebare"""
+    with metrics.track('evaluator', 'answer_key'):
+        return [
+            {
+                'id': q['id'],
+                'type': q['type'],
+                'title': q['title'],
+                'correct_answer': q['correct_answer'],
+                'explanation': q['explanation'],
+                'answer_key': evaluator.build_answer_key(q['correct_answer'], q['type'], question_data=q)
+            }
+            for q in test_questions
+        ]
+
+
+def grade_test_session(session, answers):
+    """
+    Corectează răspunsurile pe baza cheii din sesiune.
+    Sunt evaluate doar întrebările din sesiune (în ordinea lor).
+    """
+    answer_key = session['answer_key']
+    answers_by_id = {str(a['question_id']): a.get('user_answer', '') for a in answers}
+
+    graded = [(q_id, answer_key[str(q_id)], answers_by_id.get(str(q_id), '')) for q_id in session['question_ids']]
+    with metrics.track('evaluator', 'evaluate_batch'):
+        evaluation_results = evaluator.evaluate_batch([
+            {
+                'user_answer': user_answer,
+                'correct_answer': entry['correct_answer'],
+                'type': entry['type'],
+                'answer_key': entry['answer_key']
+            }
+            for _, entry, user_answer in graded
+        ], workers=0)
+
+    return [
+        {
+            'question_id': q_id,
+            'type': entry['type'],
+            'title': entry['title'],
+            'user_answer': user_answer,
+            'correct_answer': entry['correct_answer'],
+            'explanation': entry['explanation'],
+            'score': evaluation_result['score'],
+            'feedback': evaluation_result['feedback']
+        }
+        for (q_id, entry, user_answer), evaluation_result in zip(graded, evaluation_results)
+    ]
+
+
+def grade_answers(answers, questions_map):
+    """Corectarea fără sesiune: questions_map = {id: rândul complet al întrebării}"""
+    # Evaluăm toate răspunsurile într-un singur lot (grupat pe tip)
+    graded = [
+        (answer_data, questions_map[answer_data['question_id']])
+        for answer_data in answers
+        if answer_data['question_id'] in questions_map
+    ]
+    with metrics.track('evaluator', 'evaluate_batch'):
+        evaluation_results = evaluator.evaluate_batch([
+            {
+                'user_answer': answer_data['user_answer'],
+                'correct_answer': question_data['correct_answer'],
+                'type': question_data['type'],
+                'question_data': question_data  # IMPORTANT: necesar pentru Nash
+            }
+            for answer_data, question_data in graded
+        ], workers=0)
+
+    return [
+        {
+            'question_id': answer_data['question_id'],
+            'type': question_data['type'],
+            'title': question_data['title'],
+            'question': question_data['question'],
+            'user_answer': answer_data['user_answer'],
+            'correct_answer': question_data['correct_answer'],
+            'explanation': question_data['explanation'],
+            'score': evaluation_result['score'],
+            'feedback': evaluation_result['feedback']
+        }
+        for (answer_data, question_data), evaluation_result in zip(graded, evaluation_results)
+    ]
+
+
+# ============= METRICI =============
+
+def route_label(url_rule):
+    """Eticheta rutei pentru metrici: șablonul (ex. /api/question/<int:q_id>), nu URL-ul concret"""
+    return url_rule.rule if url_rule is not None else 'unmatched'
+
+
+@app.before_request
+def start_request_metrics():
+    metrics.start_request()
+
+
+@app.after_request
+def finish_request_metrics(response):
+    request_metrics, total = metrics.finish_request(route_label(request.url_rule), request.method,
+                                                    response.status_code)
+    if SERVER_TIMING_HEADER and request_metrics is not None:
+        response.headers['Server-Timing'] = request_metrics.server_timing(total)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def api_metrics():
+    """Metricile procesului în formatul text Prometheus"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 # ============= RUTE PRINCIPALE =============
@@ -41,41 +449,17 @@ def home():
 
 @app.route('/api/batch-generate', methods=['POST'])
 def api_batch_generate():
-    """Generează întrebări unice alegând din lista celor disponibile"""
+    """
+    Generează întrebări unice alegând din lista celor disponibile.
+    Cererile mari (count > BATCH_ASYNC_THRESHOLD) sau cu "async": true rulează ca job
+    în fundal și returnează imediat 202 cu job_id.
+    """
     try:
         data = request.json
-        q_type = data.get('type', 'random')
-        count = data.get('count', 1)
-
-        # 1. Obține toate întrebările posibile (Universul)
-        all_possible = generator.get_all_questions()
+        if data.get('async') or data.get('count', 1) > BATCH_ASYNC_THRESHOLD:
+            return submit_job('batch_generate', data=data)
 
-        # 2. Obține titlurile întrebărilor existente din DB
-        existing_titles = db_manager.get_existing_titles()
-
-        # 3. Filtrează întrebările deja existente și pe tip
-        possible_new_questions = [
-            q for q in all_possible
-            if q['title'] not in existing_titles and (q_type == 'random' or q['type'] == q_type)
-        ]
-
-        # 4. Alege un subset de dimensiunea 'count'
-        if len(possible_new_questions) > count:
-            questions_to_save = random.sample(possible_new_questions, count)
-        else:
-            questions_to_save = possible_new_questions
-
-        # 5. Salvează în DB
-        saved_count = 0
-        for q in questions_to_save:
-            db_manager.save_question(q)
-            saved_count += 1
-
-        return jsonify({
-            'success': True,
-            'message': f'Am generat și salvat {saved_count} întrebări noi. {len(possible_new_questions) - saved_count} întrebări posibile rămase din tipul {q_type}.',
-            'saved_count': saved_count
-        })
+        return jsonify(run_batch_generate(data))
     except Exception as e:
         app.logger.error(f"Eroare la generarea batch: {e}")
         return jsonify({'error': str(e)}), 500
@@ -83,11 +467,38 @@ def api_batch_generate():
 
 @app.route('/api/questions', methods=['GET'])
 def api_get_questions():
-    """Returnează lista scurtă de întrebări și contorul total"""
+    """
+    Returnează o pagină din lista scurtă de întrebări și contorul total.
+    Parametri query: cursor, page_size, type, title_prefix
+    """
     try:
-        questions = db_manager.get_all_questions()
-        total_count = db_manager.get_total_count()
-        return jsonify({'questions': questions, 'total': total_count})
+        try:
+            page_size = int(request.args.get('page_size', QUESTIONS_PAGE_SIZE))
+        except ValueError:
+            return jsonify({'error': 'page_size trebuie să fie un număr'}), 400
+        page_size = max(1, min(page_size, QUESTIONS_MAX_PAGE_SIZE))
+
+        q_type = request.args.get('type') or None
+        title_prefix = request.args.get('title_prefix') or None
+
+        try:
+            questions, next_cursor = db_manager.get_questions_page(
+                page_size=page_size,
+                cursor_token=request.args.get('cursor') or None,
+                q_type=q_type,
+                title_prefix=title_prefix
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        total_count, total_is_estimate = db_manager.count_questions(q_type=q_type, title_prefix=title_prefix)
+        return jsonify({
+            'questions': questions,
+            'total': total_count,
+            'total_is_estimate': total_is_estimate,
+            'next_cursor': next_cursor,
+            'page_size': page_size
+        })
     except Exception as e:
         app.logger.error(f"Eroare la obținerea listei de întrebări: {e}")
         return jsonify({'error': str(e)}), 500
@@ -103,13 +514,7 @@ def api_get_question(q_id):
         question = db_manager.get_question_by_id(q_id, include_answer=True) 
 
         if question:
-            # Eliminăm câmpurile sensibile înainte de a trimite la client
-            if 'correct_answer' in question:
-                del question['correct_answer']
-            if 'explanation' in question:
-                del question['explanation']
-
-            return jsonify(question)
+            return jsonify(public_question(question))
         return jsonify({'error': 'Întrebarea nu a fost găsită'}), 404
     except Exception as e:
         app.logger.error(f"Eroare la obținerea întrebării: {e}")
@@ -131,28 +536,7 @@ def api_evaluate_answer():
         if not question_data:
             return jsonify({'error': 'Întrebarea nu a fost găsită'}), 404
 
-        # Extrage datele necesare
-        correct_answer = question_data['correct_answer']
-        explanation = question_data.get('explanation', '')
-        q_type = question_data['type']
-
-        # Evaluează răspunsul folosind QuestionEvaluator
-        # IMPORTANT: Trimitem question_data pentru Nash
-        evaluation_result = evaluator.evaluate(
-            user_answer, 
-            correct_answer, 
-            q_type,
-            question_data=question_data  # ← ADĂUGAT
-        )
-
-        # Întoarce rezultatul - folosim explicația din baza de date
-        return jsonify({
-            'questionId': q_id,
-            'score': evaluation_result['score'],
-            'feedback': evaluation_result['feedback'],
-            'correctAnswer': correct_answer,
-            'explanation': explanation
-        })
+        return jsonify(evaluate_single_answer(q_id, user_answer, question_data))
 
     except Exception as e:
         app.logger.error(f"Eroare la evaluare: {e}")
@@ -186,6 +570,18 @@ def api_clear_all():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/db-pool-stats', methods=['GET'])
+def api_db_pool_stats():
+    """Returnează statisticile pool-ului de conexiuni la baza de date"""
+    return jsonify(db_manager.get_pool_stats() or {'pooled': False})
+
+
+@app.route('/api/cache-stats', methods=['GET'])
+def api_cache_stats():
+    """Returnează statisticile cache-ului de întrebări"""
+    return jsonify(db_manager.get_cache_stats() or {'enabled': False})
+
+
 # ============= RUTE PENTRU TESTE =============
 
 @app.route('/api/question-types', methods=['GET'])
@@ -205,69 +601,56 @@ def api_get_question_types():
 def api_generate_test():
     """
     Generează un test cu întrebări bazate pe configurația utilizatorului.
+    Testul este salvat ca sesiune împreună cu cheia de răspuns precalculată,
+    astfel încât corectarea nu mai citește întrebările complete.
+    Returnează {session_id, questions}.
     """
     try:
         config = request.json
-        test_questions = []
 
-        for q_type, count in config.items():
-            count = int(count)
-            if count > 0:
-                questions_of_type = db_manager.get_random_questions_by_type(q_type, count)
-                test_questions.extend(questions_of_type)
+        # Toate tipurile sunt eșantionate într-o singură interogare
+        test_questions = db_manager.get_random_questions_by_types(config)
 
         random.shuffle(test_questions)
 
+        session_id = db_manager.create_test_session(build_session_entries(test_questions), ttl=TEST_SESSION_TTL)
+
         # Păstrăm doar câmpurile necesare pentru frontend: id, title, question, type
-        sanitized_questions = [
-            {'id': q['id'], 'title': q['title'], 'question': q['question'], 'type': q['type']}
-            for q in test_questions
-        ]
+        sanitized_questions = [public_test_question(q) for q in test_questions]
 
-        return jsonify(sanitized_questions)
+        return jsonify({'session_id': session_id, 'questions': sanitized_questions})
     except Exception as e:
         app.logger.error(f"Eroare la generarea testului: {e}")
         return jsonify({'error': str(e)}), 500
 
 
+def evaluate_test_session(session_id, answers):
+    """
+    Corectează un test pe baza sesiunii salvate: o singură citire (cheia de răspuns),
+    fără acces la rândurile din `questions`. Sunt evaluate doar întrebările din sesiune.
+    """
+    session = db_manager.get_test_session(session_id, mark_submitted=True)
+    if session is None:
+        return jsonify({'error': 'Sesiunea de test nu există sau a expirat'}), 404
+
+    return jsonify(grade_test_session(session, answers))
+
+
 @app.route('/api/evaluate-test', methods=['POST'])
 def api_evaluate_test():
     """
     Evaluează toate răspunsurile trimise pentru un test.
+    Corp: {session_id, answers: [{question_id, user_answer}]} (corectare din sesiune)
+    sau, pentru compatibilitate, direct lista de răspunsuri (citește întrebările din DB).
     """
     try:
-        answers = request.json
-        results = []
-
-        question_ids = [a['question_id'] for a in answers]
-
-        questions_map = db_manager.get_questions_by_ids(question_ids)
-
-        for answer_data in answers:
-            q_id = answer_data['question_id']
-            user_answer = answer_data['user_answer']
-            question_data = questions_map.get(q_id)
-
-            if question_data:
-                # IMPORTANT: Trimitem question_data pentru Nash
-                evaluation_result = evaluator.evaluate(
-                    user_answer,
-                    question_data['correct_answer'],
-                    question_data['type'],
-                    question_data=question_data  # ← ADĂUGAT
-                )
-
-                results.append({
-                    'question_id': q_id,
-                    'type': question_data['type'],
-                    'title': question_data['title'],
-                    'question': question_data['question'],
-                    'user_answer': user_answer,
-                    'correct_answer': question_data['correct_answer'],
-                    'explanation': question_data['explanation'],
-                    'score': evaluation_result['score'],
-                    'feedback': evaluation_result['feedback']
-                })
+        payload = request.json
+        if isinstance(payload, dict):
+            return evaluate_test_session(payload.get('session_id'), payload.get('answers', []))
+
+        answers = payload
+        questions_map = db_manager.get_questions_by_ids([a['question_id'] for a in answers])
+        results = grade_answers(answers, questions_map)
 
         return jsonify(results)
     except Exception as e:
@@ -282,98 +665,44 @@ def api_export_pdf():
     """
     Generează un PDF care conține toate întrebările din baza de date,
     inclusiv răspunsurile și explicațiile.
+    PDF-ul este păstrat pe disc cât timp amprenta băncii (id, updated_at) nu se
+    schimbă; clientul primește ETag și poate revalida cu If-None-Match (304).
+    La randare, rândurile vin dintr-un cursor pe server, iar fișierul e trimis în flux.
+    Filtre opționale (vezi parse_export_filters): type, ids, date_from, date_to, limit,
+    answers=0 (foaie de test fără răspunsuri) - filtrarea se face în SQL.
     """
     try:
-        # Obținem toate întrebările din DB (cu conținut complet)
-        all_questions = db_manager.get_all_questions_full()
+        try:
+            filters, include_answers = parse_export_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if filters or not include_answers:
+            return export_filtered_pdf(filters, include_answers)
 
-        if not all_questions:
+        fingerprint, total = db_manager.get_catalogue_fingerprint()
+        if total == 0:
             return jsonify({'error': 'Nu există întrebări de exportat'}), 404
 
-        # Buffer pentru a scrie PDF-ul
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4,
-                                rightMargin=40, leftMargin=40,
-                                topMargin=40, bottomMargin=40)
-
-        styles = getSampleStyleSheet()
-
-        # Creăm un stil bold personalizat pentru etichete
-        bold_style = ParagraphStyle(
-            'CustomBold',
-            parent=styles['Normal'],
-            fontName='Helvetica-Bold',
-            fontSize=10,
-            textColor=colors.HexColor('#006400')
+        etag = PDFCatalogue.etag_for(fingerprint)
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+
+        # Cursor pe server - nu încărcăm toată tabela în memorie
+        pdf_file, entry = pdf_catalogue.open(
+            fingerprint,
+            lambda: db_manager.iter_questions_full(itersize=PDF_EXPORT_ITERSIZE),
+            on_error=log_pdf_question_error
         )
 
-        story = []
-
-        # Funcție helper pentru a escapa caractere speciale XML
-        def escape_xml(text):
-            if text is None:
-                return ""
-            text = str(text)
-            text = text.replace('&', '&amp;')
-            text = text.replace('<', '&lt;')
-            text = text.replace('>', '&gt;')
-            return text
-
-        # Titlu
-        story.append(Paragraph("Catalog Complet Intrebari SmartTest AI", styles['Title']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"Data Export: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Italic']))
-        story.append(Spacer(1, 24))
-
-        for i, q in enumerate(all_questions):
-            try:
-                # Header Întrebare
-                q_header = f"<b>{i + 1}. [{escape_xml(q['type']).upper()}] {escape_xml(q['title'])}</b>"
-                story.append(Paragraph(q_header, styles['Heading2']))
-                story.append(Spacer(1, 6))
-
-                # Întrebarea
-                q_text = f"<b>Intrebare:</b> {escape_xml(q['question'])}"
-                story.append(Paragraph(q_text, styles['Normal']))
-                story.append(Spacer(1, 6))
-
-                # Răspuns Corect - folosim bold_style în loc de 'Strong'
-                data_answer = [
-                    [Paragraph("Raspuns Corect:", bold_style),
-                     Paragraph(escape_xml(q['correct_answer']), styles['Normal'])]
-                ]
-                t_answer = Table(data_answer, colWidths=[120, 380])
-                t_answer.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, -1), colors.lightgreen),
-                    ('BOX', (0, 0), (-1, -1), 1, colors.green),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                    ('TOPPADDING', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ]))
-                story.append(t_answer)
-                story.append(Spacer(1, 6))
-
-                # Explicație
-                q_explanation = f"<b>Explicatie:</b> {escape_xml(q['explanation'])}"
-                story.append(Paragraph(q_explanation, styles['Normal']))
-                story.append(Spacer(1, 24))
-
-            except Exception as q_error:
-                app.logger.error(f"Eroare la procesarea întrebării {i + 1}: {q_error}")
-                # Continuăm cu următoarea întrebare
-                continue
-
-        doc.build(story)
-
-        pdf_content = buffer.getvalue()
-        buffer.close()
-
-        # Creare răspuns Flask
-        response = make_response(pdf_content)
-        response.headers['Content-Type'] = 'application/pdf'
+        # Creare răspuns Flask (în flux, bucăți de 64KB)
+        response = Response(PDFExporter.iter_file_chunks(pdf_file), mimetype='application/pdf')
+        response.headers['Content-Length'] = str(entry['size'])
         response.headers['Content-Disposition'] = 'attachment; filename=SmartTest_Questions.pdf'
+        response.headers['Cache-Control'] = 'no-cache'
+        response.set_etag(entry['etag'])
 
         return response
 
@@ -384,6 +713,89 @@ def api_export_pdf():
         return jsonify({'error': f'Eroare la generarea PDF: {str(e)}'}), 500
 
 
+def export_filtered_pdf(filters, include_answers):
+    """Randează și trimite în flux un export filtrat (fără cache - rezultatele sunt mici și variate)"""
+    if db_manager.count_export_questions(**filters) == 0:
+        return jsonify({'error': 'Nu există întrebări care să corespundă filtrelor'}), 404
+
+    title, filename = export_pdf_names(include_answers)
+    rows = db_manager.iter_questions_full(itersize=PDF_EXPORT_ITERSIZE, **filters)
+    try:
+        pdf_file, size = pdf_exporter.render_to_spool(rows, on_error=log_pdf_question_error,
+                                                      include_answers=include_answers, title=title)
+    finally:
+        rows.close()
+
+    response = Response(PDFExporter.iter_file_chunks(pdf_file), mimetype='application/pdf')
+    response.headers['Content-Length'] = str(size)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+@app.route('/api/export-pdf', methods=['POST'])
+def api_export_pdf_job():
+    """
+    Pornește exportul PDF ca job în fundal (răspuns imediat cu job_id).
+    Acceptă aceleași filtre ca GET, în query string sau în corpul JSON.
+    """
+    try:
+        try:
+            filters, include_answers = parse_export_filters(request.get_json(silent=True) or request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return submit_job('export_pdf', filters=filters, include_answers=include_answers)
+    except Exception as e:
+        app.logger.error(f"Eroare la pornirea exportului PDF: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# ============= JOBURI ÎN FUNDAL =============
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """Returnează starea și progresul unui job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Jobul nu a fost găsit'}), 404
+
+    job = {k: v for k, v in job.items() if k not in ('result_file', 'worker_pid')}
+    if job['status'] == JobManager.DONE:
+        job['result_url'] = f'/api/jobs/{job_id}/result'
+    return jsonify(job)
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def api_job_result(job_id):
+    """Descarcă rezultatul unui job terminat (fișier sau JSON)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Jobul nu a fost găsit'}), 404
+    if job['status'] == JobManager.FAILED:
+        return jsonify({'error': job['error']}), 500
+    if job['status'] != JobManager.DONE:
+        return jsonify({'error': 'Jobul nu s-a terminat încă', 'status': job['status']}), 409
+
+    path = job_manager.result_file_path(job)
+    if job.get('result_file'):
+        if path is None:
+            return jsonify({'error': 'Rezultatul jobului a expirat'}), 410
+        return send_file(path, mimetype='application/pdf', as_attachment=True,
+                         download_name=job['result'].get('filename', os.path.basename(path)))
+    return jsonify(job['result'])
+
+
+@app.route('/api/pdf-cache-stats', methods=['GET'])
+def api_pdf_cache_stats():
+    """Returnează statisticile cache-ului pentru PDF-ul complet"""
+    return jsonify(pdf_catalogue.get_stats())
+
+
+@app.route('/api/jobs-stats', methods=['GET'])
+def api_jobs_stats():
+    """Returnează numărul de joburi în așteptare/rulare pe tip (în acest proces)"""
+    return jsonify(job_manager.get_stats())
+
+
 # ============= ERROR HANDLERS =============
 
 @app.errorhandler(404)
@@ -396,9 +808,104 @@ def internal_error(error):
     return jsonify({'error': 'Eroare internă server'}), 500
 
 
+# ============= APPLICATION FACTORY =============
+
+_worker_pid = None
+_worker_lock = threading.Lock()
+
+
+def create_app(db_config=None, pool_config=None, cache_config=None):
+    """
+    Construiește serviciile aplicației (o singură dată per proces) și returnează aplicația Flask.
+    Nu deschide conexiuni la baza de date și nu pornește thread-uri, deci poate fi apelată
+    în procesul master înainte de fork (ex. gunicorn cu preload_app, vezi wsgi.py).
+    """
+    global generator, evaluator, db_manager, pdf_exporter
+
+    if db_manager is None:
+        generator = QuestionGenerator(seed=GENERATOR_SEED)
+        evaluator = QuestionEvaluator()
+        db_manager = QuestionDBManager(
+            db_config or DB_CONFIG,
+            pool_config=DB_POOL_CONFIG if pool_config is None else pool_config,
+            cache_config=QUESTION_CACHE_CONFIG if cache_config is None else cache_config,
+            metrics=metrics
+        )
+        pdf_exporter = PDFExporter()
+        db_manager.add_change_listener(invalidate_pdf_catalogue)
+
+        metrics.add_stats_collector('question_cache', lambda: db_manager.get_cache_stats(),
+                                    'Cache-ul de întrebări')
+        metrics.add_stats_collector('db_pool', lambda: db_manager.get_pool_stats(),
+                                    'Pool-ul de conexiuni')
+        metrics.add_stats_collector('pdf_catalogue', lambda: pdf_catalogue.get_stats() if pdf_catalogue else None,
+                                    'PDF-ul complet din cache')
+    return app
+
+
+def invalidate_pdf_catalogue(ids=None):
+    if pdf_catalogue is not None:
+        pdf_catalogue.invalidate(ids)
+
+
+def init_worker():
+    """
+    Creează resursele legate de proces: cache-ul PDF (fișier per PID) și coada de joburi
+    (thread-uri, PID-ul workerului în starea joburilor). Idempotentă în același proces;
+    într-un proces nou (după fork) le recreează.
+    """
+    global pdf_catalogue, job_manager, _worker_pid
+
+    with _worker_lock:
+        if _worker_pid == os.getpid():
+            return
+        create_app()
+
+        pdf_catalogue = PDFCatalogue(pdf_exporter, PDF_CACHE_DIR)
+        job_manager = JobManager(JOBS_DIR, result_ttl=JOB_RESULT_TTL)
+        job_manager.register('export_pdf', export_pdf_job, **JOB_LIMITS['export_pdf'])
+        job_manager.register('batch_generate', batch_generate_job, **JOB_LIMITS['batch_generate'])
+        _worker_pid = os.getpid()
+
+
+@app.before_request
+def ensure_worker():
+    # Calea rapidă: workerul e deja inițializat (verificare fără lock)
+    if _worker_pid != os.getpid():
+        init_worker()
+
+
+def warm_caches():
+    """
+    Construiește universul de întrebări (specificații și texte memoizate) și cheile de
+    răspuns ale evaluatorului. Apelată înainte de fork, memoria rezultată e partajată
+    copy-on-write de toți workerii. Nu accesează baza de date.
+    """
+    create_app()
+    count = 0
+    for q in generator.get_all_questions():
+        evaluator.build_answer_key(q['correct_answer'], q['type'], question_data=q)
+        count += 1
+    return count
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Creează tabelele și indecșii lipsă (rulat la instalare, nu la pornirea serverului)"""
+    create_app()
+    removed = db_manager.ensure_schema()
+    if removed:
+        print(f"🧹 Au fost șterse {removed} întrebări cu titlu duplicat (păstrat ID-ul cel mai mic).")
+    print("✅ Tabele verificate/create.")
+
+
 # ============= MAIN =============
 
 if __name__ == '__main__':
+    # Server de dezvoltare (un singur proces). Pentru producție: gunicorn -c gunicorn.conf.py wsgi:application
+    create_app()
+    init_worker()
+
     print("=" * 70)
     print("🎓 SmarTest - Generator Întrebări AI cu PostgreSQL")
     print("=" * 70)
@@ -408,27 +915,15 @@ if __name__ == '__main__':
     print("\n⏳ Testare conexiune la baza de date...")
 
     try:
-        # Cod de inițializare DB (verificare tabele)
-        with db_manager.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS questions (
-                        id SERIAL PRIMARY KEY,
-                        title VARCHAR(255) UNIQUE NOT NULL,
-                        question TEXT NOT NULL,
-                        correct_answer TEXT NOT NULL,
-                        explanation TEXT,
-                        type VARCHAR(50) NOT NULL,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                    );
-                """)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS question_stats (
-                        question_type VARCHAR(50) PRIMARY KEY,
-                        total_generated INTEGER DEFAULT 0
-                    );
-                """)
-        print("✅ Conexiune reușită și tabele verificate/create.")
+        missing_tables = db_manager.check_schema()
+        if missing_tables:
+            print(f"❌ Lipsesc tabelele: {', '.join(missing_tables)}")
+            print("Creează schema cu: flask --app app init-db")
+            import sys
+
+            sys.exit(1)
+        db_manager.pool.warm_up()
+        print("✅ Conexiune reușită și tabele verificate.")
     except Exception as e:
         print(f"❌ EROARE CRITICĂ la conexiunea DB: {e}")
         print("Asigură-te că PostgreSQL rulează și configurația în `app.py` este corectă.")
@@ -436,4 +931,4 @@ if __name__ == '__main__':
 
         sys.exit(1)
 
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    app.run(debug=True, port=5000)
@@ -0,0 +1,246 @@
+"""
+Modul de servire asyncio (ASGI) - SmarTest
+Rutele I/O fierbinți (întrebare după ID, evaluare, listare, teste) rulează ca
+view-uri async (Quart) peste AsyncQuestionDBManager, astfel încât o cerere care
+așteaptă PostgreSQL nu blochează un thread. Restul rutelor (generare, export PDF,
+joburi, pagina principală) sunt servite de aplicația Flask din app.py.
+
+Pornire:
+    python asgi.py                      (hypercorn, http://localhost:5000)
+    hypercorn asgi:application --bind 0.0.0.0:5000 --workers 4
+Workerii hypercorn sunt procese noi (spawn), fiecare își construiește propriile servicii.
+Modul sincron rămâne disponibil: python app.py
+
+Necesită pachetele opționale: quart, hypercorn, psycopg (v3), psycopg_pool.
+"""
+import asyncio
+import random
+
+from quart import Quart, jsonify, request
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+
+import app as sync_app
+from app import (
+    DB_CONFIG, DB_POOL_CONFIG, QUESTIONS_PAGE_SIZE, QUESTIONS_MAX_PAGE_SIZE, TEST_SESSION_TTL,
+    metrics, route_label, public_question, public_test_question, evaluate_single_answer,
+    build_session_entries, grade_test_session, grade_answers
+)
+from utils.async_question_db_manager import AsyncQuestionDBManager
+
+# Corpul maxim acceptat pentru cererile redirecționate către aplicația Flask
+WSGI_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Corectările cu mai multe întrebări decât atât rulează într-un thread,
+# ca să nu țină bucla de evenimente ocupată
+EVALUATE_IN_THREAD_THRESHOLD = 20
+
+flask_app = sync_app.create_app()
+async_app = Quart(__name__, static_folder=None)
+
+# Cache-ul de întrebări e partajat cu managerul sincron: scrierile făcute prin
+# rutele Flask (salvare, ștergere) invalidează și citirile async
+async_db = AsyncQuestionDBManager(DB_CONFIG, pool_config=DB_POOL_CONFIG, cache=sync_app.db_manager.cache,
+                                  metrics=metrics)
+sync_app.db_manager.add_change_listener(async_db.on_change)
+
+
+@async_app.before_serving
+async def open_async_db():
+    sync_app.init_worker()
+    await async_db.open()
+
+
+@async_app.after_serving
+async def close_async_db():
+    await async_db.close()
+
+
+@async_app.before_request
+async def start_request_metrics():
+    metrics.start_request()
+
+
+@async_app.after_request
+async def finish_request_metrics(response):
+    # Același registru ca rutele Flask: /metrics (servit de Flask) include și rutele async
+    request_metrics, total = metrics.finish_request(route_label(request.url_rule), request.method,
+                                                    response.status_code)
+    if sync_app.SERVER_TIMING_HEADER and request_metrics is not None:
+        response.headers['Server-Timing'] = request_metrics.server_timing(total)
+    return response
+
+
+async def run_cpu_bound(func, *args, size=0):
+    """Rulează func în thread doar pentru loturi mari (evaluarea e CPU-bound)"""
+    if size > EVALUATE_IN_THREAD_THRESHOLD:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+# ============= RUTE PRINCIPALE (ASYNC) =============
+
+@async_app.route('/api/questions', methods=['GET'])
+async def api_get_questions():
+    """Vezi app.api_get_questions"""
+    try:
+        try:
+            page_size = int(request.args.get('page_size', QUESTIONS_PAGE_SIZE))
+        except ValueError:
+            return jsonify({'error': 'page_size trebuie să fie un număr'}), 400
+        page_size = max(1, min(page_size, QUESTIONS_MAX_PAGE_SIZE))
+
+        q_type = request.args.get('type') or None
+        title_prefix = request.args.get('title_prefix') or None
+
+        try:
+            questions, next_cursor = await async_db.get_questions_page(
+                page_size=page_size,
+                cursor_token=request.args.get('cursor') or None,
+                q_type=q_type,
+                title_prefix=title_prefix
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        total_count, total_is_estimate = await async_db.count_questions(q_type=q_type, title_prefix=title_prefix)
+        return jsonify({
+            'questions': questions,
+            'total': total_count,
+            'total_is_estimate': total_is_estimate,
+            'next_cursor': next_cursor,
+            'page_size': page_size
+        })
+    except Exception as e:
+        async_app.logger.error(f"Eroare la obținerea listei de întrebări: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@async_app.route('/api/question/<int:q_id>', methods=['GET'])
+async def api_get_question(q_id):
+    """Vezi app.api_get_question"""
+    try:
+        question = await async_db.get_question_by_id(q_id, include_answer=True)
+        if question:
+            return jsonify(public_question(question))
+        return jsonify({'error': 'Întrebarea nu a fost găsită'}), 404
+    except Exception as e:
+        async_app.logger.error(f"Eroare la obținerea întrebării: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@async_app.route('/api/evaluate', methods=['POST'])
+async def api_evaluate_answer():
+    """Vezi app.api_evaluate_answer"""
+    try:
+        data = await request.get_json()
+        q_id = data.get('question_id')
+        user_answer = data.get('user_answer', '')
+
+        question_data = await async_db.get_question_by_id(q_id, include_answer=True)
+        if not question_data:
+            return jsonify({'error': 'Întrebarea nu a fost găsită'}), 404
+
+        return jsonify(evaluate_single_answer(q_id, user_answer, question_data))
+    except Exception as e:
+        async_app.logger.error(f"Eroare la evaluare: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+# ============= RUTE PENTRU TESTE (ASYNC) =============
+
+@async_app.route('/api/question-types', methods=['GET'])
+async def api_get_question_types():
+    """Vezi app.api_get_question_types"""
+    try:
+        return jsonify(await async_db.get_count_by_type())
+    except Exception as e:
+        async_app.logger.error(f"Eroare la obținerea tipurilor de întrebări: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@async_app.route('/api/generate-test', methods=['POST'])
+async def api_generate_test():
+    """Vezi app.api_generate_test"""
+    try:
+        config = await request.get_json()
+
+        test_questions = await async_db.get_random_questions_by_types(config)
+        random.shuffle(test_questions)
+
+        entries = await run_cpu_bound(build_session_entries, test_questions, size=len(test_questions))
+        session_id = await async_db.create_test_session(entries, ttl=TEST_SESSION_TTL)
+
+        return jsonify({
+            'session_id': session_id,
+            'questions': [public_test_question(q) for q in test_questions]
+        })
+    except Exception as e:
+        async_app.logger.error(f"Eroare la generarea testului: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@async_app.route('/api/evaluate-test', methods=['POST'])
+async def api_evaluate_test():
+    """Vezi app.api_evaluate_test (sesiune sau, pentru compatibilitate, lista de răspunsuri)"""
+    try:
+        payload = await request.get_json()
+        if isinstance(payload, dict):
+            session = await async_db.get_test_session(payload.get('session_id'), mark_submitted=True)
+            if session is None:
+                return jsonify({'error': 'Sesiunea de test nu există sau a expirat'}), 404
+            answers = payload.get('answers', [])
+            return jsonify(await run_cpu_bound(grade_test_session, session, answers,
+                                               size=len(session['question_ids'])))
+
+        answers = payload
+        questions_map = await async_db.get_questions_by_ids([a['question_id'] for a in answers])
+        return jsonify(await run_cpu_bound(grade_answers, answers, questions_map, size=len(answers)))
+    except Exception as e:
+        async_app.logger.error(f"Eroare la evaluarea testului: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+@async_app.route('/api/async-db-pool-stats', methods=['GET'])
+async def api_async_db_pool_stats():
+    """Returnează statisticile pool-ului async de conexiuni"""
+    return jsonify(async_db.get_pool_stats())
+
+
+# ============= DISPATCHER ASGI =============
+
+flask_asgi = AsyncioWSGIMiddleware(flask_app, max_body_size=WSGI_MAX_BODY_SIZE)
+_async_routes = async_app.url_map.bind('localhost')
+
+
+async def application(scope, receive, send):
+    """
+    Punctul de intrare ASGI: rutele definite mai sus sunt servite async,
+    restul sunt redirecționate către aplicația Flask (rulată în thread-uri).
+    """
+    if scope['type'] == 'http':
+        try:
+            _async_routes.match(scope['path'], method=scope['method'])
+        except (NotFound, MethodNotAllowed):
+            await flask_asgi(scope, receive, send)
+            return
+    await async_app(scope, receive, send)
+
+
+# ============= MAIN =============
+
+if __name__ == '__main__':
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = ['localhost:5000']
+
+    print("=" * 70)
+    print("🎓 SmarTest - mod asyncio (ASGI)")
+    print("=" * 70)
+    print(f"📊 Database: {DB_CONFIG['database']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}")
+    print(f"🌐 Server: http://localhost:5000")
+    print("=" * 70)
+
+    asyncio.run(serve(application, config))
@@ -0,0 +1,6 @@
+"""
+Benchmark-uri pentru căile fierbinți (generator, evaluator, export PDF, baza de date)
+și testul de încărcare cu trafic de examen.
+Rulare: python -m benchmarks.run (vezi benchmarks/run.py)
+        python -m benchmarks.loadtest (vezi benchmarks/loadtest.py)
+"""
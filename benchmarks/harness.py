@@ -0,0 +1,191 @@
+"""
+Harness minimal pentru benchmark-uri (doar biblioteca standard)
+Fiecare benchmark e o funcție-fabrică: primește contextul (ex. managerul DB) și
+returnează funcția fără argumente care se măsoară. Pregătirea din fabrică nu intră
+în timp. Rezultatele se compară cu minimul salvat în baselines.json: minimul e cel mai
+puțin sensibil la zgomotul mașinii (alte procese, frecvența CPU), mediana e doar raportată.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# Regresie = minimul curent mai mare decât baseline * (1 + toleranță)
+DEFAULT_TOLERANCE = 0.30
+
+# Ținta de durată pentru o repetiție (numărul de apeluri e ales automat)
+MIN_REPEAT_TIME = 0.2
+
+BENCHMARKS = []
+
+
+class Benchmark:
+    """Un benchmark înregistrat cu @benchmark"""
+
+    def __init__(self, name, factory, group, repeat=7, number=None, tolerance=None, requires=()):
+        self.name = name
+        self.factory = factory
+        self.group = group
+        self.repeat = repeat
+        self.number = number
+        self.tolerance = tolerance
+        self.requires = tuple(requires)
+
+
+def benchmark(name, group, repeat=7, number=None, tolerance=None, requires=()):
+    """
+    Înregistrează o fabrică de benchmark.
+    number: apeluri per repetiție (None = ales automat, ~MIN_REPEAT_TIME secunde)
+    tolerance: toleranța de regresie proprie (altfel DEFAULT_TOLERANCE)
+    requires: resursele necesare din context (ex. ('db',)) - lipsă = benchmark sărit
+    """
+    def decorator(factory):
+        BENCHMARKS.append(Benchmark(name, factory, group, repeat, number, tolerance, requires))
+        return factory
+    return decorator
+
+
+def _autorange(func):
+    """Numărul de apeluri pentru care o repetiție durează cel puțin MIN_REPEAT_TIME"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_REPEAT_TIME:
+            return number
+        # Estimăm direct numărul necesar (cu marjă), în loc de dublări repetate
+        number = max(number * 2, int(number * MIN_REPEAT_TIME / max(elapsed, 1e-9) * 1.2))
+
+
+def measure(func, repeat=7, number=None):
+    """Măsoară func; returnează statisticile timpului per apel (secunde)"""
+    func()  # încălzire (cache-uri, importuri leneșe)
+    if number is None:
+        number = _autorange(func)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'repeat': repeat,
+        'number': number
+    }
+
+
+# ======================= BASELINES =======================
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def load_baselines(path=BASELINES_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'machine': None, 'benchmarks': {}}
+
+
+def save_baselines(results, path=BASELINES_FILE):
+    """Actualizează baseline-urile cu rezultatele curente (celelalte rămân neschimbate)"""
+    baselines = load_baselines(path)
+    baselines['machine'] = machine_info()
+    baselines['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M')
+    for name, stats in results.items():
+        entry = baselines['benchmarks'].get(name, {})
+        entry.update({'median': stats['median'], 'min': stats['min']})
+        baselines['benchmarks'][name] = entry
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(name, stats, baselines, tolerance):
+    """
+    Returnează (raport minim curent / minim baseline, regresie?) sau (None, False) fără baseline.
+    Toleranța din baselines.json (cheia 'tolerance' a benchmark-ului) are prioritate.
+    """
+    entry = baselines.get('benchmarks', {}).get(name)
+    if not entry:
+        return None, False
+    tolerance = entry.get('tolerance', tolerance)
+    ratio = stats['min'] / entry['min'] if entry['min'] else float('inf')
+    return ratio, ratio > 1 + tolerance
+
+
+def format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def run(context, name_filter=None, tolerance=DEFAULT_TOLERANCE, baselines=None, out=sys.stdout):
+    """
+    Rulează benchmark-urile înregistrate; returnează (rezultate {nume: statistici}, regresii [nume]).
+    Un benchmark peste prag e remăsurat o dată și raportat ca regresie doar dacă rămâne peste.
+    context: dict cu resursele disponibile (ex. {'db': QuestionDBManager})
+    """
+    baselines = baselines if baselines is not None else load_baselines()
+    results = {}
+    regressions = []
+
+    current_group = None
+    for bench in BENCHMARKS:
+        if name_filter and name_filter not in bench.name:
+            continue
+        if bench.group != current_group:
+            current_group = bench.group
+            print(f"\n[{current_group}]", file=out)
+
+        missing = [r for r in bench.requires if context.get(r) is None]
+        if missing:
+            print(f"  {bench.name:<48} sărit (lipsește: {', '.join(missing)})", file=out)
+            continue
+
+        func = bench.factory(context)
+        bench_tolerance = bench.tolerance if bench.tolerance is not None else tolerance
+        stats = measure(func, repeat=bench.repeat, number=bench.number)
+        ratio, regressed = compare(bench.name, stats, baselines, bench_tolerance)
+        if regressed:
+            # Confirmare: o singură rulare lentă poate fi doar zgomot (alt proces pe CPU)
+            retry = measure(func, repeat=bench.repeat, number=stats['number'])
+            if retry['min'] < stats['min']:
+                stats = retry
+            ratio, regressed = compare(bench.name, stats, baselines, bench_tolerance)
+        results[bench.name] = stats
+
+        if ratio is None:
+            verdict = 'fără baseline'
+        else:
+            verdict = f"{ratio:.2f}x baseline" + ('  ← REGRESIE' if regressed else '')
+        if regressed:
+            regressions.append(bench.name)
+
+        print(f"  {bench.name:<48} {format_time(stats['median']):>12}  "
+              f"(min {format_time(stats['min'])}, ±{format_time(stats['stdev'])}, "
+              f"{stats['number']}x{stats['repeat']})  {verdict}", file=out)
+
+    return results, regressions
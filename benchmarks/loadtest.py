@@ -0,0 +1,477 @@
+"""
+Test de încărcare: studenți virtuali care dau un examen pe rutele Flask reale
+
+    python -m benchmarks.loadtest --dsn "host=localhost port=5433 dbname=bench user=postgres"
+    python -m benchmarks.loadtest --students 200 --think-time 2-10 --sync-submit
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --students 100   # server existent
+
+Fiecare student: POST /api/generate-test (începutul examenului), pauză de gândire pe
+fiecare întrebare (GET /api/question/<id> pentru jocurile Nash, ca interfața), apoi
+POST /api/evaluate-test. Cu --practice, după examen exersează N întrebări
+(GET /api/question/<id> + POST /api/evaluate). Răspunsurile respectă --answer-mix.
+
+Fără --url, aplicația pornește local (serverul werkzeug cu thread-uri, într-un proces
+separat) pe o schemă PostgreSQL de unică folosință (LOAD_SCHEMA), ștearsă la final.
+Pentru gunicorn/hypercorn, pornește serverul separat și folosește --url.
+
+Raportul: per rută - cereri, erori, throughput, latențele p50/p95/p99/max.
+Codul de ieșire este 1 dacă rata erorilor depășește --max-error-rate.
+"""
+import argparse
+import http.client
+import json
+import logging
+import math
+import multiprocessing
+import random
+import socket
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .run import bench_questions, db_config_from_args, drop_schema, setup_db
+
+LOAD_SCHEMA = 'smartest_load'
+
+# Un test tipic din interfață: {tip: număr de întrebări}
+DEFAULT_EXAM = {'knight': 4, 'hanoi': 2, 'coloring': 2, 'n-queens': 1, 'nash': 2, 'nash-mixed': 1}
+
+DEFAULT_ANSWER_MIX = {'correct': 0.4, 'partial': 0.3, 'wrong': 0.2, 'empty': 0.1}
+
+WRONG_ANSWER = "Nu știu sigur, aș încerca o căutare exhaustivă a tuturor variantelor."
+
+# Etichetele rutelor din raport (ID-urile nu fragmentează statisticile)
+ROUTE_QUESTION = '/api/question/<id>'
+
+# Erori de conexiune după care o conexiune keep-alive refolosită e redeschisă o dată
+# (serverul poate închide conexiunile inactive în timpul pauzei de gândire)
+RECONNECT_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+# ======================= PARAMETRI =======================
+
+def parse_range(text):
+    """'2-10' -> (2.0, 10.0); '3' -> (3.0, 3.0)"""
+    low, _, high = text.partition('-')
+    low = float(low)
+    high = float(high) if high else low
+    if low < 0 or high < low:
+        raise argparse.ArgumentTypeError(f"interval invalid: {text}")
+    return low, high
+
+
+def parse_weights(text):
+    """'correct=0.5,wrong=0.5' -> {'correct': 0.5, 'wrong': 0.5}"""
+    weights = {}
+    for part in text.split(','):
+        key, _, value = part.partition('=')
+        try:
+            weights[key.strip()] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"valoare invalidă: {part}")
+    return weights
+
+
+def parse_answer_mix(text):
+    mix = parse_weights(text)
+    unknown = set(mix) - set(DEFAULT_ANSWER_MIX)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"tipuri de răspuns necunoscute: {', '.join(sorted(unknown))}")
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("ponderile trebuie să aibă suma pozitivă")
+    return mix
+
+
+def parse_exam(text):
+    return {q_type: int(count) for q_type, count in parse_weights(text).items()}
+
+
+# ======================= RAPORT =======================
+
+def percentile(sorted_values, pct):
+    """Percentila prin metoda rangului cel mai apropiat (valori deja sortate)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LoadReport:
+    """Latențele și erorile colectate de toți studenții, grupate pe rută"""
+
+    def __init__(self):
+        self._latencies = {}    # rută -> [secunde]
+        self._errors = {}       # rută -> {motiv: număr}
+        self._lock = threading.Lock()
+        self.started = None
+        self.finished = None
+
+    def record(self, route, seconds, error=None):
+        with self._lock:
+            self._latencies.setdefault(route, []).append(seconds)
+            if error is not None:
+                errors = self._errors.setdefault(route, {})
+                errors[error] = errors.get(error, 0) + 1
+
+    def summary(self):
+        duration = (self.finished or time.perf_counter()) - self.started
+        with self._lock:
+            routes = {route: sorted(values) for route, values in self._latencies.items()}
+            errors = {route: dict(reasons) for route, reasons in self._errors.items()}
+
+        all_latencies = sorted(v for values in routes.values() for v in values)
+        routes['TOTAL'] = all_latencies
+        errors['TOTAL'] = {}
+        for route, reasons in list(errors.items()):
+            if route != 'TOTAL':
+                for reason, count in reasons.items():
+                    errors['TOTAL'][reason] = errors['TOTAL'].get(reason, 0) + count
+
+        summary = {'duration': duration, 'routes': {}}
+        for route, latencies in routes.items():
+            error_count = sum(errors.get(route, {}).values())
+            summary['routes'][route] = {
+                'requests': len(latencies),
+                'errors': error_count,
+                'error_rate': error_count / len(latencies) if latencies else 0.0,
+                'error_reasons': errors.get(route, {}),
+                'throughput': len(latencies) / duration if duration > 0 else 0.0,
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'max': latencies[-1] if latencies else None
+            }
+        return summary
+
+
+def format_ms(seconds):
+    return '-' if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def print_summary(summary, out=sys.stdout):
+    print(f"\n⏱️  Durată: {summary['duration']:.1f} s\n", file=out)
+    header = f"  {'Rută':<24} {'cereri':>7} {'erori':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    print(header, file=out)
+    print('  ' + '-' * (len(header) - 2), file=out)
+    for route, stats in sorted(summary['routes'].items(), key=lambda item: (item[0] == 'TOTAL', item[0])):
+        print(f"  {route:<24} {stats['requests']:>7} {stats['error_rate'] * 100:>5.1f}% {stats['throughput']:>8.1f} "
+              f"{format_ms(stats['p50']):>8} {format_ms(stats['p95']):>8} {format_ms(stats['p99']):>8} "
+              f"{format_ms(stats['max']):>8}", file=out)
+
+    reasons = summary['routes']['TOTAL']['error_reasons']
+    if reasons:
+        print("\n  Erori: " + ', '.join(f"{reason} ({count})" for reason, count in sorted(reasons.items())), file=out)
+
+
+# ======================= RĂSPUNSURI =======================
+
+class AnswerBook:
+    """
+    Răspunsurile corecte după titlu (din generator) și construirea răspunsurilor
+    studenților după tip: corect, parțial, greșit sau gol.
+    Întrebările cu titlu necunoscut (bază populată altfel) primesc un răspuns greșit.
+    """
+
+    def __init__(self, questions):
+        self.by_title = {q['title']: q for q in questions}
+
+    def answer(self, question, kind):
+        if kind == 'empty':
+            return ''
+
+        known = self.by_title.get(question['title'])
+        if known is None:
+            return WRONG_ANSWER
+
+        if known['type'] == 'nash':
+            return self._nash_answer(json.loads(known['nash_equilibria'] or '[]'), kind)
+        if known['type'] == 'nash-mixed':
+            return self._mixed_answer(json.loads(known['nash_equilibria'] or '[]'), kind)
+
+        if kind == 'correct':
+            return known['correct_answer']
+        if kind == 'partial':
+            # Finalul răspunsului corect, fără strategia principală (de obicei la început)
+            words = known['correct_answer'].split()
+            return ' '.join(words[-max(1, len(words) // 3):])
+        return WRONG_ANSWER
+
+    @staticmethod
+    def _nash_answer(equilibria, kind):
+        cells = [{'i': i, 'j': j} for i, j in equilibria]
+        if kind == 'correct':
+            selected = cells
+        elif kind == 'partial' and len(cells) > 1:
+            selected = cells[:1]
+        else:
+            # Greșit: bifează "fără echilibru" când există, altfel o celulă oarecare
+            selected = [] if cells else [{'i': 0, 'j': 0}]
+        return json.dumps({'no_nash': not selected, 'selected_cells': selected})
+
+    @staticmethod
+    def _mixed_answer(equilibria, kind):
+        if not equilibria:
+            return WRONG_ANSWER
+        eq = equilibria[0]
+        uniform_p = [f"1/{len(eq['p'])}"] * len(eq['p'])
+        uniform_q = [f"1/{len(eq['q'])}"] * len(eq['q'])
+        if kind == 'correct':
+            return json.dumps({'p': eq['p'], 'q': eq['q']})
+        if kind == 'partial':
+            return json.dumps({'p': eq['p'], 'q': uniform_q})
+        return json.dumps({'p': uniform_p, 'q': uniform_q})
+
+
+# ======================= STUDENȚI =======================
+
+class HttpClient:
+    """Conexiune keep-alive a unui student; fiecare cerere e înregistrată în raport"""
+
+    def __init__(self, base_url, report, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.report = report
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, method, path, route, payload=None):
+        """Returnează răspunsul JSON decodat sau None la eroare (înregistrată în raport)"""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+
+        for attempt in range(2):
+            reused = self.conn is not None
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            start = time.perf_counter()
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+            except RECONNECT_ERRORS as e:
+                self.close()
+                if reused and attempt == 0:
+                    continue
+                self.report.record(route, time.perf_counter() - start, type(e).__name__)
+                return None
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                self.report.record(route, time.perf_counter() - start, type(e).__name__)
+                return None
+            elapsed = time.perf_counter() - start
+
+            if response.will_close:
+                self.close()
+            if response.status >= 400:
+                self.report.record(route, elapsed, f"HTTP {response.status}")
+                return None
+            self.report.record(route, elapsed)
+            try:
+                return json.loads(data)
+            except ValueError:
+                return None
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class Student(threading.Thread):
+    """Un student virtual: examene complete (generare -> răspunsuri -> predare), apoi exerciții"""
+
+    def __init__(self, student_id, options, report, answer_book, submit_barrier=None):
+        super().__init__(name=f"student-{student_id}", daemon=True)
+        self.options = options
+        self.report = report
+        self.answer_book = answer_book
+        self.submit_barrier = submit_barrier
+        self.rng = random.Random(options.seed * 100003 + student_id)
+        self.client = HttpClient(options.url, report, options.timeout)
+        self.start_delay = options.ramp_up * student_id / max(1, options.students - 1)
+
+    def think(self):
+        low, high = self.options.think_time
+        if high > 0:
+            time.sleep(self.rng.uniform(low, high))
+
+    def pick_answer_kind(self):
+        mix = self.options.answer_mix
+        return self.rng.choices(list(mix), weights=list(mix.values()))[0]
+
+    def run(self):
+        time.sleep(self.start_delay)
+        try:
+            for _ in range(self.options.exams):
+                questions = self.take_exam()
+                if questions and self.options.practice:
+                    self.practice(questions)
+        finally:
+            self.client.close()
+
+    def take_exam(self):
+        test = self.client.request('POST', '/api/generate-test', '/api/generate-test', self.options.exam)
+        questions = test.get('questions', []) if test else []
+
+        answers = []
+        for question in questions:
+            # Interfața aduce jocul complet doar pentru întrebările Nash
+            if question['type'] == 'nash':
+                self.client.request('GET', f"/api/question/{question['id']}", ROUTE_QUESTION)
+            self.think()
+            answers.append({
+                'question_id': question['id'],
+                'user_answer': self.answer_book.answer(question, self.pick_answer_kind())
+            })
+
+        if self.submit_barrier is not None:
+            # Termenul limită: toți predau deodată (și cei fără test, ca bariera să nu blocheze)
+            try:
+                self.submit_barrier.wait(timeout=self.options.timeout * 10)
+            except threading.BrokenBarrierError:
+                pass
+
+        if test:
+            self.client.request('POST', '/api/evaluate-test', '/api/evaluate-test',
+                                {'session_id': test['session_id'], 'answers': answers})
+        return questions
+
+    def practice(self, questions):
+        for question in self.rng.sample(questions, min(self.options.practice, len(questions))):
+            self.client.request('GET', f"/api/question/{question['id']}", ROUTE_QUESTION)
+            self.think()
+            self.client.request('POST', '/api/evaluate', '/api/evaluate', {
+                'question_id': question['id'],
+                'user_answer': self.answer_book.answer(question, self.pick_answer_kind())
+            })
+
+
+def run_load(options, answer_book, out=sys.stdout):
+    report = LoadReport()
+    # Bariera se reface după fiecare rundă, deci funcționează și pentru --exams > 1
+    barrier = threading.Barrier(options.students) if options.sync_submit else None
+    students = [Student(i, options, report, answer_book, barrier) for i in range(options.students)]
+
+    print(f"🎓 {options.students} studenți x {options.exams} examen(e) -> {options.url}", file=out)
+    report.started = time.perf_counter()
+    for student in students:
+        student.start()
+    for student in students:
+        student.join()
+    report.finished = time.perf_counter()
+    return report.summary()
+
+
+# ======================= SERVER LOCAL =======================
+
+def free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def serve(db_config, host, port, pool_max_size):
+    """Ținta procesului server: aplicația Flask pe serverul werkzeug cu thread-uri"""
+    from werkzeug.serving import make_server
+    import app as smartest
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    pool_config = dict(smartest.DB_POOL_CONFIG, max_size=pool_max_size)
+    smartest.create_app(db_config=db_config, pool_config=pool_config)
+    smartest.init_worker()
+    make_server(host, port, smartest.app, threaded=True).serve_forever()
+
+
+def wait_until_ready(url, process, timeout=30.0):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not process.is_alive():
+            raise RuntimeError("Serverul local s-a oprit la pornire")
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request('GET', '/api/question-types')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+            conn.close()
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Serverul local nu răspunde după {timeout:.0f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de încărcare SmarTest (trafic de examen)")
+    parser.add_argument('--url', help="serverul țintă (altfel pornește aplicația local pe o schemă temporară)")
+    parser.add_argument('--dsn', help="PostgreSQL pentru serverul local (altfel SMARTEST_BENCH_DSN sau DB_CONFIG)")
+    parser.add_argument('--students', type=int, default=50, help="studenți simultani (implicit 50)")
+    parser.add_argument('--exams', type=int, default=1, help="examene per student (implicit 1)")
+    parser.add_argument('--practice', type=int, default=0,
+                        help="întrebări exersate după examen (GET + /api/evaluate), implicit 0")
+    parser.add_argument('--ramp-up', type=float, default=0.0,
+                        help="secunde în care pornesc toți studenții (0 = început simultan de examen)")
+    parser.add_argument('--think-time', type=parse_range, default=(0.5, 2.0),
+                        help="pauza per întrebare, în secunde: 'min-max' (implicit 0.5-2)")
+    parser.add_argument('--sync-submit', action='store_true',
+                        help="toți studenții predau deodată (termen limită)")
+    parser.add_argument('--exam', type=parse_exam, default=DEFAULT_EXAM,
+                        help="configurația testului: 'knight=4,nash=2,...'")
+    parser.add_argument('--answer-mix', type=parse_answer_mix, default=DEFAULT_ANSWER_MIX,
+                        help="ponderile răspunsurilor: 'correct=0.4,partial=0.3,wrong=0.2,empty=0.1'")
+    parser.add_argument('--pool-size', type=int, default=20, help="max_size al pool-ului DB pe serverul local")
+    parser.add_argument('--timeout', type=float, default=30.0, help="timeout per cerere, în secunde")
+    parser.add_argument('--seed', type=int, default=1, help="sămânța comportamentului studenților")
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help="rata maximă a erorilor acceptată (implicit 0.01)")
+    parser.add_argument('--json', dest='json_path', help="salvează raportul în fișierul JSON dat")
+    options = parser.parse_args(argv)
+
+    answer_book = AnswerBook(bench_questions())
+    server = None
+    db_config = None
+
+    if options.url is None:
+        db_config = db_config_from_args(options)
+        db, _, schema_config = setup_db(db_config, schema=LOAD_SCHEMA)
+        if db is None:
+            return 2
+        db.close()
+
+        host = '127.0.0.1'
+        port = free_port(host)
+        options.url = f"http://{host}:{port}"
+        server = multiprocessing.Process(
+            target=serve, args=(schema_config, host, port, options.pool_size), daemon=True
+        )
+        server.start()
+
+    try:
+        if server is not None:
+            wait_until_ready(options.url, server)
+        summary = run_load(options, answer_book)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+            drop_schema(db_config, schema=LOAD_SCHEMA)
+
+    print_summary(summary)
+    if options.json_path:
+        summary['options'] = {
+            key: value for key, value in vars(options).items() if key not in ('dsn', 'json_path')
+        }
+        with open(options.json_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    error_rate = summary['routes']['TOTAL']['error_rate']
+    if error_rate > options.max_error_rate:
+        print(f"\n❌ Rata erorilor {error_rate * 100:.1f}% depășește {options.max_error_rate * 100:.1f}%")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Rulează suita de benchmark-uri și o compară cu baseline-urile salvate
+
+    python -m benchmarks.run                       # toate (DB: configurația din app.py)
+    python -m benchmarks.run -k evaluator          # doar benchmark-urile care conțin "evaluator"
+    python -m benchmarks.run --no-db               # fără PostgreSQL
+    python -m benchmarks.run --dsn "host=localhost port=5433 dbname=bench user=postgres"
+    python -m benchmarks.run --save                # actualizează baselines.json cu rezultatele curente
+
+Codul de ieșire este 1 dacă minimul unui benchmark depășește baseline * (1 + toleranță).
+Baseline-urile depind de mașină: după schimbarea mașinii de referință, regenerează-le cu --save.
+
+Benchmark-urile DB rulează într-o schemă separată (BENCH_SCHEMA), creată, populată cu
+universul de întrebări și ștearsă la final - tabelele aplicației nu sunt atinse.
+"""
+import argparse
+import os
+import sys
+
+import psycopg2
+
+from . import suite  # noqa: F401 - înregistrează benchmark-urile
+from .harness import BENCHMARKS, DEFAULT_TOLERANCE, load_baselines, machine_info, run, save_baselines
+from utils.question_db_manager import QuestionDBManager
+
+BENCH_SCHEMA = 'smartest_bench'
+
+# Semințe Nash suplimentare: banca de test are astfel câteva sute de rânduri în plus
+BENCH_EXTRA_NASH_SEEDS = range(1, 11)
+
+
+def db_config_from_args(args):
+    if args.dsn:
+        return {'dsn': args.dsn}
+    if os.environ.get('SMARTEST_BENCH_DSN'):
+        return {'dsn': os.environ['SMARTEST_BENCH_DSN']}
+    from app import DB_CONFIG
+    return dict(DB_CONFIG)
+
+
+def bench_questions():
+    """Întrebările cu care e populată baza de test: universul plus jocuri Nash suplimentare"""
+    generator = suite.shared_generator()
+    questions = generator.get_all_questions()
+    for seed in BENCH_EXTRA_NASH_SEEDS:
+        questions.extend(generator.render(spec) for spec in generator.iter_specs('nash', seed=seed))
+    return questions
+
+
+def setup_db(db_config, schema=BENCH_SCHEMA, out=sys.stdout):
+    """
+    Creează și populează o schemă de unică folosință.
+    Returnează (manager, ID-uri, configurația conexiunii la schemă) sau (None, None, None).
+    """
+    try:
+        conn = psycopg2.connect(**db_config)
+    except psycopg2.Error as e:
+        print(f"⚠️  PostgreSQL indisponibil: {e}".strip(), file=out)
+        return None, None, None
+
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+            cursor.execute(f"CREATE SCHEMA {schema};")
+    finally:
+        conn.close()
+
+    schema_config = dict(db_config, options=f'-c search_path={schema}')
+    db = QuestionDBManager(schema_config, pool_config={'min_size': 1, 'max_size': 4})
+    db.ensure_schema()
+    db.save_questions_bulk(bench_questions())
+
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE questions;")
+            cursor.execute("SELECT id FROM questions ORDER BY id;")
+            ids = [row[0] for row in cursor.fetchall()]
+
+    print(f"🗄️  Schema {schema}: {len(ids)} întrebări", file=out)
+    return db, ids, schema_config
+
+
+def drop_schema(db_config, schema=BENCH_SCHEMA):
+    conn = psycopg2.connect(**db_config)
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE;")
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-uri SmarTest")
+    parser.add_argument('-k', dest='name_filter', help="rulează doar benchmark-urile care conțin textul")
+    parser.add_argument('--save', action='store_true', help="salvează rezultatele ca baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"toleranța de regresie implicită (implicit {DEFAULT_TOLERANCE})")
+    parser.add_argument('--no-db', action='store_true', help="sare benchmark-urile DB")
+    parser.add_argument('--dsn', help="conexiunea PostgreSQL (altfel SMARTEST_BENCH_DSN sau DB_CONFIG)")
+    args = parser.parse_args(argv)
+
+    context = {'db': None, 'db_ids': None}
+    try:
+        import numpy
+        context['numpy'] = numpy
+    except ImportError:
+        context['numpy'] = None
+
+    baselines = load_baselines()
+    if baselines.get('machine') and baselines['machine'] != machine_info():
+        print("⚠️  Baseline-urile au fost salvate pe altă mașină/versiune Python - comparația e orientativă")
+
+    db_config = None
+    wants_db = not args.no_db and any(
+        'db' in b.requires and (not args.name_filter or args.name_filter in b.name) for b in BENCHMARKS
+    )
+    if wants_db:
+        db_config = db_config_from_args(args)
+        context['db'], context['db_ids'], _ = setup_db(db_config)
+        if context['db'] is None:
+            print("⚠️  Benchmark-urile DB sunt sărite")
+
+    try:
+        results, regressions = run(context, name_filter=args.name_filter,
+                                   tolerance=args.tolerance, baselines=baselines)
+    finally:
+        if context['db'] is not None:
+            context['db'].close()
+            drop_schema(db_config)
+
+    if args.save:
+        save_baselines(results)
+        print(f"\n💾 Baseline-uri actualizate pentru {len(results)} benchmark-uri")
+        return 0
+
+    if regressions:
+        print(f"\n❌ Regresii ({len(regressions)}): {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ {len(results)} benchmark-uri, fără regresii")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
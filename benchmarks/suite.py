@@ -0,0 +1,235 @@
+"""
+Benchmark-urile căilor fierbinți: generator, solver Nash, evaluator, export PDF, DB
+Datele de intrare sunt deterministe (sămânță fixă), deci rulările sunt comparabile.
+"""
+import io
+import json
+import random
+from collections import namedtuple
+
+from generators.question_generator import QuestionGenerator
+from generators.nash_generator import NashGameGenerator
+from utils.evaluator import QuestionEvaluator
+from utils.pdf_exporter import PDFExporter
+
+from .harness import benchmark
+
+SEED = 20240101
+
+# Rândurile exportului PDF au atribute (ca namedtuple-urile din iter_questions_full)
+PDFRow = namedtuple('PDFRow', 'id title question correct_answer explanation type')
+
+_shared = {}
+
+
+def shared_generator():
+    """Generator cu universul deja memoizat (cazul din producție după încălzire)"""
+    if 'generator' not in _shared:
+        generator = QuestionGenerator(seed=SEED)
+        generator.get_all_questions()
+        _shared['generator'] = generator
+    return _shared['generator']
+
+
+def universe(q_type=None):
+    questions = shared_generator().get_all_questions()
+    return [q for q in questions if q_type is None or q['type'] == q_type]
+
+
+# ==================== GENERATOR ====================
+
+@benchmark('generator.get_all_questions.cold', group='generator', repeat=5, number=1)
+def bench_all_questions_cold(ctx):
+    # Instanță nouă la fiecare apel: construiește universul de la zero
+    return lambda: QuestionGenerator(seed=SEED).get_all_questions()
+
+
+@benchmark('generator.get_all_questions.memoized', group='generator')
+def bench_all_questions_memoized(ctx):
+    generator = shared_generator()
+    return generator.get_all_questions
+
+
+@benchmark('generator.iter_specs.random', group='generator')
+def bench_iter_specs(ctx):
+    generator = shared_generator()
+    return lambda: list(generator.iter_specs('random'))
+
+
+@benchmark('generator.nash_specs.new_seed', group='generator', repeat=5)
+def bench_nash_specs_new_seed(ctx):
+    generator = shared_generator()
+    seeds = iter(range(1, 10 ** 9))
+    return lambda: list(generator.iter_specs('nash', seed=next(seeds)))
+
+
+# ==================== SOLVER NASH ====================
+
+def _nash_solver_bench(size):
+    def factory(ctx):
+        solver = NashGameGenerator(seed=SEED)
+        rng = random.Random(SEED)
+        games = [solver.generate_random_game(size, size, rng=rng)[0] for _ in range(100)]
+        return lambda: [solver.find_pure_nash_equilibria(game) for game in games]
+    return factory
+
+
+for _size in (2, 3, 5, 8, 16):
+    benchmark(f'nash.find_pure_nash_equilibria.{_size}x{_size}.x100', group='nash')(_nash_solver_bench(_size))
+
+
+@benchmark('nash.find_pure_nash_equilibria_batch.3x3.x1000', group='nash', requires=('numpy',))
+def bench_nash_batch(ctx):
+    np = ctx['numpy']
+    solver = NashGameGenerator(seed=SEED)
+    rng = np.random.default_rng(SEED)
+    p1 = rng.integers(-5, 11, size=(1000, 3, 3))
+    p2 = rng.integers(-5, 11, size=(1000, 3, 3))
+    return lambda: solver.find_pure_nash_equilibria_batch(p1, p2)
+
+
+# ==================== EVALUATOR ====================
+
+SHORT_ANSWER = "warnsdorff"
+LONG_ANSWER = (
+    "Pentru turul calului folosim backtracking combinat cu euristica Warnsdorff: la fiecare pas "
+    "alegem mutarea către pătratul cu cele mai puține continuări posibile (degree heuristic). "
+    "Astfel reducem drastic numărul de ramuri explorate, iar backtracking-ul intervine doar când "
+    "euristica ajunge într-un punct mort. Complexitatea practică devine aproape liniară în numărul "
+    "de pătrate, spre deosebire de DFS-ul naiv, care este exponențial. "
+) * 4
+NEGATED_ANSWER = "Nu folosim backtracking și nici warnsdorff, ci o căutare greedy fără euristică."
+
+
+def _standard_question():
+    return universe('knight')[0]
+
+
+def _evaluate_bench(user_answer):
+    def factory(ctx):
+        evaluator = QuestionEvaluator()
+        q = _standard_question()
+        return lambda: evaluator.evaluate(user_answer, q['correct_answer'], q['type'])
+    return factory
+
+
+benchmark('evaluator.evaluate.short', group='evaluator')(_evaluate_bench(SHORT_ANSWER))
+benchmark('evaluator.evaluate.long', group='evaluator')(_evaluate_bench(LONG_ANSWER))
+benchmark('evaluator.evaluate.negated', group='evaluator')(_evaluate_bench(NEGATED_ANSWER))
+
+
+@benchmark('evaluator.evaluate.nash_checkbox', group='evaluator')
+def bench_nash_checkbox(ctx):
+    evaluator = QuestionEvaluator()
+    q = universe('nash')[0]
+    cells = [{'i': i, 'j': j} for i, j in json.loads(q['nash_equilibria'])]
+    user_answer = json.dumps({'no_nash': not cells, 'selected_cells': cells})
+    question_data = {'nash_equilibria': q['nash_equilibria']}
+    return lambda: evaluator.evaluate(user_answer, q['correct_answer'], 'nash', question_data=question_data)
+
+
+@benchmark('evaluator.evaluate_batch.test_of_500', group='evaluator', repeat=5)
+def bench_evaluate_batch(ctx):
+    evaluator = QuestionEvaluator()
+    rng = random.Random(SEED)
+    questions = [q for q in universe() if q['type'] not in ('nash', 'nash-mixed')]
+    items = [
+        {
+            'user_answer': rng.choice((SHORT_ANSWER, LONG_ANSWER, NEGATED_ANSWER, q['correct_answer'])),
+            'correct_answer': q['correct_answer'],
+            'type': q['type']
+        }
+        for q in (rng.choice(questions) for _ in range(500))
+    ]
+    # Fără pool de procese: măsurăm costul evaluării, nu al IPC
+    return lambda: evaluator.evaluate_batch(items, workers=0)
+
+
+# ==================== EXPORT PDF ====================
+
+def _pdf_bench(count):
+    def factory(ctx):
+        exporter = PDFExporter()
+        questions = universe()
+        rows = [
+            PDFRow(q.get('id'), q['title'], q['question'], q['correct_answer'], q['explanation'], q['type'])
+            for q in (questions * (count // len(questions) + 1))[:count]
+        ]
+        return lambda: exporter.build(rows, io.BytesIO())
+    return factory
+
+
+benchmark('pdf.build.50', group='pdf', repeat=5)(_pdf_bench(50))
+benchmark('pdf.build.400', group='pdf', repeat=3, number=1)(_pdf_bench(400))
+
+
+# ==================== BAZA DE DATE ====================
+# Rulează pe o schemă separată populată de run.py (ctx['db'] = QuestionDBManager fără cache,
+# ctx['db_ids'] = ID-urile întrebărilor inserate)
+# Toleranță mai largă: timpii includ serverul PostgreSQL (alt proces, I/O)
+DB_TOLERANCE = 0.50
+
+@benchmark('db.get_question_by_id', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_question_by_id(ctx):
+    db, ids = ctx['db'], ctx['db_ids']
+    rng = random.Random(SEED)
+    return lambda: db.get_question_by_id(rng.choice(ids))
+
+
+@benchmark('db.get_questions_by_ids.30', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_questions_by_ids(ctx):
+    db, ids = ctx['db'], ctx['db_ids']
+    rng = random.Random(SEED)
+    return lambda: db.get_questions_by_ids(rng.sample(ids, 30))
+
+
+@benchmark('db.get_questions_page.50', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_questions_page(ctx):
+    db = ctx['db']
+    return lambda: db.get_questions_page(page_size=50)
+
+
+@benchmark('db.count_questions.by_type', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_count_questions(ctx):
+    db = ctx['db']
+    return lambda: db.count_questions(q_type='knight')
+
+
+@benchmark('db.get_random_questions_by_types.test', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_random_questions(ctx):
+    db = ctx['db']
+    config = {'knight': 4, 'hanoi': 2, 'coloring': 2, 'nash': 2}
+    return lambda: db.get_random_questions_by_types(config)
+
+
+@benchmark('db.filter_new_titles.universe', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_filter_new_titles(ctx):
+    db = ctx['db']
+    titles = [q['title'] for q in universe()]
+    return lambda: db.filter_new_titles(titles)
+
+
+@benchmark('db.test_session.create_and_read', group='db', requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_test_session(ctx):
+    db, ids = ctx['db'], ctx['db_ids']
+    questions = list(db.get_questions_by_ids(ids[:10]).values())
+    evaluator = QuestionEvaluator()
+    entries = [
+        {
+            'id': q['id'], 'type': q['type'], 'title': q['title'],
+            'correct_answer': q['correct_answer'], 'explanation': q['explanation'],
+            'answer_key': evaluator.build_answer_key(q['correct_answer'], q['type'], question_data=q)
+        }
+        for q in questions
+    ]
+
+    def create_and_read():
+        session_id = db.create_test_session(entries, ttl=60)
+        return db.get_test_session(session_id, mark_submitted=True)
+    return create_and_read
+
+
+@benchmark('db.iter_questions_full.all', group='db', repeat=5, requires=('db',), tolerance=DB_TOLERANCE)
+def bench_db_iter_full(ctx):
+    db = ctx['db']
+    return lambda: sum(1 for _ in db.iter_questions_full(itersize=500))
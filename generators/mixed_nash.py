@@ -0,0 +1,154 @@
+"""
+Solver pentru echilibre Nash MIXTE (enumerarea suporturilor)
+Calcule exacte cu numere raționale (fractions.Fraction), cu buget limitat per joc
+"""
+from fractions import Fraction
+from itertools import combinations
+
+
+class SolverBudgetExceeded(Exception):
+    """Enumerarea a depășit bugetul de perechi de suporturi"""
+
+
+class MixedNashSolver:
+    """
+    Găsește echilibrele Nash (pure și mixte) ale unui joc bimatriceal prin
+    enumerarea perechilor de suporturi de aceeași dimensiune. Rezultatele sunt
+    exacte pentru jocuri nedegenerate; pentru jocuri degenerate (egalități)
+    se returnează doar echilibrele cu sisteme de indiferență unic determinate.
+    """
+
+    def __init__(self, max_support_pairs=5000):
+        """
+        max_support_pairs: numărul maxim de perechi (I, J) verificate per joc.
+        Bugetul e determinist (nu depinde de viteza mașinii), deci același joc
+        e rezolvat sau respins la fel peste tot - întrebările rămân reproductibile.
+        """
+        self.max_support_pairs = max_support_pairs
+
+    # ======================= ALGEBRĂ EXACTĂ =======================
+
+    @staticmethod
+    def _solve_linear(matrix, rhs):
+        """
+        Rezolvă exact sistemul pătratic matrix * x = rhs (eliminare Gauss pe Fraction).
+        Returnează None dacă sistemul e singular.
+        """
+        n = len(matrix)
+        aug = [[Fraction(v) for v in row] + [Fraction(b)] for row, b in zip(matrix, rhs)]
+
+        for col in range(n):
+            pivot = next((r for r in range(col, n) if aug[r][col] != 0), None)
+            if pivot is None:
+                return None
+            aug[col], aug[pivot] = aug[pivot], aug[col]
+
+            pivot_val = aug[col][col]
+            for r in range(n):
+                if r != col and aug[r][col] != 0:
+                    factor = aug[r][col] / pivot_val
+                    aug[r] = [a - factor * b for a, b in zip(aug[r], aug[col])]
+
+        return [aug[i][n] / aug[i][i] for i in range(n)]
+
+    def _indifferent_mix(self, payoffs_on_support):
+        """
+        Pentru o matrice k x k (plăți ale jucătorului care trebuie făcut indiferent,
+        rânduri = strategiile sale, coloane = suportul adversarului), găsește
+        distribuția x a adversarului și valoarea v astfel încât M x = v·1, sum(x) = 1.
+        Necunoscute: x_1..x_k, v.
+        """
+        k = len(payoffs_on_support)
+        matrix = [list(row) + [-1] for row in payoffs_on_support]
+        matrix.append([1] * k + [0])
+        rhs = [0] * k + [1]
+
+        solution = self._solve_linear(matrix, rhs)
+        if solution is None:
+            return None, None
+        return solution[:k], solution[k]
+
+    # ======================= ENUMERAREA SUPORTURILOR =======================
+
+    def solve(self, p1, p2, max_equilibria=None):
+        """
+        Găsește echilibrele Nash ale jocului (p1, p2 - liste de liste n_rows x n_cols).
+
+        Returns:
+            list: [(p, q), ...] cu p (distribuția J1 pe rânduri) și q (distribuția J2
+            pe coloane) ca tupluri de Fraction, în ordinea mărimii suportului.
+
+        Raises:
+            SolverBudgetExceeded: dacă bugetul de perechi e depășit
+        """
+        n_rows = len(p1)
+        n_cols = len(p1[0])
+        checked = 0
+        equilibria = []
+
+        for k in range(1, min(n_rows, n_cols) + 1):
+            for rows in combinations(range(n_rows), k):
+                for cols in combinations(range(n_cols), k):
+                    checked += 1
+                    if checked > self.max_support_pairs:
+                        raise SolverBudgetExceeded(
+                            f"Buget depășit după {checked - 1} perechi de suporturi"
+                        )
+
+                    equilibrium = self._check_support(p1, p2, rows, cols)
+                    if equilibrium is not None and equilibrium not in equilibria:
+                        equilibria.append(equilibrium)
+                        if max_equilibria and len(equilibria) >= max_equilibria:
+                            return equilibria
+
+        return equilibria
+
+    def _check_support(self, p1, p2, rows, cols):
+        n_rows = len(p1)
+        n_cols = len(p1[0])
+
+        # q (J2 pe coloanele `cols`) face J1 indiferent între rândurile `rows`
+        q_support, v = self._indifferent_mix([[p1[i][j] for j in cols] for i in rows])
+        if q_support is None or any(x < 0 for x in q_support):
+            return None
+
+        # p (J1 pe rândurile `rows`) face J2 indiferent între coloanele `cols`
+        p_support, u = self._indifferent_mix([[p2[i][j] for i in rows] for j in cols])
+        if p_support is None or any(x < 0 for x in p_support):
+            return None
+
+        q = [Fraction(0)] * n_cols
+        for j, x in zip(cols, q_support):
+            q[j] = x
+        p = [Fraction(0)] * n_rows
+        for i, x in zip(rows, p_support):
+            p[i] = x
+
+        # Nicio strategie din afara suportului nu trebuie să fie mai bună
+        for i in range(n_rows):
+            if sum(p1[i][j] * q[j] for j in range(n_cols)) > v:
+                return None
+        for j in range(n_cols):
+            if sum(p2[i][j] * p[i] for i in range(n_rows)) > u:
+                return None
+
+        return tuple(p), tuple(q)
+
+    # ======================= UTILITARE =======================
+
+    @staticmethod
+    def expected_payoffs(p1, p2, p, q):
+        """Plățile așteptate (J1, J2) pentru profilul mixt (p, q)"""
+        e1 = sum(p[i] * q[j] * p1[i][j] for i in range(len(p)) for j in range(len(q)))
+        e2 = sum(p[i] * q[j] * p2[i][j] for i in range(len(p)) for j in range(len(q)))
+        return e1, e2
+
+    @staticmethod
+    def is_pure(profile):
+        p, q = profile
+        return all(x in (0, 1) for x in p) and all(x in (0, 1) for x in q)
+
+    @staticmethod
+    def format_fraction(value):
+        value = Fraction(value)
+        return str(value.numerator) if value.denominator == 1 else f"{value.numerator}/{value.denominator}"
@@ -5,11 +5,30 @@ Cu tabel formatat simplu (fără Unicode)
 import random
 import json
 
+try:
+    import numpy as np
+except ImportError:  # NumPy e opțional - fără el se folosește solverul pur Python
+    np = None
+
+from generators.mixed_nash import MixedNashSolver, SolverBudgetExceeded
+
+
 class NashGameGenerator:
     """Generează jocuri aleatorii și calculează echilibrele Nash pure"""
+
+    # De la câte celule merită solverul vectorizat (sub prag overhead-ul NumPy domină)
+    NUMPY_MIN_CELLS = 64
     
-    def __init__(self):
+    def __init__(self, seed=None):
+        """
+        seed: sămânța de bază. Fiecare joc din univers e derivat din (cheie, sămânță),
+        deci aceeași sămânță produce mereu aceleași jocuri. Fără sămânță se alege
+        una aleatorie (păstrată în self.seed pentru reproducere).
+        """
         self.game_counter = 0
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.mixed_solver = MixedNashSolver(max_support_pairs=5000)
     
     def find_pure_nash_equilibria(self, payoff_matrix):
         """
@@ -18,6 +37,64 @@ class NashGameGenerator:
         Returns:
             list: [(row_idx, col_idx), ...] - toate echilibrele Nash găsite
         """
+        n_cells = len(payoff_matrix['rows']) * len(payoff_matrix['cols'])
+        if np is not None and n_cells >= self.NUMPY_MIN_CELLS:
+            p1, p2 = self.payoff_arrays(payoff_matrix)
+            return self.find_pure_nash_equilibria_arrays(p1, p2)
+        return self._find_pure_nash_equilibria_py(payoff_matrix)
+
+    # ==================== SOLVER VECTORIZAT (NumPy) ====================
+    def payoff_arrays(self, payoff_matrix):
+        """Convertește plățile (listă de tupluri) în două matrici NumPy (J1, J2)"""
+        payoffs = np.asarray(payoff_matrix['payoffs'])
+        return payoffs[:, :, 0], payoffs[:, :, 1]
+
+    def find_pure_nash_equilibria_arrays(self, p1, p2):
+        """
+        Echilibrele Nash pure pentru plăți date ca matrici (n_rows x n_cols).
+        O celulă e echilibru dacă plata J1 e maximă pe coloana ei și plata J2
+        e maximă pe rândul ei. Ordinea rezultatelor e aceeași ca la solverul pur.
+        """
+        best_p1 = p1 == p1.max(axis=0, keepdims=True)
+        best_p2 = p2 == p2.max(axis=1, keepdims=True)
+        return [(int(i), int(j)) for i, j in np.argwhere(best_p1 & best_p2)]
+
+    def find_pure_nash_equilibria_batch(self, p1, p2):
+        """
+        Echilibrele pentru un lot de jocuri de aceeași dimensiune.
+        p1, p2: matrici (n_games x n_rows x n_cols). Returnează o listă de liste de (i, j).
+        """
+        best_p1 = p1 == p1.max(axis=1, keepdims=True)
+        best_p2 = p2 == p2.max(axis=2, keepdims=True)
+        result = [[] for _ in range(p1.shape[0])]
+        for g, i, j in np.argwhere(best_p1 & best_p2):
+            result[g].append((int(i), int(j)))
+        return result
+
+    def generate_random_games_batch(self, n_games, n_rows=3, n_cols=3, min_payoff=-5, max_payoff=10, seed=None):
+        """
+        Generează rapid un lot de jocuri aleatorii (necesită NumPy).
+        Returnează o listă de (game, nash_eq), ca generate_random_game.
+        """
+        if np is None:
+            raise RuntimeError("generate_random_games_batch necesită NumPy")
+
+        rng = np.random.default_rng(seed)
+        p1 = rng.integers(min_payoff, max_payoff + 1, size=(n_games, n_rows, n_cols))
+        p2 = rng.integers(min_payoff, max_payoff + 1, size=(n_games, n_rows, n_cols))
+        all_nash = self.find_pure_nash_equilibria_batch(p1, p2)
+
+        rows = [f'A{i+1}' for i in range(n_rows)]
+        cols = [f'B{i+1}' for i in range(n_cols)]
+        games = []
+        for g, (g_p1, g_p2) in enumerate(zip(p1.tolist(), p2.tolist())):
+            payoffs = [list(zip(r1, r2)) for r1, r2 in zip(g_p1, g_p2)]
+            games.append(({'rows': list(rows), 'cols': list(cols), 'payoffs': payoffs}, all_nash[g]))
+        return games
+
+    # ==================== SOLVER PUR PYTHON ====================
+    def _find_pure_nash_equilibria_py(self, payoff_matrix):
+        """Varianta pur Python: verifică fiecare celulă pe rândul și coloana ei"""
         rows = payoff_matrix['rows']
         cols = payoff_matrix['cols']
         payoffs = payoff_matrix['payoffs']
@@ -53,8 +130,9 @@ class NashGameGenerator:
         
         return nash_equilibria
     
-    def generate_random_game(self, n_rows=3, n_cols=3, min_payoff=-5, max_payoff=10):
-        """Generează un joc COMPLET ALEATORIU"""
+    def generate_random_game(self, n_rows=3, n_cols=3, min_payoff=-5, max_payoff=10, rng=None):
+        """Generează un joc COMPLET ALEATORIU (din rng, implicit generatorul instanței)"""
+        rng = rng or self.rng
         rows = [f'A{i+1}' for i in range(n_rows)]
         cols = [f'B{i+1}' for i in range(n_cols)]
         
@@ -63,8 +141,8 @@ class NashGameGenerator:
         for i in range(n_rows):
             row = []
             for j in range(n_cols):
-                p1 = random.randint(min_payoff, max_payoff)
-                p2 = random.randint(min_payoff, max_payoff)
+                p1 = rng.randint(min_payoff, max_payoff)
+                p2 = rng.randint(min_payoff, max_payoff)
                 row.append((p1, p2))
             payoffs.append(row)
         
@@ -186,45 +264,90 @@ class NashGameGenerator:
         
         return explanation
     
-    def get_all_nash_questions(self):
-        """Generează întrebări Nash cu DIVERSITATE ALEATORIE"""
-        questions = []
+    # ==================== REPRODUCTIBILITATE ====================
+    def rng_for(self, key, seed=None):
+        """
+        Generator aleator dedicat unei întrebări: depinde doar de (cheie, sămânță),
+        nu de ordinea în care sunt generate celelalte întrebări.
+        """
+        return random.Random(f"{self.seed if seed is None else seed}|{key!r}")
+
+    def _title_suffix(self, seed):
+        """Sămânțele diferite de cea de bază primesc un sufix, ca titlurile să rămână unice"""
+        return '' if seed is None or seed == self.seed else f' S{seed}'
+
+    def spec_for_key(self, key, seed=None):
+        """Regenerează specificația unei întrebări Nash din cheia ei (și sămânță)"""
+        q_type, params = key
+        if q_type == 'nash' and len(params) == 3:
+            return self._nash_spec(*params, seed=seed)
+        if q_type == 'nash' and len(params) == 5 and params[2] == 'T':
+            n_rows, n_cols, _, n_eq, variant = params
+            return self._targeted_nash_spec(n_rows, n_cols, n_eq, variant, seed=seed)
+        if q_type == 'nash-mixed':
+            return self._mixed_nash_spec(*params, seed=seed)
+        raise ValueError(f"Cheie Nash necunoscută: {key!r}")
+
+    # Dimensiunile jocurilor din universul de întrebări Nash
+    NASH_SIZES = [
+        (2, 2), (2, 3), (3, 2), (3, 3), (3, 4), (4, 3), (4, 4)
+    ]
+    NASH_VARIANTS = 8
+
+    def _describe_game(self, n_rows, n_cols, nash_eq):
+        nash_count = len(nash_eq)
+        if nash_count == 0:
+            return f"{n_rows}x{n_cols} fara Nash"
+        elif nash_count == 1:
+            return f"{n_rows}x{n_cols} cu 1 Nash"
+        return f"{n_rows}x{n_cols} cu {nash_count} Nash"
+
+    def _nash_spec(self, n_rows, n_cols, variant, seed=None):
+        key = ('nash', (n_rows, n_cols, variant))
+        game, nash_eq = self.generate_random_game(
+            n_rows=n_rows,
+            n_cols=n_cols,
+            min_payoff=-5,
+            max_payoff=10,
+            rng=self.rng_for(key, seed)
+        )
+
+        desc = self._describe_game(n_rows, n_cols, nash_eq)
+        return {
+            'type': 'nash',
+            'title': f'Nash Equilibrium - {desc} (V{variant + 1}){self._title_suffix(seed)}',
+            'key': key,
+            'seed': self.seed if seed is None else seed,
+            'game': game,
+            'nash_eq': nash_eq
+        }
+
+    def iter_nash_specs(self, seed=None):
+        """
+        Generează specificațiile jocurilor Nash (joc + echilibre + titlu),
+        FĂRĂ a construi textele. Textele se obțin cu build_nash_question.
+        Jocurile sunt determinate de (dimensiune, variantă, sămânță).
+        """
         self.game_counter = 0
-        
-        sizes = [
-            (2, 2), (2, 3), (3, 2), (3, 3), (3, 4), (4, 3), (4, 4)
-        ]
-        
-        for n_rows, n_cols in sizes:
-            for variant in range(8):
+
+        for n_rows, n_cols in self.NASH_SIZES:
+            for variant in range(self.NASH_VARIANTS):
                 self.game_counter += 1
-                
-                game, nash_eq = self.generate_random_game(
-                    n_rows=n_rows,
-                    n_cols=n_cols,
-                    min_payoff=-5,
-                    max_payoff=10
-                )
-                
-                game_text = self.format_game_as_table(game)
-                correct_answer = self.format_nash_answer(game, nash_eq)
-                explanation = self.generate_explanation(game, nash_eq)
-                
-                nash_count = len(nash_eq)
-                if nash_count == 0:
-                    desc = f"{n_rows}x{n_cols} fara Nash"
-                elif nash_count == 1:
-                    desc = f"{n_rows}x{n_cols} cu 1 Nash"
-                else:
-                    desc = f"{n_rows}x{n_cols} cu {nash_count} Nash"
-                
-                game_data_json = json.dumps(game)
-                nash_eq_json = json.dumps(nash_eq)
-                
-                questions.append({
-                    'type': 'nash',
-                    'title': f'Nash Equilibrium - {desc} (V{variant + 1})',
-                    'question': f'''Pentru urmatorul joc in forma normala:
+                yield self._nash_spec(n_rows, n_cols, variant, seed=seed)
+
+    def build_nash_question(self, title, game, nash_eq):
+        """Construiește întrebarea completă (text, răspuns, explicație) pentru un joc"""
+        game_text = self.format_game_as_table(game)
+        correct_answer = self.format_nash_answer(game, nash_eq)
+        explanation = self.generate_explanation(game, nash_eq)
+
+        game_data_json = json.dumps(game)
+        nash_eq_json = json.dumps(nash_eq)
+
+        return {
+            'type': 'nash',
+            'title': title,
+            'question': f'''Pentru urmatorul joc in forma normala:
 
 {game_text}
 
@@ -233,13 +356,282 @@ Intrebari:
 2. Daca da, care este/sunt acesta/acestea?
 
 Nota: Un echilibru Nash pur este o pereche de strategii unde niciun jucator nu poate imbunatati unilateral plata sa.''',
-                    'correct_answer': correct_answer,
-                    'explanation': explanation,
-                    'game_data': game_data_json,
-                    'nash_equilibria': nash_eq_json
-                })
-        
-        return questions
+            'correct_answer': correct_answer,
+            'explanation': explanation,
+            'game_data': game_data_json,
+            'nash_equilibria': nash_eq_json
+        }
+
+    def get_all_nash_questions(self):
+        """Generează întrebări Nash cu DIVERSITATE ALEATORIE"""
+        return [
+            self.build_nash_question(spec['title'], spec['game'], spec['nash_eq'])
+            for spec in self.iter_nash_specs()
+        ]
+
+
+    # ==================== GENERARE ȚINTITĂ (FĂRĂ RESPINGERE) ====================
+    def _strict_max_column(self, length, argmax, min_payoff, max_payoff, rng):
+        """Valori aleatorii cu maximul STRICT pe poziția argmax"""
+        top = rng.randint(min_payoff + 1, max_payoff)
+        values = [rng.randint(min_payoff, top - 1) for _ in range(length)]
+        values[argmax] = top
+        return values
+
+    def construct_game(self, n_rows=3, n_cols=3, n_equilibria=None, placement=None,
+                       min_payoff=-5, max_payoff=10, rng=None):
+        """
+        Construiește DIRECT un joc cu exact echilibrele Nash pure cerute.
+
+        placement: listă de celule (i, j) cu rânduri și coloane distincte; dacă lipsește,
+        se aleg aleator n_equilibria celule. Fiecare celulă-țintă primește maximul strict
+        pe coloana ei (J1) și pe rândul ei (J2). Pe coloanele libere maximul J1 e pus pe un
+        rând ales, iar pe rândurile libere maximul J2 e pus pe o coloană unde J1 NU e
+        maxim - astfel nu apar alte echilibre și nu e nevoie de solver.
+
+        Returns:
+            tuple: (game, nash_eq) - ca generate_random_game
+        """
+        rng = rng or self.rng
+        if max_payoff - min_payoff < 1:
+            raise ValueError("Intervalul plăților trebuie să conțină cel puțin două valori")
+
+        if placement is None:
+            if n_equilibria is None:
+                raise ValueError("Trebuie specificat n_equilibria sau placement")
+            if n_equilibria > min(n_rows, n_cols):
+                raise ValueError(f"Un joc {n_rows}x{n_cols} nu poate avea {n_equilibria} echilibre stricte")
+            eq_rows = rng.sample(range(n_rows), n_equilibria)
+            eq_cols = rng.sample(range(n_cols), n_equilibria)
+            placement = list(zip(eq_rows, eq_cols))
+
+        placement = sorted((int(i), int(j)) for i, j in placement)
+        used_rows = {i for i, _ in placement}
+        used_cols = {j for _, j in placement}
+        if len(used_rows) != len(placement) or len(used_cols) != len(placement):
+            raise ValueError("Echilibrele trebuie să fie pe rânduri și coloane distincte")
+        if any(not (0 <= i < n_rows and 0 <= j < n_cols) for i, j in placement):
+            raise ValueError("Celulă în afara matricei de plată")
+        if not placement and (n_rows < 2 or n_cols < 2):
+            raise ValueError("Un joc cu o singură strategie are mereu echilibru Nash pur")
+
+        eq_row_of_col = {j: i for i, j in placement}
+        eq_col_of_row = {i: j for i, j in placement}
+        free_rows = [i for i in range(n_rows) if i not in eq_col_of_row]
+        free_cols = [j for j in range(n_cols) if j not in eq_row_of_col]
+
+        # Pe coloanele libere alegem rândul unde J1 are maximul; fără echilibre,
+        # maximele nu pot fi toate pe același rând (acel rând ar conține un echilibru)
+        col_argmax = {j: rng.randrange(n_rows) for j in free_cols}
+        if not placement and len(set(col_argmax.values())) == 1:
+            j = rng.choice(free_cols)
+            col_argmax[j] = rng.choice([i for i in range(n_rows) if i != col_argmax[j]])
+        col_argmax.update(eq_row_of_col)
+
+        p1_cols = [self._strict_max_column(n_rows, col_argmax[j], min_payoff, max_payoff, rng) for j in range(n_cols)]
+
+        # Pe rândurile libere J2 își ia maximul pe o coloană unde J1 nu e cel mai bun
+        row_argmax = dict(eq_col_of_row)
+        for i in free_rows:
+            allowed = [j for j in range(n_cols) if col_argmax[j] != i]
+            row_argmax[i] = rng.choice(allowed)
+
+        p2_rows = [self._strict_max_column(n_cols, row_argmax[i], min_payoff, max_payoff, rng) for i in range(n_rows)]
+
+        game = {
+            'rows': [f'A{i+1}' for i in range(n_rows)],
+            'cols': [f'B{j+1}' for j in range(n_cols)],
+            'payoffs': [[(p1_cols[j][i], p2_rows[i][j]) for j in range(n_cols)] for i in range(n_rows)]
+        }
+        return game, placement
+
+    def _targeted_nash_spec(self, n_rows, n_cols, n_eq, variant, seed=None):
+        key = ('nash', (n_rows, n_cols, 'T', n_eq, variant))
+        game, nash_eq = self.construct_game(n_rows, n_cols, n_equilibria=n_eq, rng=self.rng_for(key, seed))
+        desc = self._describe_game(n_rows, n_cols, nash_eq)
+        return {
+            'type': 'nash',
+            'title': f'Nash Equilibrium - {desc} (T{variant + 1}){self._title_suffix(seed)}',
+            'key': key,
+            'seed': self.seed if seed is None else seed,
+            'game': game,
+            'nash_eq': nash_eq
+        }
+
+    def iter_targeted_nash_specs(self, equilibrium_counts=(0, 1, 2), variants=8, sizes=None, seed=None):
+        """
+        Specificații Nash construite direct, câte `variants` pentru fiecare
+        (dimensiune, număr de echilibre) realizabil. Titlurile (T1, T2, ...) sunt
+        stabile, deci deduplicarea după titlu funcționează ca la variantele V.
+        """
+        for n_rows, n_cols in (sizes or self.NASH_SIZES):
+            for n_eq in equilibrium_counts:
+                n_eq = int(n_eq)
+                if n_eq > min(n_rows, n_cols):
+                    continue
+                for variant in range(variants):
+                    yield self._targeted_nash_spec(n_rows, n_cols, n_eq, variant, seed=seed)
+
+    def sample_by_distribution(self, specs, count, distribution, rng=None):
+        """
+        Alege `count` specificații respectând distribuția {număr_echilibre: pondere}.
+        Cotele se rotunjesc prin metoda celor mai mari resturi; dacă o categorie nu
+        are destule jocuri, locurile rămase se completează din celelalte.
+        """
+        rng = rng or self.rng
+        weights = {int(k): float(v) for k, v in distribution.items() if float(v) > 0}
+        buckets = {}
+        for spec in specs:
+            n_eq = len(spec['nash_eq'])
+            if n_eq in weights:
+                buckets.setdefault(n_eq, []).append(spec)
+
+        total_weight = sum(weights.values())
+        if not total_weight:
+            return []
+        exact = {k: count * w / total_weight for k, w in weights.items()}
+        quotas = {k: int(v) for k, v in exact.items()}
+        for k in sorted(exact, key=lambda k: exact[k] - quotas[k], reverse=True)[:count - sum(quotas.values())]:
+            quotas[k] += 1
+
+        selected = []
+        leftovers = []
+        for k, quota in quotas.items():
+            pool = buckets.get(k, [])
+            rng.shuffle(pool)
+            selected.extend(pool[:quota])
+            leftovers.extend(pool[quota:])
+
+        missing = count - len(selected)
+        if missing > 0 and leftovers:
+            selected.extend(rng.sample(leftovers, min(missing, len(leftovers))))
+        return selected
+
+    # ==================== ECHILIBRE MIXTE ====================
+    MIXED_NASH_SIZES = [
+        (2, 2), (2, 3), (3, 2), (2, 4), (3, 3)
+    ]
+    MIXED_NASH_VARIANTS = 6
+
+    def _split_payoffs(self, game):
+        p1 = [[cell[0] for cell in row] for row in game['payoffs']]
+        p2 = [[cell[1] for cell in row] for row in game['payoffs']]
+        return p1, p2
+
+    def generate_mixed_game(self, n_rows=2, n_cols=2, min_payoff=-5, max_payoff=10, max_attempts=200, rng=None):
+        """
+        Generează un joc FĂRĂ echilibru Nash pur și îi calculează echilibrele mixte.
+        Jocurile pentru care solverul depășește bugetul sunt ignorate.
+
+        Returns:
+            tuple: (game, [(p, q), ...]) cu probabilități Fraction
+        """
+        for _ in range(max_attempts):
+            game, pure_eq = self.generate_random_game(n_rows, n_cols, min_payoff, max_payoff, rng=rng)
+            if pure_eq:
+                continue
+
+            p1, p2 = self._split_payoffs(game)
+            try:
+                equilibria = self.mixed_solver.solve(p1, p2)
+            except SolverBudgetExceeded:
+                continue
+            if equilibria:
+                return game, equilibria
+
+        raise RuntimeError(f"Nu s-a putut genera un joc mixt {n_rows}x{n_cols} în {max_attempts} încercări")
+
+    def format_mixed_profile(self, game, profile):
+        fmt = self.mixed_solver.format_fraction
+        p, q = profile
+        p_text = ", ".join(f"{name}: {fmt(x)}" for name, x in zip(game['rows'], p))
+        q_text = ", ".join(f"{name}: {fmt(x)}" for name, x in zip(game['cols'], q))
+        return f"p = ({p_text}); q = ({q_text})"
+
+    def format_mixed_answer(self, game, equilibria):
+        """Formatează răspunsul corect pentru echilibrele mixte"""
+        if len(equilibria) == 1:
+            return f"Echilibru Nash mixt: {self.format_mixed_profile(game, equilibria[0])}"
+        return f"Exista {len(equilibria)} echilibre Nash mixte: " + " | ".join(
+            self.format_mixed_profile(game, profile) for profile in equilibria
+        )
+
+    def generate_mixed_explanation(self, game, equilibria):
+        """Explicație: condițiile de indiferență pentru fiecare echilibru"""
+        fmt = self.mixed_solver.format_fraction
+        p1, p2 = self._split_payoffs(game)
+        rows = game['rows']
+        cols = game['cols']
+
+        explanation = "Jocul nu are echilibru Nash pur, deci cautam echilibre in strategii mixte.\n"
+        explanation += "Intr-un echilibru mixt fiecare jucator il face pe celalalt indiferent intre strategiile din suport.\n"
+
+        for idx, (p, q) in enumerate(equilibria):
+            support_rows = [rows[i] for i, x in enumerate(p) if x > 0]
+            support_cols = [cols[j] for j, x in enumerate(q) if x > 0]
+            e1, e2 = self.mixed_solver.expected_payoffs(p1, p2, p, q)
+
+            explanation += f"\nEchilibru {idx + 1}: {self.format_mixed_profile(game, (p, q))}\n"
+            explanation += f"Suport J1: {', '.join(support_rows)}; suport J2: {', '.join(support_cols)}.\n"
+            for i in range(len(rows)):
+                value = sum(p1[i][j] * q[j] for j in range(len(cols)))
+                explanation += f"J1 joaca {rows[i]} -> plata asteptata {fmt(value)}\n"
+            for j in range(len(cols)):
+                value = sum(p2[i][j] * p[i] for i in range(len(rows)))
+                explanation += f"J2 joaca {cols[j]} -> plata asteptata {fmt(value)}\n"
+            explanation += f"Plati asteptate in echilibru: J1 = {fmt(e1)}, J2 = {fmt(e2)}.\n"
+
+        return explanation
+
+    def _mixed_nash_spec(self, n_rows, n_cols, variant, seed=None):
+        key = ('nash-mixed', (n_rows, n_cols, variant))
+        game, equilibria = self.generate_mixed_game(n_rows, n_cols, rng=self.rng_for(key, seed))
+        return {
+            'type': 'nash-mixed',
+            'title': f'Nash Mixt - {n_rows}x{n_cols} (V{variant + 1}){self._title_suffix(seed)}',
+            'key': key,
+            'seed': self.seed if seed is None else seed,
+            'game': game,
+            'equilibria': equilibria
+        }
+
+    def iter_mixed_nash_specs(self, seed=None):
+        """Generează specificațiile jocurilor cu echilibre mixte (fără texte)"""
+        for n_rows, n_cols in self.MIXED_NASH_SIZES:
+            for variant in range(self.MIXED_NASH_VARIANTS):
+                yield self._mixed_nash_spec(n_rows, n_cols, variant, seed=seed)
+
+    def build_mixed_nash_question(self, title, game, equilibria):
+        """Construiește întrebarea completă pentru un joc cu echilibre mixte"""
+        fmt = self.mixed_solver.format_fraction
+        nash_eq_json = json.dumps([
+            {'p': [fmt(x) for x in p], 'q': [fmt(x) for x in q]}
+            for p, q in equilibria
+        ])
+
+        return {
+            'type': 'nash-mixed',
+            'title': title,
+            'question': f'''Pentru urmatorul joc in forma normala:
+
+{self.format_game_as_table(game)}
+
+Jocul nu are echilibru Nash pur. Determinati un echilibru Nash in strategii mixte.
+
+Format raspuns: p = (probabilitatile lui J1 pentru {", ".join(game['rows'])}); q = (probabilitatile lui J2 pentru {", ".join(game['cols'])})
+Exemplu: p = (1/3, 2/3); q = (1/2, 1/2)''',
+            'correct_answer': self.format_mixed_answer(game, equilibria),
+            'explanation': self.generate_mixed_explanation(game, equilibria),
+            'game_data': json.dumps(game),
+            'nash_equilibria': nash_eq_json
+        }
+
+    def get_all_mixed_nash_questions(self):
+        """Generează întrebările cu echilibre Nash mixte"""
+        return [
+            self.build_mixed_nash_question(spec['title'], spec['game'], spec['equilibria'])
+            for spec in self.iter_mixed_nash_specs()
+        ]
 
 
 if __name__ == "__main__":
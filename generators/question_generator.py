@@ -4,6 +4,7 @@ ACTUALIZAT cu suport pentru Nash Equilibrium
 """
 import random
 import json
+import threading
 
 # Import pentru Nash
 import sys
@@ -13,53 +14,174 @@ from generators.nash_generator import NashGameGenerator
 
 class QuestionGenerator:
     """Clasă care generează toate combinațiile posibile de întrebări"""
-    
-    def __init__(self):
+
+    # Tipurile deterministe - universul lor e fix și se construiește o singură dată
+    DETERMINISTIC_TYPES = ('n-queens', 'hanoi', 'coloring', 'knight')
+    QUESTION_TYPES = DETERMINISTIC_TYPES + ('nash', 'nash-mixed')
+
+    def __init__(self, seed=None):
+        """
+        seed: sămânța de bază pentru tipurile aleatorii (Nash). Orice întrebare este
+        o funcție pură de (tip, parametri, sămânță), deci universul poate fi memoizat
+        și regenerat la cerere. Fără sămânță se alege una aleatorie.
+        """
         self.question_counter = 0
-        self.nash_generator = NashGameGenerator()
+        self.nash_generator = NashGameGenerator(seed=seed)
+        self.seed = self.nash_generator.seed
+        self.rng = random.Random(self.seed)
+
+        # Catalog leneș: tip -> tuplu de specificații (cheie, titlu, id),
+        # cheie -> întrebarea randată. Ambele sunt construite la prima cerere.
+        self._catalogue = {}
+        self._rendered = {}
+        self._catalogue_lock = threading.Lock()
+
+        self._param_builders = {
+            'n-queens': self._nqueens_params,
+            'hanoi': self._hanoi_params,
+            'coloring': self._coloring_params,
+            'knight': self._knight_params
+        }
+        self._title_builders = {
+            'n-queens': self._nqueens_title,
+            'hanoi': self._hanoi_title,
+            'coloring': self._coloring_title,
+            'knight': self._knight_title
+        }
+        self._renderers = {
+            'n-queens': self._render_nqueens,
+            'hanoi': self._render_hanoi,
+            'coloring': self._render_coloring,
+            'knight': self._render_knight
+        }
+        self._seeded_builders = {
+            'nash': self.nash_generator.iter_nash_specs,
+            'nash-mixed': self.nash_generator.iter_mixed_nash_specs
+        }
 
-    def get_all_questions(self):
+    def get_all_questions(self, seed=None):
         """Returnează lista completă a tuturor întrebărilor posibile"""
-        questions = []
-        self.question_counter = 0  # Resetăm contorul
-        
-        questions.extend(self._get_all_nqueens())
-        questions.extend(self._get_all_hanoi())
-        questions.extend(self._get_all_coloring())
-        questions.extend(self._get_all_knight())
-        questions.extend(self._get_all_nash())  # ADĂUGAT
-        
-        return questions
+        return [self.render(spec) for spec in self.iter_specs(seed=seed)]
 
     def generate_question(self, q_type='random'):
         """Păstrăm metoda pentru compatibilitate, dar alege din lista completă"""
-        all_q = self.get_all_questions()
-        if q_type != 'random':
-            all_q = [q for q in all_q if q['type'] == q_type]
-        return random.choice(all_q)
-    
+        return self.render(self.rng.choice(list(self.iter_specs(q_type))))
+
+    # ==================== CATALOG LENEȘ ====================
+    def _is_base_seed(self, seed):
+        return seed is None or seed == self.seed
+
+    def _get_catalogue(self, q_type):
+        """Returnează (și memoizează) specificațiile unui tip determinist"""
+        specs = self._catalogue.get(q_type)
+        if specs is not None:
+            return specs
+
+        with self._catalogue_lock:
+            if q_type not in self._catalogue:
+                if q_type in self._seeded_builders:
+                    # Tipurile aleatorii: universul sămânței de bază e și el fix
+                    self._catalogue[q_type] = tuple(self._seeded_builders[q_type]())
+                    return self._catalogue[q_type]
+
+                # ID-urile continuă numerotarea tipurilor anterioare, ca în universul complet
+                offset = 0
+                for prev_type in self.DETERMINISTIC_TYPES:
+                    if prev_type == q_type:
+                        break
+                    offset += sum(1 for _ in self._param_builders[prev_type]())
+
+                title_builder = self._title_builders[q_type]
+                self._catalogue[q_type] = tuple(
+                    {
+                        'type': q_type,
+                        'key': (q_type, params),
+                        'title': title_builder(*params),
+                        'id': offset + idx + 1
+                    }
+                    for idx, params in enumerate(self._param_builders[q_type]())
+                )
+            return self._catalogue[q_type]
+
+    def iter_specs(self, q_type='random', seed=None):
+        """
+        Iterează specificațiile (tip, cheie, titlu) fără a construi textele.
+        q_type='random' parcurge toate tipurile; altfel doar tipul cerut.
+        Pentru tipurile Nash, `seed` alege universul (implicit sămânța de bază,
+        memoizat); alte semințe produc jocuri noi, cu titluri sufixate.
+        """
+        types = self.QUESTION_TYPES if q_type == 'random' else (q_type,)
+        for t in types:
+            if t in self._seeded_builders and not self._is_base_seed(seed):
+                yield from self._seeded_builders[t](seed=seed)
+            elif t in self._param_builders or t in self._seeded_builders:
+                yield from self._get_catalogue(t)
+
+    def render(self, spec):
+        """Construiește întrebarea completă pentru o specificație (memoizat pentru sămânța de bază)"""
+        memo_key = (spec['key'], spec.get('seed'))
+        question = self._rendered.get(memo_key)
+        if question is not None:
+            return dict(question)
+
+        if spec['type'] == 'nash':
+            question = self.nash_generator.build_nash_question(spec['title'], spec['game'], spec['nash_eq'])
+        elif spec['type'] == 'nash-mixed':
+            question = self.nash_generator.build_mixed_nash_question(spec['title'], spec['game'], spec['equilibria'])
+        else:
+            q_type, params = spec['key']
+            question = self._renderers[q_type](*params)
+            question['id'] = spec['id']
+
+        if 'seed' not in spec or self._is_base_seed(spec['seed']):
+            question = self._rendered.setdefault(memo_key, question)
+        return dict(question)
+
+    def regenerate(self, key, seed=None):
+        """
+        Reconstruiește o întrebare din cheia ei (tip, parametri) și sămânță,
+        fără a o citi din baza de date.
+        """
+        q_type, params = key[0], tuple(key[1])
+        if q_type in self._param_builders:
+            spec = next((s for s in self._get_catalogue(q_type) if s['key'] == (q_type, params)), None)
+            if spec is None:
+                raise ValueError(f"Parametri necunoscuți pentru {q_type}: {params!r}")
+            return self.render(spec)
+        return self.render(self.nash_generator.spec_for_key((q_type, params), seed=seed))
+
     # ==================== NASH EQUILIBRIUM ====================
     def _get_all_nash(self):
         """Generează toate variantele Nash Equilibrium"""
         return self.nash_generator.get_all_nash_questions()
+
+    def _get_all_mixed_nash(self):
+        """Generează toate variantele Nash cu echilibre mixte"""
+        return self.nash_generator.get_all_mixed_nash_questions()
     
-    # ==================== RESTUL METODELOR (NESCHIMBATE) ====================
+    # ==================== N-QUEENS ====================
     def _get_all_nqueens(self):
         """Generează toate variantele N-Queens (n=4..15)"""
-        qs = []
+        return [self.render(spec) for spec in self.iter_specs('n-queens')]
+
+    def _nqueens_params(self):
         for n in range(4, 16):
-            self.question_counter += 1
-            qs.append({
-                'id': self.question_counter,
-                'type': 'n-queens',
-                'title': f'N-Queens (n={n})',
-                'question': f'''Pentru problema N-Queens cu n={n}:
+            yield (n,)
+
+    def _nqueens_title(self, n):
+        return f'N-Queens (n={n})'
+
+    def _render_nqueens(self, n):
+        return {
+            'type': 'n-queens',
+            'title': self._nqueens_title(n),
+            'question': f'''Pentru problema N-Queens cu n={n}:
 
 Trebuie să plasați {n} regine pe o tablă de șah {n}x{n} astfel încât nicio regină să nu se atace reciproc.
 
 Care este cea mai potrivită strategie de rezolvare? Justificați alegerea.''',
-                'correct_answer': 'Backtracking cu DFS' if n <= 8 else 'Backtracking cu Forward Checking și MRV',
-                'explanation': f'''Răspuns: {"Backtracking cu DFS" if n <= 8 else "Backtracking cu Forward Checking și MRV"}
+            'correct_answer': 'Backtracking cu DFS' if n <= 8 else 'Backtracking cu Forward Checking și MRV',
+            'explanation': f'''Răspuns: {"Backtracking cu DFS" if n <= 8 else "Backtracking cu Forward Checking și MRV"}
 
 Justificare:
 - Spațiu de stări: {n}^{n} = {n**n} posibilități
@@ -69,20 +191,26 @@ Justificare:
 - Backtracking permite abandon rapid (pruning)
 
 Alternative: {"Forward Checking, MRV" if n <= 8 else "AC-3, Minimum Conflicts"}'''
-            })
-        return qs
-    
+        }
+
+    # ==================== HANOI ====================
     def _get_all_hanoi(self):
         """Generează toate variantele Hanoi (discuri 3-8, tije 3-6)"""
-        qs = []
+        return [self.render(spec) for spec in self.iter_specs('hanoi')]
+
+    def _hanoi_params(self):
         for n_disks in range(3, 9):
             for n_pegs in range(3, 7):
-                self.question_counter += 1
-                qs.append({
-                    'id': self.question_counter,
-                    'type': 'hanoi',
-                    'title': f'Hanoi ({n_disks} discuri, {n_pegs} tije)',
-                    'question': f'''Pentru problema Hanoi Generalizată:
+                yield (n_disks, n_pegs)
+
+    def _hanoi_title(self, n_disks, n_pegs):
+        return f'Hanoi ({n_disks} discuri, {n_pegs} tije)'
+
+    def _render_hanoi(self, n_disks, n_pegs):
+        return {
+            'type': 'hanoi',
+            'title': self._hanoi_title(n_disks, n_pegs),
+            'question': f'''Pentru problema Hanoi Generalizată:
 
 - {n_disks} discuri de dimensiuni diferite
 - {n_pegs} tije disponibile
@@ -90,8 +218,8 @@ Alternative: {"Forward Checking, MRV" if n <= 8 else "AC-3, Minimum Conflicts"}'
 - Un disc mai mare nu poate fi peste unul mai mic
 
 Care este cea mai potrivită strategie?''',
-                    'correct_answer': 'Algoritm recursiv (DFS)' if n_pegs == 3 else 'BFS',
-                    'explanation': f'''Răspuns: {"Algoritm recursiv (DFS)" if n_pegs == 3 else "BFS"}
+            'correct_answer': 'Algoritm recursiv (DFS)' if n_pegs == 3 else 'BFS',
+            'explanation': f'''Răspuns: {"Algoritm recursiv (DFS)" if n_pegs == 3 else "BFS"}
 
 Justificare:
 - {"Hanoi clasic (3 tije) are formulă optimă: 2^n - 1" if n_pegs == 3 else f"Hanoi cu {n_pegs} tije NU are formulă optimă"}
@@ -100,12 +228,14 @@ Justificare:
 - {"Complexitate: O(2^n)" if n_pegs == 3 else "Complexitate: O(k^n)"}
 
 Alternative: {"IDS pentru memorie limitată" if n_pegs == 3 else "IDS (Iterative Deepening Search)"}'''
-                })
-        return qs
-    
+        }
+
+    # ==================== GRAPH COLORING ====================
     def _get_all_coloring(self):
         """Generează toate variantele Graph Coloring"""
-        qs = []
+        return [self.render(spec) for spec in self.iter_specs('coloring')]
+
+    def _coloring_params(self):
         nodes_opts = [5, 6, 7, 8, 10]
         colors_opts = [3, 4, 5]
         density_opts = ['sparse', 'dense', 'moderate']
@@ -113,29 +243,32 @@ Alternative: {"IDS pentru memorie limitată" if n_pegs == 3 else "IDS (Iterative
         for n_nodes in nodes_opts:
             for density in density_opts:
                 for n_colors in colors_opts:
-                    self.question_counter += 1
-                    
-                    edges = {
-                        'sparse': n_nodes + 2,
-                        'moderate': n_nodes * 2,
-                        'dense': n_nodes * (n_nodes - 1) // 3
-                    }[density]
-                    
-                    is_easy = density == 'sparse' or n_colors >= 4
-                    
-                    qs.append({
-                        'id': self.question_counter,
-                        'type': 'coloring',
-                        'title': f'Graph Coloring ({n_nodes} noduri, {density}, {n_colors} culori)',
-                        'question': f'''Pentru problema Graph Coloring:
+                    yield (n_nodes, density, n_colors)
+
+    def _coloring_title(self, n_nodes, density, n_colors):
+        return f'Graph Coloring ({n_nodes} noduri, {density}, {n_colors} culori)'
+
+    def _render_coloring(self, n_nodes, density, n_colors):
+        edges = {
+            'sparse': n_nodes + 2,
+            'moderate': n_nodes * 2,
+            'dense': n_nodes * (n_nodes - 1) // 3
+        }[density]
+
+        is_easy = density == 'sparse' or n_colors >= 4
+
+        return {
+            'type': 'coloring',
+            'title': self._coloring_title(n_nodes, density, n_colors),
+            'question': f'''Pentru problema Graph Coloring:
 
 - Graf cu {n_nodes} noduri și {edges} muchii ({density})
 - Maximum {n_colors} culori disponibile
 - Noduri adiacente trebuie să aibă culori diferite
 
 Care este cea mai potrivită strategie?''',
-                        'correct_answer': 'Greedy (Largest Degree First)' if is_easy else 'Backtracking cu Forward Checking',
-                        'explanation': f'''Răspuns: {"Greedy cu ordonare (Largest Degree First)" if is_easy else "Backtracking cu Forward Checking"}
+            'correct_answer': 'Greedy (Largest Degree First)' if is_easy else 'Backtracking cu Forward Checking',
+            'explanation': f'''Răspuns: {"Greedy cu ordonare (Largest Degree First)" if is_easy else "Backtracking cu Forward Checking"}
 
 Justificare:
 - Graf {density}: {n_nodes} noduri, {edges} muchii
@@ -144,27 +277,33 @@ Justificare:
 - {"Welsh-Powell garantează Δ+1 culori" if is_easy else "Forward Checking reduce ramificarea"}
 
 Alternative: {"DSatur, Backtracking la eșec" if is_easy else "MRV, Degree Heuristic"}'''
-                    })
-        return qs
-    
+        }
+
+    # ==================== KNIGHT'S TOUR ====================
     def _get_all_knight(self):
         """Generează toate variantele Knight's Tour"""
-        qs = []
+        return [self.render(spec) for spec in self.iter_specs('knight')]
+
+    def _knight_params(self):
         sizes = [5, 6, 8]
         types = ['open', 'closed']
-        
+
         for board_size in sizes:
             for tour_type in types:
                 for r in range(board_size):
                     for c in range(board_size):
-                        self.question_counter += 1
-                        start = [r, c]
-                        
-                        qs.append({
-                            'id': self.question_counter,
-                            'type': 'knight',
-                            'title': f"Knight's Tour ({board_size}x{board_size}, {tour_type}, start {r},{c})",
-                            'question': f'''Pentru problema Knight's Tour:
+                        yield (board_size, tour_type, r, c)
+
+    def _knight_title(self, board_size, tour_type, r, c):
+        return f"Knight's Tour ({board_size}x{board_size}, {tour_type}, start {r},{c})"
+
+    def _render_knight(self, board_size, tour_type, r, c):
+        start = [r, c]
+
+        return {
+            'type': 'knight',
+            'title': self._knight_title(board_size, tour_type, r, c),
+            'question': f'''Pentru problema Knight's Tour:
 
 - Tablă de șah {board_size}x{board_size}
 - Poziție start: ({start[0]}, {start[1]})
@@ -172,8 +311,8 @@ Alternative: {"DSatur, Backtracking la eșec" if is_easy else "MRV, Degree Heuri
 - Vizitează fiecare pătrat exact o dată
 
 Care este cea mai potrivită strategie?''',
-                            'correct_answer': 'Backtracking cu Warnsdorff' if board_size <= 6 else 'Warnsdorff cu backtracking limitat',
-                            'explanation': f'''Răspuns: {"Backtracking cu heuristica Warnsdorff" if board_size <= 6 else "Warnsdorff cu backtracking limitat"}
+            'correct_answer': 'Backtracking cu Warnsdorff' if board_size <= 6 else 'Warnsdorff cu backtracking limitat',
+            'explanation': f'''Răspuns: {"Backtracking cu heuristica Warnsdorff" if board_size <= 6 else "Warnsdorff cu backtracking limitat"}
 
 Justificare:
 - Tablă {board_size}x{board_size} = {board_size*board_size} pătrate
@@ -183,5 +322,4 @@ Justificare:
 - {"Rezolvare în timp liniar practic" if board_size <= 6 else "Succes ~99% pentru 8x8"}
 
 Alternative: {"Divide & Conquer pentru table mari" if board_size > 6 else "Random backtracking"}'''
-                        })
-        return qs
\ No newline at end of file
+        }
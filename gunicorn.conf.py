@@ -0,0 +1,47 @@
+"""
+Configurație gunicorn pentru producție: gunicorn -c gunicorn.conf.py wsgi:application
+Valorile pot fi suprascrise prin variabile de mediu.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('SMARTEST_BIND', '0.0.0.0:5000')
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('SMARTEST_THREADS', 4))
+
+# Fiecare worker are propriul pool de conexiuni: bugetul total (sub max_connections din
+# PostgreSQL, cu rezervă pentru administrare și init-db) se împarte egal între workeri.
+# app.py citește SMARTEST_DB_POOL_MAX_SIZE la import (preload, înainte de fork)
+db_connection_budget = int(os.environ.get('SMARTEST_DB_CONNECTIONS', 80))
+db_pool_max_size = int(os.environ.setdefault(
+    'SMARTEST_DB_POOL_MAX_SIZE', str(max(1, db_connection_budget // workers))
+))
+if workers * db_pool_max_size > db_connection_budget:
+    print(f"⚠️  {workers} workeri x {db_pool_max_size} conexiuni depășesc bugetul de "
+          f"{db_connection_budget} (SMARTEST_DB_CONNECTIONS)")
+elif db_pool_max_size < threads:
+    print(f"⚠️  Pool de {db_pool_max_size} conexiuni pentru {threads} thread-uri per worker - "
+          f"cererile pot aștepta o conexiune; reduceți WEB_CONCURRENCY sau SMARTEST_THREADS")
+
+# Aplicația (și cache-urile încălzite în wsgi.py) se încarcă o dată, înainte de fork
+preload_app = True
+
+# Exporturile PDF sincrone (GET /api/export-pdf) pot dura; joburile rulează separat
+timeout = int(os.environ.get('SMARTEST_TIMEOUT', 120))
+graceful_timeout = 30
+
+
+def post_fork(server, worker):
+    # Resursele legate de proces (cache PDF, coada de joburi) - create în worker
+    import app
+    app.init_worker()
+
+
+def worker_exit(server, worker):
+    import app
+    if app.job_manager is not None:
+        app.job_manager.shutdown(wait=False)
+    if app.db_manager is not None:
+        app.db_manager.close()
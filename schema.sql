@@ -7,12 +7,20 @@ CREATE TABLE questions (
     correct_answer TEXT NOT NULL,
     explanation TEXT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Datele jocului pentru întrebările Nash (JSON ca text)
+    game_data TEXT,
+    nash_equilibria TEXT
 );
 
 -- Index pentru căutare rapidă după tip
 CREATE INDEX idx_questions_type ON questions(type);
 
+-- Index unic pe titlu pentru deduplicare (ON CONFLICT / anti-join).
+-- Pe o bază existentă cu titluri duplicate folosește `flask --app app init-db`,
+-- care șterge întâi duplicatele (păstrează ID-ul cel mai mic) și corectează question_stats.
+CREATE UNIQUE INDEX idx_questions_title ON questions(title);
+
 -- Index pentru sortare după data creării
 CREATE INDEX idx_questions_created ON questions(created_at DESC);
 
@@ -30,6 +38,22 @@ CREATE TRIGGER update_questions_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Sesiuni de test: întrebările alese și cheia de răspuns precalculată (corectare fără citirea întrebărilor)
+CREATE TABLE test_sessions (
+    id VARCHAR(32) PRIMARY KEY,
+    question_ids INTEGER[] NOT NULL,
+    answer_key JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    submitted_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Index pentru ștergerea sesiunilor expirate
+CREATE INDEX idx_test_sessions_expires ON test_sessions(expires_at);
+
+-- Generația ștergerilor: avansată după fiecare ștergere, invalidează cache-urile de întrebări ale tuturor workerilor
+CREATE SEQUENCE question_changes_seq;
+
 -- Tabel pentru statistici (opțional)
 CREATE TABLE question_stats (
     id SERIAL PRIMARY KEY,
@@ -44,5 +68,6 @@ INSERT INTO question_stats (question_type, total_generated) VALUES
     ('n-queens', 0),
     ('hanoi', 0),
     ('coloring', 0),
-    ('knight', 0)
-    ('nash', 0);
\ No newline at end of file
+    ('knight', 0),
+    ('nash', 0),
+    ('nash-mixed', 0);
\ No newline at end of file
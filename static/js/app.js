@@ -1,9 +1,11 @@
 // State Management
 let questions = [];
+let questionsNextCursor = null; // Cursorul paginii următoare din /api/questions
 let currentQuestion = null;
 
 // New State for Test Mode
 let testQuestions = []; // Array of questions for the current test
+let testSessionId = null; // Sesiunea de test de pe server (cheia de răspuns precalculată)
 let currentTestIndex = 0; // Index of the question the user is viewing
 let testAnswers = {}; // {question_id: user_answer_text, ...}
 let testResults = []; // Array of evaluation results
@@ -11,25 +13,51 @@ let availableQuestionTypes = []; // List of types and counts
 
 
 /**
- * Încarcă întrebările de pe server
+ * Încarcă o pagină de întrebări de pe server
+ * @param {boolean} append - true pentru a adăuga pagina următoare la lista curentă
  */
-async function loadQuestions() {
+async function loadQuestions(append = false) {
   try {
-    const res = await fetch("/api/questions");
+    const params = new URLSearchParams();
+    const filters = getQuestionFilters();
+    if (filters.type) params.set("type", filters.type);
+    if (filters.title_prefix) params.set("title_prefix", filters.title_prefix);
+    if (append && questionsNextCursor) params.set("cursor", questionsNextCursor);
+
+    const res = await fetch(`/api/questions?${params.toString()}`);
     const data = await res.json();
-    questions = data.questions;
-    updateQuestionCount(data.total);
+    questions = append ? questions.concat(data.questions) : data.questions;
+    questionsNextCursor = data.next_cursor;
+    updateQuestionCount(data.total, data.total_is_estimate, !filters.type && !filters.title_prefix);
   } catch (error) {
     console.error("Eroare la încărcarea întrebărilor:", error);
   }
 }
 
+/**
+ * Citește filtrele listei de întrebări (tip, prefix titlu)
+ */
+function getQuestionFilters() {
+  const typeEl = document.getElementById("questions-filter-type");
+  const titleEl = document.getElementById("questions-filter-title");
+  return {
+    type: typeEl ? typeEl.value : "",
+    title_prefix: titleEl ? titleEl.value.trim() : "",
+  };
+}
+
 /**
  * Actualizează contorul de întrebări
+ * @param {number} total - numărul de întrebări
+ * @param {boolean} isEstimate - true dacă numărul este aproximativ
+ * @param {boolean} unfiltered - contorul de pe Home se actualizează doar fără filtre
  */
-function updateQuestionCount(total) {
-  document.getElementById("count").textContent = total;
-  document.getElementById("total").textContent = total;
+function updateQuestionCount(total, isEstimate = false, unfiltered = true) {
+  const text = isEstimate ? `~${total}` : total;
+  if (unfiltered) {
+    document.getElementById("count").textContent = text;
+  }
+  document.getElementById("total").textContent = text;
 }
 
 /**
@@ -75,7 +103,16 @@ async function generateBatch() {
       body: JSON.stringify({ type, count }),
     });
 
-    const data = await res.json();
+    let data = await res.json();
+
+    // Cererile mari rulează ca job în fundal (202 + job_id) - urmărim progresul
+    if (res.status === 202 && data.job_id) {
+      const job = await pollJob(data.job_id, (job) => {
+        statusEl.innerHTML = `<div style='color: #667eea;'><span class='loading'></span> ${formatJobProgress(job)}</div>`;
+      });
+      data = job.status === "done" ? job.result : { error: job.error };
+    }
+
     if (data.success) {
       statusEl.innerHTML = `<div style="color: green; font-weight: bold;">✅ Succes: ${data.message}</div>`;
     } else {
@@ -90,7 +127,43 @@ async function generateBatch() {
 
 
 /**
- * Afișează lista de întrebări
+ * Urmărește un job în fundal până la terminare (status "done" sau "failed")
+ * @param {string} jobId - id-ul returnat de server (202)
+ * @param {function} onProgress - apelată cu starea jobului la fiecare interogare
+ * @param {number} intervalMs - intervalul dintre interogări
+ * @returns {Promise<object>} starea finală a jobului
+ */
+async function pollJob(jobId, onProgress = null, intervalMs = 1000) {
+  while (true) {
+    const res = await fetch(`/api/jobs/${jobId}`);
+    const job = await res.json();
+    if (!res.ok) {
+      throw new Error(job.error || "Jobul nu a fost găsit");
+    }
+    if (onProgress) {
+      onProgress(job);
+    }
+    if (job.status === "done" || job.status === "failed") {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
+/**
+ * Text scurt de progres pentru un job (ex. "Se generează PDF-ul (120/400)")
+ */
+function formatJobProgress(job) {
+  const message = job.message || (job.status === "queued" ? "În așteptare..." : "Se procesează...");
+  const progress = job.progress || {};
+  if (progress.total) {
+    return `${message} (${progress.done}/${progress.total})`;
+  }
+  return message;
+}
+
+/**
+ * Afișează lista de întrebări (prima pagină)
  */
 function showQuestions() {
   hideAll();
@@ -100,14 +173,38 @@ function showQuestions() {
 
     if (questions.length === 0) {
       listEl.innerHTML = "<p style='text-align: center; color: #555;'>Nu există întrebări salvate.</p>";
+      updateLoadMoreButton();
       document.getElementById("screen-questions").classList.remove("hidden");
       return;
     }
 
-    questions.forEach((q) => {
-      const item = document.createElement("div");
-      item.className = "question-list-item menu-card";
-      item.innerHTML = `
+    renderQuestionItems(questions);
+    updateLoadMoreButton();
+    document.getElementById("screen-questions").classList.remove("hidden");
+  });
+}
+
+/**
+ * Încarcă și adaugă pagina următoare în listă
+ */
+async function loadMoreQuestions() {
+  if (!questionsNextCursor) return;
+  const previousLength = questions.length;
+  await loadQuestions(true);
+  renderQuestionItems(questions.slice(previousLength));
+  updateLoadMoreButton();
+}
+
+/**
+ * Adaugă elementele primite la lista afișată
+ * @param {Array} items - întrebările de afișat
+ */
+function renderQuestionItems(items) {
+  const listEl = document.getElementById("questions-list");
+  items.forEach((q) => {
+    const item = document.createElement("div");
+    item.className = "question-list-item menu-card";
+    item.innerHTML = `
                 <div style="display: flex; justify-content: space-between; align-items: center;">
                     <div>
                         <strong>[${q.type.toUpperCase()}]</strong> ${q.title}
@@ -117,12 +214,18 @@ function showQuestions() {
                     </div>
                 </div>
             `;
-      listEl.appendChild(item);
-    });
-    document.getElementById("screen-questions").classList.remove("hidden");
+    listEl.appendChild(item);
   });
 }
 
+/**
+ * Afișează butonul "Încarcă mai multe" doar dacă există o pagină următoare
+ */
+function updateLoadMoreButton() {
+  const btn = document.getElementById("questions-load-more");
+  if (btn) btn.classList.toggle("hidden", !questionsNextCursor);
+}
+
 /**
  * Afișează detaliile unei întrebări
  * @param {number} q_id - ID-ul întrebării
@@ -742,7 +845,8 @@ async function generateTest() {
             throw new Error(data.error);
         }
 
-        testQuestions = data;
+        testSessionId = data.session_id;
+        testQuestions = data.questions;
 
         if (testQuestions.length === 0) {
             alert("Nu s-au putut genera întrebările. Asigură-te că baza de date are întrebări și încearcă din nou.");
@@ -1070,7 +1174,7 @@ async function submitTest() {
         const res = await fetch("/api/evaluate-test", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
-            body: JSON.stringify(answersPayload),
+            body: JSON.stringify({ session_id: testSessionId, answers: answersPayload }),
         });
 
         const data = await res.json();
@@ -1120,6 +1224,10 @@ function displayTestResults(results) {
         resultItem.className = 'question-box';
         resultItem.style.marginBottom = '30px';
 
+        // Enunțul vine din testul curent (corectarea din sesiune nu îl mai retrimite)
+        const testQuestion = testQuestions.find(q => q.id === res.question_id);
+        const questionText = res.question || (testQuestion ? testQuestion.question : '');
+
         // Formatare specială pentru răspunsul utilizatorului gol
         const userAnswerDisplay = res.user_answer ? res.user_answer : 'Niciun răspuns furnizat.';
         const userAnswerStyle = res.user_answer ? 'font-style: italic; color: #555;' : 'font-style: italic; color: #dc3545;';
@@ -1130,7 +1238,7 @@ function displayTestResults(results) {
                 <div class="score-box ${itemClass}" style="padding: 10px 15px; margin: 0; display: inline-block; font-size: 1.2em; font-weight: bold;">${res.score}%</div>
             </div>
 
-            <p><strong>Întrebarea:</strong> ${res.question}</p>
+            <p><strong>Întrebarea:</strong> ${questionText}</p>
             <p style="margin-top: 10px;"><strong>Răspunsul tău:</strong>
                 <span style="${userAnswerStyle}">${userAnswerDisplay}</span>
             </p>
@@ -1165,29 +1273,41 @@ async function downloadPDF() {
         btnDownload.textContent = '⏳ Generare PDF...';
         btnDownload.disabled = true;
 
-        // Facem request către API
-        const response = await fetch('/api/export-pdf');
+        // Pornim exportul ca job în fundal și urmărim progresul.
+        // Filtrul de tip din listă se aplică și exportului (filtrare în SQL).
+        const exportFilters = {};
+        const { type } = getQuestionFilters();
+        if (type) {
+            exportFilters.type = type;
+        }
+        const response = await fetch('/api/export-pdf', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(exportFilters),
+        });
+        const data = await response.json();
 
         if (!response.ok) {
-            throw new Error('Eroare la generarea PDF-ului');
+            throw new Error(data.error || 'Eroare la generarea PDF-ului');
         }
 
-        // Obținem blob-ul PDF
-        const blob = await response.blob();
+        const job = await pollJob(data.job_id, (job) => {
+            btnDownload.textContent = '⏳ ' + formatJobProgress(job);
+        });
 
-        // Creăm un URL temporar pentru blob
-        const url = window.URL.createObjectURL(blob);
+        if (job.status !== 'done') {
+            throw new Error(job.error || 'Eroare la generarea PDF-ului');
+        }
 
-        // Creăm un link temporar și simulăm click-ul
+        // Descărcare directă din fișierul rezultat al jobului (fără blob în memorie)
         const a = document.createElement('a');
         a.style.display = 'none';
-        a.href = url;
+        a.href = job.result_url;
         a.download = 'SmartTest_Questions.pdf';
         document.body.appendChild(a);
         a.click();
 
         // Curățăm
-        window.URL.revokeObjectURL(url);
         document.body.removeChild(a);
 
         // Restaurăm butonul
@@ -1209,6 +1329,29 @@ async function downloadPDF() {
     }
 }
 
+/**
+ * Descarcă foaia testului curent (doar enunțurile, fără răspunsuri) ca PDF
+ */
+function downloadTestPDF() {
+    if (testQuestions.length === 0) {
+        alert("Nu există un test generat!");
+        return;
+    }
+
+    const params = new URLSearchParams({
+        ids: testQuestions.map(q => q.id).join(","),
+        answers: "0",
+    });
+
+    const a = document.createElement('a');
+    a.style.display = 'none';
+    a.href = `/api/export-pdf?${params.toString()}`;
+    a.download = 'SmartTest_Test.pdf';
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+}
+
 /**
  * Confirmă și șterge toate întrebările
  */
@@ -1240,4 +1383,4 @@ async function confirmClearAll() {
 
 
 // Apel la încărcarea paginii
-document.addEventListener("DOMContentLoaded", loadQuestions);
\ No newline at end of file
+document.addEventListener("DOMContentLoaded", () => loadQuestions());
\ No newline at end of file
@@ -1,4 +1,15 @@
 from .evaluator import QuestionEvaluator
 from .question_db_manager import QuestionDBManager
+from .db_pool import ConnectionPool, PoolExhaustedError
+from .question_cache import QuestionCache, LRUTTLCache, LocalSharedStore
+from .pdf_exporter import PDFExporter
+from .job_queue import JobManager, JobContext, JobQueueFullError
+from .async_question_db_manager import AsyncQuestionDBManager
+from .metrics import MetricsRegistry
 
-__all__ = ['QuestionEvaluator', 'QuestionDBManager']
+__all__ = [
+    'QuestionEvaluator', 'QuestionDBManager', 'ConnectionPool', 'PoolExhaustedError',
+    'QuestionCache', 'LRUTTLCache', 'LocalSharedStore', 'PDFExporter',
+    'JobManager', 'JobContext', 'JobQueueFullError', 'AsyncQuestionDBManager',
+    'MetricsRegistry'
+]
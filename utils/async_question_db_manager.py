@@ -0,0 +1,392 @@
+"""
+Manager asincron pentru baza de date PostgreSQL - Întrebări AI
+Oglindește metodele de citire ale QuestionDBManager folosite pe rutele fierbinți
+(întrebare după ID, evaluare, listare, teste), pentru modul de servire asyncio (asgi.py).
+Necesită pachetele opționale `psycopg` (v3) și `psycopg_pool`.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+try:
+    from psycopg import errors as pg_errors
+    from psycopg.conninfo import make_conninfo
+    from psycopg.rows import dict_row
+    from psycopg.types.json import Jsonb
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:  # modul sincron rămâne disponibil fără psycopg 3
+    AsyncConnectionPool = None
+
+from .question_db_manager import QuestionDBManager
+from .question_cache import QuestionCache
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncQuestionDBManager:
+    """Varianta asyncio a QuestionDBManager (aceleași interogări, aceleași forme de rezultat)"""
+
+    FULL_QUESTION_COLUMNS = QuestionDBManager.FULL_QUESTION_COLUMNS
+    SHORT_QUESTION_FIELDS = QuestionDBManager.SHORT_QUESTION_FIELDS
+    CACHE_GENERATION_QUERY = QuestionDBManager.CACHE_GENERATION_QUERY
+
+    encode_page_cursor = staticmethod(QuestionDBManager.encode_page_cursor)
+    decode_page_cursor = staticmethod(QuestionDBManager.decode_page_cursor)
+    _listing_filters = staticmethod(QuestionDBManager._listing_filters)
+
+    def __init__(self, db_config, pool_config=None, id_index_ttl=60.0, cache=None, cache_config=None,
+                 metrics=None):
+        """
+        db_config: aceeași configurație ca pentru QuestionDBManager ('database' e acceptat)
+        pool_config: aceleași chei ca DB_POOL_CONFIG (min_size, max_size, timeout,
+            max_idle_time, max_lifetime, health_check_interval)
+        cache: opțional, un QuestionCache existent - partajat cu managerul sincron din
+            același proces, astfel încât invalidările acestuia se aplică și aici
+        cache_config: alternativ, argumente pentru un QuestionCache propriu
+        metrics (opțional): MetricsRegistry - măsoară fiecare interogare și așteptarea în pool
+        """
+        if AsyncConnectionPool is None:
+            raise RuntimeError("Modul asincron necesită pachetele 'psycopg' și 'psycopg_pool'")
+
+        pool_config = dict(pool_config or {})
+        conn_kwargs = {('dbname' if key == 'database' else key): value for key, value in db_config.items()}
+
+        self.pool = AsyncConnectionPool(
+            make_conninfo(**conn_kwargs),
+            min_size=pool_config.get('min_size', 1),
+            max_size=pool_config.get('max_size', 10),
+            timeout=pool_config.get('timeout', 10.0),
+            max_idle=pool_config.get('max_idle_time', 300.0),
+            max_lifetime=pool_config.get('max_lifetime', 3600.0),
+            check=AsyncConnectionPool.check_connection,
+            kwargs={'row_factory': dict_row},
+            open=False
+        )
+
+        self.metrics = metrics
+        self.id_index_ttl = id_index_ttl
+        self._id_index = None
+        self._id_index_loaded_at = 0.0
+        self._id_index_lock = asyncio.Lock()
+        # ID-uri scrise de managerul sincron (on_change), aplicate la următoarea eșantionare
+        self._changed_ids = set()
+        self._changed_ids_lock = threading.Lock()
+
+        if cache is None and cache_config is not None:
+            cache = QuestionCache(**cache_config)
+        self.cache = cache
+
+    async def open(self):
+        """Deschide pool-ul (trebuie apelat în bucla de evenimente care servește cererile)"""
+        await self.pool.open(wait=True)
+
+    async def close(self):
+        await self.pool.close()
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """Conexiune din pool; commit la ieșire, rollback la excepție"""
+        start = time.perf_counter()
+        async with self.pool.connection() as conn:
+            if self.metrics:
+                self.metrics.record_pool_wait(time.perf_counter() - start)
+            yield conn
+
+    async def _execute(self, conn, query, params=None):
+        """conn.execute măsurat (echivalentul cursoarelor instrumentate din modul sincron)"""
+        if not self.metrics:
+            return await conn.execute(query, params)
+        start = time.perf_counter()
+        try:
+            return await conn.execute(query, params)
+        finally:
+            self.metrics.record_query(time.perf_counter() - start)
+
+    def on_change(self, ids=None):
+        """
+        Listener pentru QuestionDBManager.add_change_listener (apelat din thread-uri sincrone).
+        ID-urile schimbate actualizează indexul incremental; ids=None îl face să expire.
+        """
+        if ids is None:
+            self._id_index = None
+            return
+        with self._changed_ids_lock:
+            self._changed_ids.update(ids)
+
+    def get_pool_stats(self):
+        return self.pool.get_stats()
+
+    # ======================= LISTARE PAGINATĂ (KEYSET) =======================
+
+    async def get_questions_page(self, page_size=50, cursor_token=None, q_type=None, title_prefix=None):
+        """Vezi QuestionDBManager.get_questions_page"""
+        conditions, params = self._listing_filters(q_type, title_prefix)
+        if cursor_token:
+            created_at, last_id = self.decode_page_cursor(cursor_token)
+            conditions.append("(created_at, id) < (%s, %s)")
+            params.extend([created_at, last_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        async with self.get_connection() as conn:
+            cursor = await self._execute(conn, f"""
+                SELECT id, title, type, created_at
+                FROM questions
+                {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s;
+            """, params + [page_size + 1])
+            rows = await cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = self.encode_page_cursor(last['created_at'], last['id'])
+
+        return rows, next_cursor
+
+    async def count_questions(self, q_type=None, title_prefix=None, exact_limit=10000):
+        """Vezi QuestionDBManager.count_questions"""
+        conditions, params = self._listing_filters(q_type, title_prefix)
+
+        async with self.get_connection() as conn:
+            if not conditions:
+                cursor = await self._execute(
+                    conn, "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = 'questions'::regclass;"
+                )
+                estimate = (await cursor.fetchone())['estimate']
+                if estimate is not None and estimate > exact_limit:
+                    return int(estimate), True
+
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            cursor = await self._execute(conn, f"""
+                SELECT COUNT(*) AS count FROM (
+                    SELECT 1 FROM questions {where} LIMIT %s
+                ) AS limited;
+            """, params + [exact_limit + 1])
+            count = (await cursor.fetchone())['count']
+
+        if count > exact_limit:
+            return exact_limit, True
+        return count, False
+
+    async def get_count_by_type(self):
+        async with self.get_connection() as conn:
+            cursor = await self._execute(conn, """
+                SELECT type, COUNT(*) as count
+                FROM questions
+                GROUP BY type
+                ORDER BY count DESC;
+            """)
+            return await cursor.fetchall()
+
+    # ======================= CITIRI DUPĂ ID =======================
+
+    async def get_question_by_id(self, q_id, include_answer=True):
+        """Vezi QuestionDBManager.get_question_by_id (același cache read-through)"""
+        if self.cache:
+            await self._sync_cache_generation()
+            cached = self.cache.get(q_id)
+            if cached is None:
+                generation = self.cache.generation
+                cached = await self._fetch_question_full(q_id)
+                if cached is None:
+                    return None
+                self.cache.set(q_id, cached, generation=generation)
+                cached = dict(cached)
+            if include_answer:
+                return cached
+            return {field: cached[field] for field in self.SHORT_QUESTION_FIELDS}
+
+        if include_answer:
+            return await self._fetch_question_full(q_id)
+
+        async with self.get_connection() as conn:
+            cursor = await self._execute(conn, """
+                SELECT id, title, question, type
+                FROM questions
+                WHERE id = %s;
+            """, (q_id,))
+            return await cursor.fetchone()
+
+    async def _fetch_question_full(self, q_id):
+        async with self.get_connection() as conn:
+            cursor = await self._execute(conn, f"""
+                SELECT {self.FULL_QUESTION_COLUMNS}
+                FROM questions
+                WHERE id = %s;
+            """, (q_id,))
+            return await cursor.fetchone()
+
+    async def _sync_cache_generation(self):
+        """Vezi QuestionDBManager._sync_cache_generation"""
+        if not self.cache.generation_check_due():
+            return
+        try:
+            async with self.get_connection() as conn:
+                cursor = await self._execute(conn, self.CACHE_GENERATION_QUERY)
+                row = await cursor.fetchone()
+        except pg_errors.UndefinedTable:
+            logger.warning("Lipsește question_changes_seq (rulați init-db) - "
+                           "ștergerile din alți workeri nu invalidează cache-ul local")
+            self.cache.generation_check_interval = None
+            return
+        self.cache.apply_generation(row['generation'])
+
+    async def get_questions_by_ids(self, ids):
+        """Vezi QuestionDBManager.get_questions_by_ids"""
+        if not ids:
+            return {}
+
+        result = {}
+        missing = list(ids)
+        generation = None
+        if self.cache:
+            await self._sync_cache_generation()
+            result, missing = self.cache.get_many(ids)
+            if not missing:
+                return result
+            generation = self.cache.generation
+
+        async with self.get_connection() as conn:
+            cursor = await self._execute(conn, f"""
+                SELECT {self.FULL_QUESTION_COLUMNS}
+                FROM questions
+                WHERE id = ANY(%s);
+            """, (missing,))
+
+            for q in await cursor.fetchall():
+                if self.cache:
+                    self.cache.set(q['id'], q, generation=generation)
+                    q = dict(q)
+                result[q['id']] = q
+
+        return result
+
+    # ======================= METODE PENTRU TEST =======================
+
+    async def _get_id_index(self, refresh=False):
+        """
+        Vezi QuestionDBManager._get_id_index. ID-urile raportate de on_change sunt
+        verificate printr-o singură căutare după cheia primară (tipul curent sau absente),
+        în loc de reîncărcarea întregului index.
+        """
+        async with self._id_index_lock:
+            with self._changed_ids_lock:
+                changed, self._changed_ids = self._changed_ids, set()
+
+            expired = time.monotonic() - self._id_index_loaded_at > self.id_index_ttl
+            if self._id_index is not None and not expired and not refresh:
+                if changed:
+                    async with self.get_connection() as conn:
+                        cursor = await self._execute(
+                            conn, "SELECT id, type FROM questions WHERE id = ANY(%s);", (list(changed),)
+                        )
+                        present = [(row['id'], row['type']) for row in await cursor.fetchall()]
+                    self._update_id_index(added=present, removed=changed)
+                return self._id_index
+
+            async with self.get_connection() as conn:
+                cursor = await self._execute(conn, "SELECT type, array_agg(id) AS ids FROM questions GROUP BY type;")
+                index = {row['type']: row['ids'] for row in await cursor.fetchall()}
+
+            self._id_index = index
+            self._id_index_loaded_at = time.monotonic()
+            return index
+
+    def _update_id_index(self, added=(), removed=()):
+        """
+        Scoate ID-urile `removed` (de orice tip) și adaugă perechile (id, tip) din `added`.
+        Listele sunt înlocuite, nu modificate pe loc (eșantionările în curs nu sunt afectate).
+        """
+        if self._id_index is None:
+            return
+        removed = set(removed)
+        index = {
+            q_type: [i for i in ids if i not in removed] if removed else ids
+            for q_type, ids in self._id_index.items()
+        }
+        added_by_type = {}
+        for q_id, q_type in added:
+            added_by_type.setdefault(q_type, []).append(q_id)
+        for q_type, ids in added_by_type.items():
+            index[q_type] = index.get(q_type, []) + ids
+        self._id_index = index
+
+    async def _fetch_sample_rows(self, ids):
+        async with self.get_connection() as conn:
+            cursor = await self._execute(conn, """
+                SELECT id, title, question, correct_answer, explanation, type, nash_equilibria
+                FROM questions
+                WHERE id = ANY(%s);
+            """, (list(ids),))
+            return await cursor.fetchall()
+
+    async def get_random_questions_by_types(self, type_counts):
+        """Vezi QuestionDBManager.get_random_questions_by_types"""
+        type_counts = {q_type: int(count) for q_type, count in type_counts.items() if int(count) > 0}
+        if not type_counts:
+            return []
+
+        rows = []
+        for attempt in range(3):
+            index = await self._get_id_index(refresh=attempt == 2)
+            taken = {row['id'] for row in rows}
+
+            sampled_ids = []
+            for q_type, count in type_counts.items():
+                available = [i for i in index.get(q_type, []) if i not in taken]
+                missing = count - sum(1 for row in rows if row['type'] == q_type)
+                if missing > 0 and available:
+                    sampled_ids.extend(random.sample(available, min(missing, len(available))))
+
+            if not sampled_ids:
+                break
+
+            fetched = await self._fetch_sample_rows(sampled_ids)
+            rows.extend(fetched)
+            if len(fetched) == len(sampled_ids):
+                break
+
+            # ID-uri șterse de alt proces: le scoatem din index și mai eșantionăm
+            fetched_ids = {row['id'] for row in fetched}
+            self._update_id_index(removed=[i for i in sampled_ids if i not in fetched_ids])
+
+        return rows
+
+    # ======================= SESIUNI DE TEST =======================
+
+    async def create_test_session(self, entries, ttl=86400):
+        """Vezi QuestionDBManager.create_test_session"""
+        session_id = uuid.uuid4().hex
+        answer_key = {str(entry['id']): {k: v for k, v in entry.items() if k != 'id'} for entry in entries}
+
+        async with self.get_connection() as conn:
+            await self._execute(conn, "DELETE FROM test_sessions WHERE expires_at < NOW();")
+            await self._execute(conn, """
+                INSERT INTO test_sessions (id, question_ids, answer_key, expires_at)
+                VALUES (%s, %s, %s, NOW() + %s * INTERVAL '1 second');
+            """, (session_id, [entry['id'] for entry in entries], Jsonb(answer_key), ttl))
+        return session_id
+
+    async def get_test_session(self, session_id, mark_submitted=False):
+        """Vezi QuestionDBManager.get_test_session"""
+        async with self.get_connection() as conn:
+            if mark_submitted:
+                cursor = await self._execute(conn, """
+                    UPDATE test_sessions SET submitted_at = COALESCE(submitted_at, NOW())
+                    WHERE id = %s AND expires_at > NOW()
+                    RETURNING id, question_ids, answer_key, created_at, submitted_at;
+                """, (session_id,))
+            else:
+                cursor = await self._execute(conn, """
+                    SELECT id, question_ids, answer_key, created_at, submitted_at
+                    FROM test_sessions
+                    WHERE id = %s AND expires_at > NOW();
+                """, (session_id,))
+            return await cursor.fetchone()
@@ -0,0 +1,229 @@
+"""
+Pool de conexiuni PostgreSQL thread-safe
+Reutilizează conexiunile între cereri în loc de connect/close la fiecare apel
+"""
+import threading
+import time
+from collections import deque
+
+import psycopg2
+
+
+class PoolExhaustedError(Exception):
+    """Nu s-a putut obține o conexiune din pool în timpul permis"""
+
+
+class ConnectionPool:
+    """
+    Pool de conexiuni cu dimensiune minimă/maximă, verificare la împrumut
+    și reciclarea conexiunilor inactive.
+    """
+
+    def __init__(self, db_config, min_size=1, max_size=10, timeout=10.0,
+                 max_idle_time=300.0, max_lifetime=3600.0, health_check_interval=30.0,
+                 connection_factory=None):
+        """
+        db_config: argumentele pentru psycopg2.connect
+        min_size / max_size: numărul minim păstrat deschis / maxim permis simultan
+            (conexiunile se deschid la cerere; warm_up() le pre-deschide pe cele min_size)
+        timeout: secunde de așteptare pentru o conexiune liberă
+        max_idle_time: conexiunile inactive mai mult de atât sunt închise (peste min_size)
+        max_lifetime: conexiunile mai vechi de atât sunt recreate
+        health_check_interval: după cât timp de inactivitate se rulează SELECT 1 la împrumut
+        connection_factory: opțional, clasa conexiunilor psycopg2 (ex. instrumentare, vezi metrics.py)
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Dimensiuni invalide pentru pool")
+
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.connection_factory = connection_factory
+
+        self._lock = threading.Condition(threading.Lock())
+        self._idle = deque()        # (conn, created_at, last_used)
+        self._created_at = {}       # id(conn) -> created_at pentru conexiunile împrumutate
+        self._size = 0
+        self._closed = False
+
+        self._stats = {
+            'connections_created': 0,
+            'connections_closed': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'health_check_failures': 0,
+            'recycled': 0,
+        }
+
+    # ======================= CICLUL DE VIAȚĂ AL CONEXIUNILOR =======================
+
+    def _connect(self):
+        if self.connection_factory is not None:
+            return psycopg2.connect(connection_factory=self.connection_factory, **self.db_config)
+        return psycopg2.connect(**self.db_config)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _close_conn(self, conn):
+        self._close_quietly(conn)
+        self._stats['connections_closed'] += 1
+
+    def _is_healthy(self, conn, last_used):
+        """
+        Verifică dacă o conexiune inactivă mai este utilizabilă.
+        Apelată FĂRĂ lock: SELECT 1 pe o conexiune lentă nu blochează restul pool-ului.
+        """
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except Exception:
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+            return False
+
+    def _prune_idle(self):
+        """Închide conexiunile inactive prea mult timp, păstrând min_size deschise"""
+        now = time.monotonic()
+        kept = deque()
+        while self._idle:
+            conn, created_at, last_used = self._idle.popleft()
+            expired = (now - last_used > self.max_idle_time and self._size > self.min_size) \
+                or now - created_at > self.max_lifetime
+            if expired:
+                self._close_conn(conn)
+                self._size -= 1
+                self._stats['recycled'] += 1
+            else:
+                kept.append((conn, created_at, last_used))
+        self._idle = kept
+
+    # ======================= API PUBLIC =======================
+
+    def warm_up(self):
+        """Deschide conexiuni până la min_size (ex. la pornirea serverului)"""
+        while True:
+            with self._lock:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+            with self._lock:
+                now = time.monotonic()
+                self._idle.append((conn, now, now))
+                self._stats['connections_created'] += 1
+                self._lock.notify()
+
+    def getconn(self):
+        """Împrumută o conexiune din pool (blochează până la `timeout` secunde)"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise PoolExhaustedError("Pool-ul de conexiuni este închis")
+
+                    self._prune_idle()
+
+                    # Preferăm conexiunea folosită cel mai recent (LIFO) - cea mai "caldă"
+                    if self._idle:
+                        conn, created_at, last_used = self._idle.pop()
+                        break
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        conn = None
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolExhaustedError(
+                            f"Nicio conexiune liberă după {self.timeout}s (max_size={self.max_size})"
+                        )
+                    self._stats['waits'] += 1
+                    self._lock.wait(remaining)
+
+            if conn is None:
+                break
+
+            # Verificarea (rețea) și închiderea unei conexiuni moarte - în afara lock-ului
+            if self._is_healthy(conn, last_used):
+                with self._lock:
+                    self._created_at[id(conn)] = created_at
+                    self._stats['checkouts'] += 1
+                return conn
+            self._close_quietly(conn)
+            with self._lock:
+                self._stats['connections_closed'] += 1
+                self._size -= 1
+                self._lock.notify()
+
+        # Conexiunea nouă se deschide în afara lock-ului (handshake-ul e lent)
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._created_at[id(conn)] = time.monotonic()
+            self._stats['connections_created'] += 1
+            self._stats['checkouts'] += 1
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Returnează conexiunea în pool; `discard=True` o închide definitiv"""
+        with self._lock:
+            created_at = self._created_at.pop(id(conn), time.monotonic())
+            if discard or self._closed or conn.closed:
+                self._close_conn(conn)
+                self._size -= 1
+            else:
+                self._idle.append((conn, created_at, time.monotonic()))
+            self._lock.notify()
+
+    def closeall(self):
+        """Închide toate conexiunile inactive și refuză împrumuturi noi"""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _, _ = self._idle.popleft()
+                self._close_conn(conn)
+                self._size -= 1
+            self._lock.notify_all()
+
+    def get_stats(self):
+        """Returnează un instantaneu al statisticilor pool-ului"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+            return stats
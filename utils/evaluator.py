@@ -2,8 +2,26 @@
 Evaluator SIMPLU pentru Nash Equilibrium cu checkboxuri
 Logică clară: compară liste de celule bifate
 """
+import atexit
 import re
 import json
+import os
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Evaluatorul din fiecare proces worker al pool-ului (creat o singură dată)
+_worker_evaluator = None
+
+
+def _init_batch_worker():
+    global _worker_evaluator
+    _worker_evaluator = QuestionEvaluator()
+
+
+def _evaluate_chunk(items):
+    return [_worker_evaluator._evaluate_item(item) for item in items]
+
 
 class QuestionEvaluator:
     """Clasă responsabilă pentru evaluarea răspunsurilor"""
@@ -62,42 +80,131 @@ class QuestionEvaluator:
             (30, '🤔 Satisfăcător. Identifică strategia, dar incomplet.'),
             (0, '❌ Nesatisfăcător. Nu acoperă cerințele.')
         ]
+
+        self._compile_matchers()
+
+        # Probabilități în răspunsurile mixte: 1/3, 0.25, 0,5 (nu și cifrele din A1, B2)
+        self._probability_pattern = re.compile(r'(?<![\w/.,])(\d+(?:[.,]\d+)?(?:/\d+)?)')
+        self.mixed_tolerance = Fraction(1, 100)
+
+        # Date derivate din răspunsul corect (termeni obligatorii, algoritmi),
+        # calculate o singură dată per răspuns corect distinct
+        self._answer_key_cache = {}
+        self._answer_key_cache_size = 4096
+        self._process_pool = None
+        self._process_pool_workers = 0
+        self._close_registered = False  # close() înregistrat la atexit la crearea pool-ului
+
+    # ==================== MATCHER PRECOMPILAT ====================
+    def _compile_matchers(self):
+        """
+        Compilează o singură dată toate pattern-urile pentru cuvinte cheie și negații.
+        Un scanner combinat găsește pozițiile candidate într-o singură trecere prin text,
+        iar la fiecare poziție se verifică doar cuvintele cheie cu aceeași primă literă.
+        """
+        self._negation_pattern = re.compile(r'\b(?:' + '|'.join(self.negations) + r')\b')
+        self._after_negations = ['nu', 'not', 'isnt', "isn't"]
+
+        all_keywords = {kw for kws in self.keywords.values() for kw in kws}
+        all_keywords.update(v for variants in self.main_algorithms.values() for v in variants)
+
+        self._keyword_patterns = {}
+        self._keywords_by_initial = {}
+        for kw in sorted(all_keywords, key=len, reverse=True):
+            self._keyword_patterns[kw] = re.compile(r'\b' + re.escape(kw) + r'\b')
+            self._keywords_by_initial.setdefault(kw[0], []).append(kw)
+
+        alternatives = '|'.join(re.escape(kw) for kw in sorted(all_keywords, key=len, reverse=True))
+        self._mention_scanner = re.compile(r'\b(?=' + alternatives + r')')
+
+        # Variantele celorlalți algoritmi, folosite la detectarea contradicțiilor
+        self._other_algorithm_variants = {
+            algo_name: [v for name, vs in self.main_algorithms.items() if name != algo_name for v in vs]
+            for algo_name in self.main_algorithms
+        }
+
+    def _is_negated(self, text, start, end):
+        """Verifică negația în jurul unei apariții (25 de caractere înainte / 3 cuvinte după)"""
+        context_before = text[max(0, start - 25):start]
+        if self._negation_pattern.search(context_before):
+            return True
+        first_words_after = text[end:min(len(text), end + 25)].split()[:3]
+        return any(n in first_words_after for n in self._after_negations)
+
+    def _scan_mentions(self, text):
+        """
+        Parcurge textul o singură dată și returnează toate aparițiile cuvintelor cheie:
+        {cuvânt_cheie: [(start, end, este_negat), ...]}
+        """
+        mentions = {}
+        last_end = {}
+        for candidate in self._mention_scanner.finditer(text):
+            pos = candidate.start()
+            for kw in self._keywords_by_initial.get(text[pos], ()):
+                # Aparițiile aceluiași cuvânt cheie nu se suprapun (ca la finditer)
+                if pos < last_end.get(kw, 0):
+                    continue
+                match = self._keyword_patterns[kw].match(text, pos)
+                if match:
+                    start, end = match.span()
+                    last_end[kw] = end
+                    mentions.setdefault(kw, []).append((start, end, self._is_negated(text, start, end)))
+        return mentions
+
+    def _positive_mentions(self, text):
+        """Setul cuvintelor cheie care apar cel puțin o dată NEnegate în text"""
+        return {
+            kw for kw, occurrences in self._scan_mentions(text).items()
+            if any(not negated for _, _, negated in occurrences)
+        }
     
-    def evaluate(self, user_answer, correct_answer, q_type, question_data=None):
-        """Evaluează răspunsul utilizatorului"""
+    def evaluate(self, user_answer, correct_answer, q_type, question_data=None, answer_key=None):
+        """
+        Evaluează răspunsul utilizatorului.
+        answer_key (opțional): cheia precalculată cu build_answer_key - înlocuiește
+        question_data pentru Nash și analiza răspunsului corect pentru celelalte tipuri.
+        """
         if not user_answer or not user_answer.strip():
             return {
                 'score': 0,
                 'feedback': '❌ Niciun răspuns furnizat.'
             }
+
+        if answer_key is not None and q_type in ('nash', 'nash-mixed'):
+            question_data = {'nash_equilibria': answer_key.get('equilibria', [])}
         
         if q_type == 'nash':
             return self._evaluate_nash_checkbox(user_answer, question_data)
+
+        if q_type == 'nash-mixed':
+            return self._evaluate_nash_mixed(user_answer, question_data)
         
         # Evaluare standard pentru celelalte tipuri
         user_lower = user_answer.lower()
         correct_lower = correct_answer.lower()
+
+        # O singură scanare a răspunsului pentru toate cuvintele cheie
+        positive = self._positive_mentions(user_lower)
+        if answer_key is None:
+            answer_key = self._get_answer_key(correct_lower)
         
         score = 0
         
-        if self._is_equivalent_answer(user_lower, correct_lower):
+        if self._is_equivalent_answer(user_lower, correct_lower, positive, answer_key):
             score = 100
         else:
-            required_terms = self._extract_required_terms(correct_lower)
-            user_has_all_required = all(
-                self._has_positive_mention(user_lower, [term]) 
-                for term in required_terms
-            )
+            required_terms = answer_key['required_terms']
+            user_has_all_required = all(term in positive for term in required_terms)
             
             if user_has_all_required and len(required_terms) > 0:
                 score = 85
-                keyword_score = self._check_keywords(user_lower, q_type)
+                keyword_score = self._check_keywords(user_lower, q_type, positive)
                 if keyword_score > 20:
                     score = 100
             else:
-                algo_score = self._check_main_algorithm(user_lower, correct_lower)
+                algo_score = self._check_main_algorithm(user_lower, correct_lower, positive, answer_key)
                 score += algo_score
-                keyword_score = self._check_keywords(user_lower, q_type)
+                keyword_score = self._check_keywords(user_lower, q_type, positive)
                 score += keyword_score
         
         score = min(100, score)
@@ -108,6 +215,78 @@ class QuestionEvaluator:
             'feedback': feedback
         }
     
+    # ==================== EVALUARE ÎN LOT ====================
+    def evaluate_batch(self, items, workers=0, parallel_threshold=2000):
+        """
+        Evaluează un lot de răspunsuri și returnează rezultatele în ordinea de intrare.
+
+        items: listă de dict-uri cu cheile user_answer, correct_answer, type
+               și opțional question_data (necesar pentru Nash) sau answer_key
+        workers: numărul de procese pentru loturi mari (0/1 = fără pool, None = os.cpu_count()).
+                 Implicit fără pool: cererile HTTP rulează în thread-uri ale workerilor
+                 gunicorn, unde un pool de procese ar concura pentru aceleași nuclee.
+                 Pool-ul e destinat joburilor și comenzilor CLI.
+        parallel_threshold: de la câte elemente se folosește pool-ul de procese
+
+        Răspunsurile sunt grupate pe tip, astfel încât datele derivate din fiecare
+        răspuns corect (termeni obligatorii, algoritmi) sunt calculate o singură dată.
+        """
+        items = list(items)
+        results = [None] * len(items)
+
+        groups = {}
+        for index, item in enumerate(items):
+            groups.setdefault(item['type'], []).append(index)
+        ordered = [index for indexes in groups.values() for index in indexes]
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers > 1 and len(items) >= parallel_threshold:
+            chunk_size = max(1, -(-len(ordered) // (workers * 4)))
+            chunks = [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+            pool = self._get_process_pool(workers)
+            futures = [pool.submit(_evaluate_chunk, [items[i] for i in chunk]) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                for index, result in zip(chunk, future.result()):
+                    results[index] = result
+        else:
+            for index in ordered:
+                results[index] = self._evaluate_item(items[index])
+
+        return results
+
+    def _evaluate_item(self, item):
+        return self.evaluate(
+            item['user_answer'],
+            item['correct_answer'],
+            item['type'],
+            question_data=item.get('question_data'),
+            answer_key=item.get('answer_key')
+        )
+
+    def _get_process_pool(self, workers):
+        if self._process_pool is None or self._process_pool_workers != workers:
+            self.close()
+            self._process_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker)
+            self._process_pool_workers = workers
+            if not self._close_registered:
+                atexit.register(self.close)
+                self._close_registered = True
+        return self._process_pool
+
+    def close(self):
+        """Oprește pool-ul de procese folosit de evaluate_batch (dacă există)"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_process_pool'] = None
+        state['_close_registered'] = False
+        return state
+
     # ==================== EVALUARE NASH CU CHECKBOXURI ====================
     def _evaluate_nash_checkbox(self, user_answer, question_data):
         """
@@ -127,10 +306,7 @@ class QuestionEvaluator:
         # Extragem Nash-urile corecte
         correct_nash_indices = []
         if question_data and 'nash_equilibria' in question_data:
-            try:
-                correct_nash_indices = json.loads(question_data['nash_equilibria'])
-            except:
-                pass
+            correct_nash_indices = self._parse_nash_equilibria(question_data['nash_equilibria'])
         
         no_nash_correct = (len(correct_nash_indices) == 0)
         user_says_no_nash = user_data.get('no_nash', False)
@@ -182,7 +358,143 @@ class QuestionEvaluator:
         else:
             return {'score': 10, 'feedback': '❌ Celulele selectate sunt toate greșite.'}
     
+    def _parse_nash_equilibria(self, nash_equilibria):
+        """Decodifică lista de echilibre (JSON), memoizat per șir"""
+        if isinstance(nash_equilibria, list):
+            # Deja decodificată (coloană jsonb sau cheie de răspuns precalculată)
+            return nash_equilibria
+        if not isinstance(nash_equilibria, str):
+            try:
+                return json.loads(nash_equilibria)
+            except:
+                return []
+
+        key = ('nash', nash_equilibria)
+        parsed = self._answer_key_cache.get(key)
+        if parsed is None:
+            try:
+                parsed = json.loads(nash_equilibria)
+            except:
+                parsed = []
+            if len(self._answer_key_cache) >= self._answer_key_cache_size:
+                self._answer_key_cache.clear()
+            self._answer_key_cache[key] = parsed
+        return parsed
+
+    # ==================== EVALUARE NASH MIXT ====================
+    def _evaluate_nash_mixed(self, user_answer, question_data):
+        """
+        Evaluare pentru echilibre mixte.
+
+        user_answer: JSON {"p": ["1/3", "2/3"], "q": ["1/2", "1/2"]} sau text liber
+        în formatul din enunț: "p = (1/3, 2/3); q = (1/2, 1/2)".
+        Se acceptă oricare dintre echilibrele corecte, cu toleranță de 0.01 per probabilitate.
+        """
+        equilibria = []
+        if question_data and 'nash_equilibria' in question_data:
+            equilibria = self._parse_nash_equilibria(question_data['nash_equilibria'])
+        if not equilibria:
+            return {'score': 0, 'feedback': '❌ Întrebarea nu are echilibre mixte salvate.'}
+
+        try:
+            correct = [
+                ([Fraction(x) for x in eq['p']], [Fraction(x) for x in eq['q']])
+                for eq in equilibria
+            ]
+        except (KeyError, TypeError, ValueError):
+            return {'score': 0, 'feedback': '❌ Întrebarea nu are echilibre mixte salvate.'}
+
+        n_rows, n_cols = len(correct[0][0]), len(correct[0][1])
+        user_p, user_q = self._parse_mixed_answer(user_answer, n_rows, n_cols)
+        if user_p is None:
+            return {
+                'score': 0,
+                'feedback': f'❌ Format invalid. Scrie {n_rows} probabilități pentru J1 și {n_cols} pentru J2.'
+            }
+
+        for dist in (user_p, user_q):
+            if any(x < 0 for x in dist) or abs(sum(dist) - 1) > self.mixed_tolerance:
+                return {'score': 0, 'feedback': '❌ Probabilitățile fiecărui jucător trebuie să însumeze 1.'}
+
+        def close(a, b):
+            return all(abs(x - y) <= self.mixed_tolerance for x, y in zip(a, b))
+
+        best = 0
+        for p, q in correct:
+            p_ok, q_ok = close(user_p, p), close(user_q, q)
+            if p_ok and q_ok:
+                return {'score': 100, 'feedback': '🎉 Excelent! Echilibrul mixt este corect!'}
+            if p_ok or q_ok:
+                best = 50
+
+        if best:
+            return {'score': 50, 'feedback': '👌 Parțial corect. Strategia unui singur jucător este corectă.'}
+        return {'score': 0, 'feedback': '❌ Greșit. Verifică condițiile de indiferență.'}
+
+    def _parse_mixed_answer(self, user_answer, n_rows, n_cols):
+        """Returnează (p, q) ca liste de Fraction sau (None, None) dacă formatul e invalid"""
+        try:
+            data = json.loads(user_answer)
+            if isinstance(data, dict):
+                values = list(data.get('p', [])) + list(data.get('q', []))
+            else:
+                values = None
+        except (ValueError, TypeError):
+            values = None
+
+        if values is None:
+            values = self._probability_pattern.findall(user_answer)
+
+        if len(values) != n_rows + n_cols:
+            return None, None
+
+        try:
+            numbers = [Fraction(str(v).replace(',', '.')) for v in values]
+        except (ValueError, ZeroDivisionError):
+            return None, None
+        return numbers[:n_rows], numbers[n_rows:]
+
+    # ==================== CHEI DE RĂSPUNS PRECALCULATE ====================
+    def build_answer_key(self, correct_answer, q_type, question_data=None):
+        """
+        Construiește cheia compactă (serializabilă JSON) folosită de evaluate(answer_key=...):
+        - Nash / Nash mixt: {'equilibria': [...]} - lista decodificată de echilibre
+        - celelalte tipuri: {'required_terms': [...], 'correct_algorithms': [...]}
+        Calculată o dată la generarea testului, astfel încât evaluarea nu mai are
+        nevoie de rândul complet al întrebării.
+        """
+        if q_type in ('nash', 'nash-mixed'):
+            equilibria = []
+            if question_data and question_data.get('nash_equilibria') is not None:
+                equilibria = self._parse_nash_equilibria(question_data['nash_equilibria'])
+            return {'equilibria': equilibria}
+
+        key = self._get_answer_key((correct_answer or '').lower())
+        return {
+            'required_terms': list(key['required_terms']),
+            'correct_algorithms': list(key['correct_algorithms'])
+        }
+
     # ==================== METODE PENTRU CELELALTE TIPURI ====================
+    def _get_answer_key(self, correct_answer):
+        """
+        Returnează datele derivate dintr-un răspuns corect (deja lowercase):
+        termenii obligatorii și algoritmii principali menționați. Memoizat.
+        """
+        key = self._answer_key_cache.get(correct_answer)
+        if key is None:
+            key = {
+                'required_terms': self._extract_required_terms(correct_answer),
+                'correct_algorithms': [
+                    algo_name for algo_name, variants in self.main_algorithms.items()
+                    if any(variant in correct_answer for variant in variants)
+                ]
+            }
+            if len(self._answer_key_cache) >= self._answer_key_cache_size:
+                self._answer_key_cache.clear()
+            self._answer_key_cache[correct_answer] = key
+        return key
+
     def _extract_required_terms(self, correct_answer):
         required = []
         for algo_name, variants in self.main_algorithms.items():
@@ -200,74 +512,64 @@ class QuestionEvaluator:
         
         return unique_required
 
-    def _has_positive_mention(self, text, keywords):
-        for kw in keywords:
-            pattern = r'\b' + re.escape(kw) + r'\b'
-            matches = list(re.finditer(pattern, text))
-            
-            if not matches:
-                continue
-                
-            for match in matches:
-                start, end = match.span()
-                ctx_start = max(0, start - 25)
-                ctx_end = min(len(text), end + 25)
-                context_before = text[ctx_start:start]
-                context_after = text[end:ctx_end]
-                
-                is_negated_before = any(re.search(r'\b' + n + r'\b', context_before) for n in self.negations)
-                first_words_after = context_after.split()[:3]
-                is_negated_after = any(n in first_words_after for n in ['nu', 'not', 'isnt', "isn't"])
-                
-                if not is_negated_before and not is_negated_after:
-                    return True
-        return False
+    def _has_positive_mention(self, text, keywords, positive=None):
+        if positive is None:
+            unknown = [kw for kw in keywords if kw not in self._keyword_patterns]
+            if unknown:
+                # Cuvinte cheie din afara listelor - verificare individuală
+                for kw in unknown:
+                    for match in re.finditer(r'\b' + re.escape(kw) + r'\b', text):
+                        if not self._is_negated(text, *match.span()):
+                            return True
+            positive = self._positive_mentions(text)
+        return any(kw in positive for kw in keywords)
     
-    def _is_equivalent_answer(self, user_answer, correct_answer):
+    def _is_equivalent_answer(self, user_answer, correct_answer, positive=None, answer_key=None):
         if user_answer == correct_answer:
             return True
+
+        if positive is None:
+            positive = self._positive_mentions(user_answer)
         
+        correct_algorithms = (answer_key or self._get_answer_key(correct_answer))['correct_algorithms']
         for algo_name, variants in self.main_algorithms.items():
-            user_has = self._has_positive_mention(user_answer, variants)
-            correct_has = any(variant in correct_answer for variant in variants)
+            user_has = any(v in positive for v in variants)
+            correct_has = algo_name in correct_algorithms
             
             if user_has and correct_has:
-                other_algos = [v for name, vs in self.main_algorithms.items() 
-                            if name != algo_name for v in vs]
-                has_contradiction = self._has_positive_mention(user_answer, other_algos)
+                has_contradiction = any(v in positive for v in self._other_algorithm_variants[algo_name])
                 
                 if not has_contradiction:
                     return True
         
         return False
 
-    def _check_main_algorithm(self, user_answer, correct_answer):
-        correct_algorithms = []
-        for algo_name, variants in self.main_algorithms.items():
-            if any(variant in correct_answer for variant in variants):
-                correct_algorithms.append(algo_name)
+    def _check_main_algorithm(self, user_answer, correct_answer, positive=None, answer_key=None):
+        correct_algorithms = (answer_key or self._get_answer_key(correct_answer))['correct_algorithms']
         
         if not correct_algorithms:
             return 0
+
+        if positive is None:
+            positive = self._positive_mentions(user_answer)
         
         matched_count = 0
         for algo_name in correct_algorithms:
             variants = self.main_algorithms[algo_name]
-            if self._has_positive_mention(user_answer, variants):
+            if any(v in positive for v in variants):
                 matched_count += 1
         
-        if len(correct_algorithms) == 0:
-            return 0
-        
         proportion = matched_count / len(correct_algorithms)
         return int(50 * proportion)
     
-    def _check_keywords(self, user_answer, q_type):
+    def _check_keywords(self, user_answer, q_type, positive=None):
         q_keywords = self.keywords.get(q_type, [])
+        if positive is None:
+            positive = self._positive_mentions(user_answer)
         found_groups = set()
         
         for kw in q_keywords:
-            if self._has_positive_mention(user_answer, [kw]):
+            if kw in positive:
                 base_concept = kw.split()[0]
                 found_groups.add(base_concept)
         
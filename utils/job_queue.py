@@ -0,0 +1,232 @@
+"""
+Coadă locală de joburi pentru operațiile lungi (export PDF, generare batch mare)
+Cererea HTTP primește imediat un job_id; jobul rulează într-un pool de thread-uri
+separat pe tip (concurență limitată), iar starea și rezultatul sunt persistate pe disc.
+"""
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFullError(Exception):
+    """Prea multe joburi în așteptare pentru acest tip"""
+
+
+class JobContext:
+    """Obiectul primit de funcția jobului: raportare progres și calea fișierului rezultat"""
+
+    def __init__(self, manager, job_id, params):
+        self.manager = manager
+        self.job_id = job_id
+        self.params = params
+        self.result_file = None
+        self.progress = {'done': 0, 'total': None}
+        self._last_write = 0.0
+
+    def update_progress(self, done, total=None, message=None, force=False):
+        """Actualizează progresul (scrierile pe disc sunt rărite la `progress_interval`)"""
+        self.progress = {'done': done, 'total': total}
+        now = time.monotonic()
+        if not force and now - self._last_write < self.manager.progress_interval:
+            return
+        self._last_write = now
+        changes = {'progress': self.progress}
+        if message is not None:
+            changes['message'] = message
+        self.manager._update(self.job_id, **changes)
+
+    def result_path(self, extension):
+        """Calea unde jobul își scrie fișierul rezultat (ex. 'pdf')"""
+        self.result_file = f"{self.job_id}.{extension}"
+        return os.path.join(self.manager.jobs_dir, self.result_file)
+
+
+class JobManager:
+    """
+    Gestionează joburile pe tipuri înregistrate cu `register`.
+    Starea fiecărui job e un fișier JSON în `jobs_dir` (scris atomic), astfel încât
+    poate fi citită de orice worker care împarte același director.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    _JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+    def __init__(self, jobs_dir, result_ttl=3600.0, progress_interval=0.5):
+        """
+        jobs_dir: directorul pentru starea joburilor și fișierele rezultat
+        result_ttl: secunde după care joburile terminate (și rezultatele lor) sunt șterse
+        progress_interval: intervalul minim între două scrieri de progres pe disc
+        """
+        self.jobs_dir = jobs_dir
+        self.result_ttl = result_ttl
+        self.progress_interval = progress_interval
+
+        self._handlers = {}      # tip -> (funcție, executor, max_pending)
+        self._pending = {}       # tip -> joburi în coadă sau în rulare (în acest proces)
+        self._lock = threading.Lock()
+
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self._fail_interrupted()
+
+    # ======================= ÎNREGISTRARE ȘI TRIMITERE =======================
+
+    def register(self, job_type, func, concurrency=1, max_pending=20):
+        """
+        func(context, **params) -> dict (rezultatul JSON al jobului)
+        concurrency: câte joburi de acest tip rulează simultan
+        max_pending: câte joburi de acest tip pot aștepta/rula înainte de refuz
+        """
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"job-{job_type}")
+        self._handlers[job_type] = (func, executor, max_pending)
+        self._pending[job_type] = 0
+
+    def submit(self, job_type, **params):
+        """Pune jobul în coadă și returnează job_id-ul"""
+        if job_type not in self._handlers:
+            raise ValueError(f"Tip de job necunoscut: {job_type}")
+        func, executor, max_pending = self._handlers[job_type]
+
+        with self._lock:
+            if self._pending[job_type] >= max_pending:
+                raise JobQueueFullError(
+                    f"Prea multe joburi '{job_type}' în așteptare (maxim {max_pending})"
+                )
+            self._pending[job_type] += 1
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        try:
+            self.cleanup_expired()
+            self._write(job_id, {
+                'id': job_id,
+                'type': job_type,
+                'status': self.QUEUED,
+                'progress': {'done': 0, 'total': None},
+                'message': None,
+                'result': None,
+                'result_file': None,
+                'error': None,
+                'worker_pid': os.getpid(),
+                'created_at': now,
+                'updated_at': now,
+            })
+            executor.submit(self._run, job_id, job_type, func, params)
+        except Exception:
+            with self._lock:
+                self._pending[job_type] -= 1
+            raise
+        return job_id
+
+    def _run(self, job_id, job_type, func, params):
+        context = JobContext(self, job_id, params)
+        try:
+            self._update(job_id, status=self.RUNNING)
+            result = func(context, **params) or {}
+            self._update(job_id, status=self.DONE, result=result, result_file=context.result_file,
+                         progress=context.progress)
+        except Exception as e:
+            self._update(job_id, status=self.FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._pending[job_type] -= 1
+
+    # ======================= CITIRE =======================
+
+    def get(self, job_id):
+        """Returnează starea jobului (dict) sau None dacă nu există"""
+        if not self._JOB_ID_PATTERN.match(job_id or ''):
+            return None
+        try:
+            with open(self._state_file(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def result_file_path(self, job):
+        """Calea absolută a fișierului rezultat al unui job terminat (sau None)"""
+        if job.get('status') != self.DONE or not job.get('result_file'):
+            return None
+        path = os.path.join(self.jobs_dir, job['result_file'])
+        return path if os.path.exists(path) else None
+
+    def get_stats(self):
+        with self._lock:
+            return {'pending': dict(self._pending)}
+
+    # ======================= ÎNTREȚINERE =======================
+
+    def cleanup_expired(self):
+        """Șterge joburile terminate mai vechi de result_ttl, împreună cu rezultatele"""
+        cutoff = time.time() - self.result_ttl
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith('.json'):
+                continue
+            job = self.get(name[:-5])
+            if job and job['status'] in (self.DONE, self.FAILED) and job['updated_at'] < cutoff:
+                self._delete(job['id'])
+
+    @staticmethod
+    def _process_alive(pid):
+        # Un job cu PID-ul nostru provine dintr-o rulare anterioară (ex. PID 1 în container)
+        if not pid or pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, OSError):
+            pass
+        return True
+
+    def _fail_interrupted(self):
+        """
+        Joburile rămase în coadă/rulare ale unui proces care nu mai există
+        (repornire) nu vor mai termina - le marcăm eșuate.
+        """
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith('.json'):
+                continue
+            job = self.get(name[:-5])
+            if job and job['status'] in (self.QUEUED, self.RUNNING) \
+                    and not self._process_alive(job.get('worker_pid', 0)):
+                self._update(job['id'], status=self.FAILED, error='Job întrerupt de repornirea serverului')
+
+    def shutdown(self, wait=True):
+        for _, executor, _ in self._handlers.values():
+            executor.shutdown(wait=wait)
+
+    # ======================= PERSISTENȚĂ =======================
+
+    def _state_file(self, job_id):
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _write(self, job_id, job):
+        tmp_path = self._state_file(job_id) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self._state_file(job_id))
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            job = self.get(job_id)
+            if job is None:
+                return
+            job.update(changes)
+            job['updated_at'] = time.time()
+            self._write(job_id, job)
+
+    def _delete(self, job_id):
+        for name in os.listdir(self.jobs_dir):
+            if name.startswith(job_id + '.'):
+                try:
+                    os.remove(os.path.join(self.jobs_dir, name))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,286 @@
+"""
+Instrumentare: histograme de latență per rută, interogări DB, timpii generatorului și
+evaluatorului, statistici de cache. Exportate în formatul text Prometheus (/metrics)
+și, opțional, în header-ul Server-Timing al fiecărui răspuns.
+Valorile sunt per proces (fiecare worker își expune propriile metrici).
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2.extensions
+
+# Secunde (latențe)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Număr de interogări per cerere
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Cererea curentă (thread sau task asyncio); None în afara unei cereri (ex. joburi)
+_current_request = contextvars.ContextVar('smartest_request_metrics', default=None)
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Contor monoton, opțional cu etichete"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogramă cu bucket-uri fixe (cumulative la export), opțional cu etichete"""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}   # label_values -> [counts per bucket, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.label_names, label_values, ('le', _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.label_names, label_values, ('le', '+Inf'))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.label_names, label_values)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class RequestMetrics:
+    """Timpul acumulat pe componente (db, evaluator, ...) pe durata unei singure cereri"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = {}   # componentă -> [număr de apeluri, secunde]
+
+    def add(self, component, seconds):
+        entry = self.timings.get(component)
+        if entry is None:
+            entry = self.timings[component] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def count(self, component):
+        return self.timings.get(component, (0, 0.0))[0]
+
+    def seconds(self, component):
+        return self.timings.get(component, (0, 0.0))[1]
+
+    def server_timing(self, total):
+        """Valoarea header-ului Server-Timing (durate în milisecunde)"""
+        parts = [
+            f'{component};dur={seconds * 1000:.2f};desc="{count}x"'
+            for component, (count, seconds) in sorted(self.timings.items())
+        ]
+        parts.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(parts)
+
+
+class MetricsRegistry:
+    """
+    Registrul de metrici al procesului.
+    Ciclul unei cereri: start_request() -> track()/record_query() -> finish_request().
+    """
+
+    def __init__(self, prefix='smartest'):
+        self.prefix = prefix
+        self._metrics = []
+        self._stats_collectors = {}     # nume -> (help, funcție care returnează un dict)
+        self._cursor_classes = {}
+
+        self.request_duration = self.histogram(
+            'http_request_duration_seconds', 'Durata cererilor HTTP', ('route', 'method', 'status'))
+        self.request_db_queries = self.histogram(
+            'request_db_queries', 'Interogări DB per cerere', ('route',), buckets=COUNT_BUCKETS)
+        self.request_db_seconds = self.histogram(
+            'request_db_seconds', 'Timpul petrecut în DB per cerere', ('route',))
+        self.db_queries = self.counter('db_queries_total', 'Interogări DB executate')
+        self.db_query_duration = self.histogram('db_query_duration_seconds', 'Durata unei interogări DB')
+        self.db_pool_wait = self.histogram(
+            'db_pool_wait_seconds', 'Așteptarea unei conexiuni din pool')
+        self.component_duration = self.histogram(
+            'component_duration_seconds', 'Timpul generatorului și al evaluatorului',
+            ('component', 'operation'))
+
+    # ======================= ÎNREGISTRARE =======================
+
+    def counter(self, name, help_text, label_names=()):
+        metric = Counter(f"{self.prefix}_{name}", help_text, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(f"{self.prefix}_{name}", help_text, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_stats_collector(self, name, stats_func, help_text=''):
+        """
+        Exportă ca gauge fiecare valoare numerică din dict-ul returnat de stats_func()
+        la momentul citirii (ex. statisticile cache-ului). Numele repetat înlocuiește colectorul.
+        """
+        self._stats_collectors[name] = (help_text or name, stats_func)
+
+    # ======================= CICLUL CERERII =======================
+
+    def start_request(self):
+        request_metrics = RequestMetrics()
+        _current_request.set(request_metrics)
+        return request_metrics
+
+    def finish_request(self, route, method, status):
+        """Înregistrează cererea curentă; returnează (RequestMetrics, durata totală) sau (None, None)"""
+        request_metrics = _current_request.get()
+        if request_metrics is None:
+            return None, None
+        _current_request.set(None)
+
+        total = time.perf_counter() - request_metrics.started
+        self.request_duration.observe(total, route, method, str(status))
+        self.request_db_queries.observe(request_metrics.count('db'), route)
+        self.request_db_seconds.observe(request_metrics.seconds('db'), route)
+        return request_metrics, total
+
+    @contextmanager
+    def track(self, component, operation=''):
+        """Măsoară un bloc (ex. evaluatorul) și îl adaugă la cererea curentă"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.component_duration.observe(elapsed, component, operation)
+            request_metrics = _current_request.get()
+            if request_metrics is not None:
+                request_metrics.add(component, elapsed)
+
+    def record_query(self, seconds):
+        self.db_queries.inc()
+        self.db_query_duration.observe(seconds)
+        request_metrics = _current_request.get()
+        if request_metrics is not None:
+            request_metrics.add('db', seconds)
+
+    def record_pool_wait(self, seconds):
+        self.db_pool_wait.observe(seconds)
+
+    # ======================= INSTRUMENTARE PSYCOPG2 =======================
+
+    def connection_factory(self):
+        """
+        Clasă de conexiune psycopg2 (argumentul connection_factory) ale cărei cursoare,
+        de orice tip (RealDictCursor, NamedTupleCursor, cursoare pe server), își
+        măsoară execute/executemany.
+        """
+        registry = self
+
+        class InstrumentedConnection(psycopg2.extensions.connection):
+            def cursor(self, *args, **kwargs):
+                base = kwargs.get('cursor_factory') or self.cursor_factory or psycopg2.extensions.cursor
+                kwargs['cursor_factory'] = registry._timed_cursor_class(base)
+                return super().cursor(*args, **kwargs)
+
+        return InstrumentedConnection
+
+    def _timed_cursor_class(self, base):
+        cursor_class = self._cursor_classes.get(base)
+        if cursor_class is not None:
+            return cursor_class
+
+        registry = self
+
+        class TimedCursor(base):
+            def execute(self, query, vars=None):
+                start = time.perf_counter()
+                try:
+                    return super().execute(query, vars)
+                finally:
+                    registry.record_query(time.perf_counter() - start)
+
+            def executemany(self, query, vars_list):
+                start = time.perf_counter()
+                try:
+                    return super().executemany(query, vars_list)
+                finally:
+                    registry.record_query(time.perf_counter() - start)
+
+        TimedCursor.__name__ = f"Timed{base.__name__}"
+        return self._cursor_classes.setdefault(base, TimedCursor)
+
+    # ======================= EXPORT =======================
+
+    def render(self):
+        """Toate metricile în formatul text Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        for name, (help_text, stats_func) in sorted(self._stats_collectors.items()):
+            stats = stats_func() or {}
+            for key, value in sorted(stats.items()):
+                if isinstance(value, bool):
+                    value = int(value)
+                if not isinstance(value, (int, float)):
+                    continue
+                metric_name = f"{self.prefix}_{name}_{key}"
+                lines.append(f"# HELP {metric_name} {help_text}: {key}")
+                lines.append(f"# TYPE {metric_name} gauge")
+                lines.append(f"{metric_name} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
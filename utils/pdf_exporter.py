@@ -0,0 +1,331 @@
+"""
+Export PDF al catalogului de întrebări (ReportLab)
+Povestea (story) este consumată leneș dintr-un iterator de rânduri, deci în
+memorie există doar câteva zeci de flowables la un moment dat.
+"""
+import hashlib
+import itertools
+import os
+import threading
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+
+class _LazyStory(list):
+    """
+    Listă de flowables care se reumple dintr-un iterator pe măsură ce ReportLab
+    le consumă (doc.build verifică len() înainte de fiecare flowable).
+    """
+
+    def __init__(self, flowables, low_water=50, refill=200):
+        super().__init__()
+        self._source = iter(flowables)
+        self._low_water = low_water
+        self._refill = refill
+        self._exhausted = False
+        self._fill()
+
+    def _fill(self):
+        if self._exhausted:
+            return
+        chunk = list(itertools.islice(self._source, self._refill))
+        if len(chunk) < self._refill:
+            self._exhausted = True
+        self.extend(chunk)
+
+    def __len__(self):
+        if not self._exhausted and super().__len__() < self._low_water:
+            self._fill()
+        return super().__len__()
+
+
+class PDFExporter:
+    """Transformă întrebările în PDF; stilurile sunt create o singură dată și reutilizate"""
+
+    def __init__(self, title="Catalog Complet Intrebari SmartTest AI", spool_max_size=8 * 1024 * 1024):
+        self.title = title
+        self.spool_max_size = spool_max_size
+
+        self.styles = getSampleStyleSheet()
+
+        # Creăm un stil bold personalizat pentru etichete
+        self.bold_style = ParagraphStyle(
+            'CustomBold',
+            parent=self.styles['Normal'],
+            fontName='Helvetica-Bold',
+            fontSize=10,
+            textColor=colors.HexColor('#006400')
+        )
+
+        self.answer_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.lightgreen),
+            ('BOX', (0, 0), (-1, -1), 1, colors.green),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 8),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ])
+
+    @staticmethod
+    def escape_xml(text):
+        """Escapează caracterele speciale XML pentru Paragraph"""
+        if text is None:
+            return ""
+        text = str(text)
+        text = text.replace('&', '&amp;')
+        text = text.replace('<', '&lt;')
+        text = text.replace('>', '&gt;')
+        return text
+
+    def header_flowables(self, title=None):
+        return [
+            Paragraph(self.escape_xml(title or self.title), self.styles['Title']),
+            Spacer(1, 12),
+            Paragraph(f"Data Export: {datetime.now().strftime('%Y-%m-%d %H:%M')}", self.styles['Italic']),
+            Spacer(1, 24)
+        ]
+
+    def question_header(self, index, q):
+        """
+        Titlul numerotat al întrebării (numărul depinde de poziția în export).
+        `q` este un rând cu atribute (namedtuple din QuestionDBManager.iter_questions_full).
+        """
+        escape_xml = self.escape_xml
+        q_header = f"<b>{index}. [{escape_xml(q.type).upper()}] {escape_xml(q.title)}</b>"
+        return [Paragraph(q_header, self.styles['Heading2']), Spacer(1, 6)]
+
+    def question_body(self, q, include_answers=True):
+        """
+        Corpul întrebării (enunț, răspuns, explicație) - depinde doar de conținutul ei.
+        Cu include_answers=False (foaie de test) rămâne doar enunțul și spațiu pentru răspuns.
+        """
+        escape_xml = self.escape_xml
+        flowables = []
+
+        # Întrebarea
+        q_text = f"<b>Intrebare:</b> {escape_xml(q.question)}"
+        flowables.append(Paragraph(q_text, self.styles['Normal']))
+
+        if not include_answers:
+            flowables.append(Spacer(1, 12))
+            flowables.append(Paragraph("<b>Raspuns:</b>", self.styles['Normal']))
+            flowables.append(Spacer(1, 72))
+            return flowables
+
+        flowables.append(Spacer(1, 6))
+
+        # Răspuns Corect
+        data_answer = [
+            [Paragraph("Raspuns Corect:", self.bold_style),
+             Paragraph(escape_xml(q.correct_answer), self.styles['Normal'])]
+        ]
+        t_answer = Table(data_answer, colWidths=[120, 380])
+        t_answer.setStyle(self.answer_table_style)
+        flowables.append(t_answer)
+        flowables.append(Spacer(1, 6))
+
+        # Explicație
+        q_explanation = f"<b>Explicatie:</b> {escape_xml(q.explanation)}"
+        flowables.append(Paragraph(q_explanation, self.styles['Normal']))
+        flowables.append(Spacer(1, 24))
+
+        return flowables
+
+    def question_flowables(self, index, q):
+        """Flowables pentru o întrebare (numerotată de la 1)"""
+        return self.question_header(index, q) + self.question_body(q)
+
+    def iter_story(self, questions, on_error=None, body_for=None, include_answers=True, title=None):
+        """
+        Generează flowables pentru header și fiecare întrebare, pe rând.
+        body_for: opțional, funcție q -> flowables pentru corpul întrebării
+        """
+        if body_for is None:
+            body_for = lambda q: self.question_body(q, include_answers=include_answers)
+        yield from self.header_flowables(title)
+        for i, q in enumerate(questions):
+            try:
+                flowables = self.question_header(i + 1, q) + body_for(q)
+            except Exception as q_error:
+                if on_error:
+                    on_error(i + 1, q_error)
+                # Continuăm cu următoarea întrebare
+                continue
+            yield from flowables
+
+    def build(self, questions, output, on_error=None, body_for=None, include_answers=True, title=None):
+        """Randează întrebările (iterabil) în fișierul/bufferul `output`"""
+        doc = SimpleDocTemplate(output, pagesize=A4,
+                                rightMargin=40, leftMargin=40,
+                                topMargin=40, bottomMargin=40,
+                                pageCompression=1)
+        doc.build(_LazyStory(self.iter_story(questions, on_error=on_error, body_for=body_for,
+                                             include_answers=include_answers, title=title)))
+
+    def render_to_spool(self, questions, on_error=None, include_answers=True, title=None):
+        """
+        Randează PDF-ul într-un fișier temporar (în memorie până la spool_max_size,
+        apoi pe disc) și îl returnează poziționat la început, împreună cu mărimea.
+        """
+        spool = SpooledTemporaryFile(max_size=self.spool_max_size)
+        try:
+            self.build(questions, spool, on_error=on_error, include_answers=include_answers, title=title)
+            size = spool.tell()
+            spool.seek(0)
+        except Exception:
+            spool.close()
+            raise
+        return spool, size
+
+    @staticmethod
+    def iter_file_chunks(file_obj, chunk_size=64 * 1024):
+        """Citește fișierul în bucăți (pentru răspuns HTTP în flux) și îl închide la final"""
+        try:
+            while True:
+                chunk = file_obj.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            file_obj.close()
+
+
+class PDFCatalogue:
+    """
+    Ultimul PDF complet al băncii, păstrat pe disc și identificat prin amprenta
+    băncii (QuestionDBManager.get_catalogue_fingerprint). Cât timp amprenta nu se schimbă,
+    exportul servește fișierul existent (sau 304 pe baza ETag-ului) fără randare.
+
+    Flowables ReportLab nu pot fi refolosite între documente (layout-ul le
+    modifică starea), deci unitatea cache-ului este documentul întreg.
+    """
+
+    def __init__(self, exporter, cache_dir):
+        self.exporter = exporter
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, f"catalogue-{os.getpid()}.pdf")
+
+        self._render_lock = threading.Lock()   # o singură randare simultan
+        self._state_lock = threading.Lock()
+        self._entry = None                     # {'fingerprint', 'etag', 'size'}
+        self._generation = 0                   # crește la fiecare invalidare
+
+        self.hits = 0
+        self.renders = 0
+        self.invalidations = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        """
+        Fiecare worker scrie catalogue-{pid}.pdf. Fișierele proceselor care nu mai
+        există (repornire, workeri reciclați) nu vor mai fi servite - le ștergem.
+        """
+        for name in os.listdir(self.cache_dir):
+            if not name.startswith('catalogue-') or not name.endswith(('.pdf', '.pdf.tmp')):
+                continue
+            try:
+                pid = int(name[len('catalogue-'):].split('.', 1)[0])
+            except ValueError:
+                continue
+            if self._process_alive(pid):
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _process_alive(pid):
+        # Fișierul cu PID-ul nostru provine dintr-o rulare anterioară (ex. PID 1 în container)
+        if not pid or pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, OSError):
+            pass
+        return True
+
+    @staticmethod
+    def etag_for(fingerprint):
+        """ETag-ul (fără ghilimele) corespunzător unei amprente a băncii"""
+        return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()
+
+    def invalidate(self, ids=None):
+        """Renunță la PDF-ul curent (apelat după save/delete/clear)"""
+        with self._state_lock:
+            self._generation += 1
+            self._entry = None
+            self.invalidations += 1
+
+    def _open_current(self, fingerprint):
+        with self._state_lock:
+            entry = self._entry
+            if entry is None or entry['fingerprint'] != fingerprint:
+                return None, None
+            try:
+                return open(self.path, 'rb'), dict(entry)
+            except FileNotFoundError:
+                self._entry = None
+                return None, None
+
+    def open(self, fingerprint, rows_factory, on_error=None):
+        """
+        Returnează (fișier deschis pentru citire, {'fingerprint', 'etag', 'size'}).
+        Dacă PDF-ul curent nu corespunde amprentei, îl randează din rows_factory().
+        Fișierul deschis rămâne valid chiar dacă o randare ulterioară îl înlocuiește.
+        """
+        pdf_file, entry = self._open_current(fingerprint)
+        if pdf_file is not None:
+            self.hits += 1
+            return pdf_file, entry
+
+        with self._render_lock:
+            # Altă cerere poate să fi randat deja aceeași versiune cât am așteptat
+            pdf_file, entry = self._open_current(fingerprint)
+            if pdf_file is not None:
+                self.hits += 1
+                return pdf_file, entry
+
+            with self._state_lock:
+                generation = self._generation
+
+            tmp_path = self.path + '.tmp'
+            rows = rows_factory()
+            try:
+                self.exporter.build(rows, tmp_path, on_error=on_error)
+            finally:
+                if hasattr(rows, 'close'):
+                    rows.close()
+
+            with self._state_lock:
+                os.replace(tmp_path, self.path)
+                entry = {
+                    'fingerprint': fingerprint,
+                    'etag': self.etag_for(fingerprint),
+                    'size': os.path.getsize(self.path)
+                }
+                # O scriere în timpul randării: servim rezultatul, dar nu îl păstrăm
+                if generation == self._generation:
+                    self._entry = entry
+                self.renders += 1
+                return open(self.path, 'rb'), dict(entry)
+
+    def get_stats(self):
+        with self._state_lock:
+            return {
+                'hits': self.hits,
+                'renders': self.renders,
+                'invalidations': self.invalidations,
+                'cached': self._entry is not None,
+                'size': self._entry['size'] if self._entry else None
+            }
@@ -0,0 +1,239 @@
+"""
+Cache read-through pentru întrebări (LRU + TTL)
+Întrebările sunt imutabile după inserare, deci pot fi servite din memorie
+până la ștergere sau expirarea TTL-ului.
+
+Mai mulți workeri (gunicorn): fiecare proces are propriul nivel local. Ștergerile
+din alt worker sunt observate prin generația din baza de date (vezi
+QuestionDBManager._sync_cache_generation), verificată cel mult o dată la
+generation_check_interval secunde - deci o întrebare ștearsă mai poate fi servită
+de alt worker cel mult atât. Pentru un cache comun tuturor workerilor e nevoie de
+un store partajat real (Redis/Memcached) ca shared_store; LocalSharedStore nu e.
+"""
+import copy
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUTTLCache:
+    """Cache LRU thread-safe cu limită de elemente și expirare (TTL)"""
+
+    def __init__(self, max_size=5000, ttl=600.0):
+        if max_size < 1:
+            raise ValueError("max_size trebuie să fie cel puțin 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()     # cheie -> (valoare, expiră_la)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        """Returnează valoarea sau None dacă lipsește / a expirat"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class LocalSharedStore:
+    """
+    Înlocuitor local pentru un store partajat între workeri (ex. Redis/Memcached).
+    Expune aceeași interfață minimală: get/set/delete/delete_prefix, cu valori bytes.
+    ATENȚIE: datele rămân în procesul curent - NU sunt partajate între workeri.
+    Într-o instalare multi-worker se înlocuiește cu un client real care
+    implementează aceleași metode.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+
+# Valoarea implicită a QuestionCache.set: păstrează rândul indiferent de generație
+_ANY_GENERATION = object()
+
+
+class QuestionCache:
+    """
+    Cache pe două niveluri pentru rândurile complete din `questions`:
+    1. LRU/TTL în proces (fără serializare)
+    2. opțional, un store partajat între workeri (shared_store)
+
+    Valorile returnate sunt copii - apelanții le pot modifica liber.
+
+    generation_check_interval: secunde între verificările generației ștergerilor din
+    baza de date (None = fără verificare, potrivit doar pentru un singur proces).
+    """
+
+    KEY_PREFIX = 'question:'
+
+    def __init__(self, max_size=5000, ttl=600.0, shared_store=None, generation_check_interval=1.0):
+        self.local = LRUTTLCache(max_size=max_size, ttl=ttl)
+        self.shared_store = shared_store
+        self.ttl = ttl
+
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+        # Generația ștergerilor văzută ultima dată; schimbarea ei golește nivelul local
+        self.generation_check_interval = generation_check_interval
+        self.generation = None
+        self.generation_resets = 0
+        self._generation_checked_at = 0.0
+        self._generation_lock = threading.Lock()
+
+    def _shared_key(self, q_id):
+        return f"{self.KEY_PREFIX}{q_id}"
+
+    def _count(self, hits=0, misses=0, shared_hits=0):
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+            self.shared_hits += shared_hits
+
+    def get(self, q_id):
+        """Returnează o copie a întrebării din cache sau None"""
+        value = self.local.get(q_id)
+        if value is not None:
+            self._count(hits=1)
+            return copy.copy(value)
+
+        if self.shared_store is not None:
+            raw = self.shared_store.get(self._shared_key(q_id))
+            if raw is not None:
+                value = pickle.loads(raw)
+                self.local.set(q_id, value)
+                self._count(hits=1, shared_hits=1)
+                return copy.copy(value)
+
+        self._count(misses=1)
+        return None
+
+    def get_many(self, ids):
+        """Returnează ({id: întrebare} pentru cele găsite, [id-uri lipsă])"""
+        found = {}
+        missing = []
+        for q_id in ids:
+            value = self.get(q_id)
+            if value is None:
+                missing.append(q_id)
+            else:
+                found[q_id] = value
+        return found, missing
+
+    def set(self, q_id, question, generation=_ANY_GENERATION):
+        """
+        generation: generația citită înainte de interogarea DB - dacă între timp s-a
+        schimbat (ștergere în alt worker), rândul poate fi învechit și nu e păstrat.
+        """
+        value = dict(question)
+        with self._generation_lock:
+            if generation is not _ANY_GENERATION and generation != self.generation:
+                return
+            self.local.set(q_id, value)
+        if self.shared_store is not None:
+            self.shared_store.set(self._shared_key(q_id), pickle.dumps(value), ttl=self.ttl)
+
+    def invalidate(self, q_id):
+        self.local.delete(q_id)
+        if self.shared_store is not None:
+            self.shared_store.delete(self._shared_key(q_id))
+
+    def clear(self):
+        self.local.clear()
+        if self.shared_store is not None:
+            self.shared_store.delete_prefix(self.KEY_PREFIX)
+
+    # ======================= GENERAȚIA ȘTERGERILOR =======================
+
+    def generation_check_due(self):
+        """True pentru un singur apelant per interval: acela citește generația din DB"""
+        if self.generation_check_interval is None:
+            return False
+        now = time.monotonic()
+        with self._generation_lock:
+            if now - self._generation_checked_at < self.generation_check_interval:
+                return False
+            self._generation_checked_at = now
+            return True
+
+    def apply_generation(self, generation):
+        """Golește nivelul local dacă s-au șters întrebări (în orice proces) de la ultima verificare"""
+        with self._generation_lock:
+            if generation == self.generation:
+                return
+            self.generation = generation
+            self.generation_resets += 1
+            self.local.clear()
+
+    def get_stats(self):
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_hits': self.shared_hits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self.local),
+                'max_size': self.local.max_size,
+                'evictions': self.local.evictions,
+                'ttl': self.ttl,
+                'shared': self.shared_store is not None,
+                'generation_resets': self.generation_resets
+            }
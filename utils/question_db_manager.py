@@ -3,46 +3,415 @@ Manager pentru baza de date PostgreSQL - Întrebări AI
 Versiune modularizată pentru integrare cu Flask
 """
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, NamedTupleCursor, Json, execute_values
 from contextlib import contextmanager
 from datetime import datetime
+import base64
+import logging
+import random
+import threading
+import time
+import uuid
+
+from .db_pool import ConnectionPool
+from .question_cache import QuestionCache
+
+logger = logging.getLogger(__name__)
+
+# Tipurile cu rând inițial în question_stats (ca în schema.sql)
+QUESTION_STATS_TYPES = ('n-queens', 'hanoi', 'coloring', 'knight', 'nash', 'nash-mixed')
 
 
 class QuestionDBManager:
     """Clasă pentru gestionarea întrebărilor în PostgreSQL"""
 
-    def __init__(self, db_config):
+    def __init__(self, db_config, pool_config=None, id_index_ttl=60.0, cache_config=None, itersize=2000,
+                 metrics=None):
         """
-        Inițializare cu configurația bazei de date
+        Inițializare cu configurația bazei de date.
+        pool_config (opțional): dict cu argumente pentru ConnectionPool
+        (min_size, max_size, timeout, max_idle_time, ...). Dacă lipsește,
+        fiecare apel deschide și închide propria conexiune.
+        id_index_ttl: secunde după care indexul în memorie tip -> ID-uri
+        (folosit la eșantionarea testelor) este reîncărcat.
+        cache_config (opțional): dict cu argumente pentru QuestionCache
+        (max_size, ttl, shared_store) - cache read-through pentru citirile după ID.
+        itersize: rânduri aduse per drum la server de cursoarele pe server (metodele iter_*).
+        metrics (opțional): MetricsRegistry - măsoară fiecare interogare și așteptarea în pool.
         """
         self.db_config = db_config
+        self.itersize = itersize
+        self.metrics = metrics
+        self._connection_factory = metrics.connection_factory() if metrics else None
+        self.pool = ConnectionPool(db_config, connection_factory=self._connection_factory, **pool_config) \
+            if pool_config is not None else None
+
+        self.id_index_ttl = id_index_ttl
+        self._id_index = None
+        self._id_index_loaded_at = 0.0
+        self._id_index_lock = threading.Lock()
+
+        self.cache = QuestionCache(**cache_config) if cache_config is not None else None
+
+        # Funcții apelate după fiecare scriere: callback(ids) - ids=None înseamnă "toate"
+        self._change_listeners = []
 
     @contextmanager
     def get_connection(self):
         """Context manager pentru conexiuni sigure la baza de date"""
         conn = None
+        broken = False
         try:
-            conn = psycopg2.connect(**self.db_config)
+            start = time.perf_counter()
+            if self.pool:
+                conn = self.pool.getconn()
+            elif self._connection_factory:
+                conn = psycopg2.connect(connection_factory=self._connection_factory, **self.db_config)
+            else:
+                conn = psycopg2.connect(**self.db_config)
+            if self.metrics:
+                self.metrics.record_pool_wait(time.perf_counter() - start)
             yield conn
             conn.commit()
-        except Exception as e:
+        except BaseException as e:
+            # BaseException: și un generator abandonat (GeneratorExit) trebuie să facă rollback
             if conn:
-                conn.rollback()
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                broken = True
             raise e
         finally:
             if conn:
-                conn.close()
+                if self.pool:
+                    self.pool.putconn(conn, discard=broken)
+                else:
+                    conn.close()
+
+    def _iter_server_side(self, name, query, params=None, itersize=None, cursor_factory=NamedTupleCursor):
+        """
+        Generator peste rezultatul unei interogări citit printr-un cursor pe server
+        (named cursor): doar `itersize` rânduri sunt în memorie la un moment dat.
+        Implicit rândurile sunt namedtuple (mai ușoare decât dict-urile RealDictCursor).
+        Conexiunea rămâne ocupată până la epuizarea (sau închiderea) generatorului.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(name=name, cursor_factory=cursor_factory) as cursor:
+                cursor.itersize = itersize or self.itersize
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield row
+
+    def add_change_listener(self, callback):
+        """
+        Înregistrează callback(ids) apelat după save/delete/clear din acest proces
+        (ex. invalidarea PDF-ului din cache). ids=None înseamnă că s-au schimbat toate.
+        """
+        self._change_listeners.append(callback)
+
+    def _notify_change(self, ids=None):
+        for callback in self._change_listeners:
+            callback(ids)
+
+    def get_pool_stats(self):
+        """Returnează statisticile pool-ului de conexiuni (None în modul fără pool)"""
+        return self.pool.get_stats() if self.pool else None
+
+    def close(self):
+        """Închide toate conexiunile din pool"""
+        if self.pool:
+            self.pool.closeall()
+
+    # ======================= SCHEMA =======================
+
+    def ensure_schema(self):
+        """
+        Creează tabelele, indecșii și trigger-ul lipsă (idempotent) - aceeași schemă ca schema.sql.
+        Se rulează o singură dată la instalare/actualizare (`flask --app app init-db`),
+        nu la pornirea workerilor.
+        Returnează numărul întrebărilor duplicate (după titlu) eliminate înainte de indexul unic.
+        """
+        removed_ids = []
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS questions (
+                        id SERIAL PRIMARY KEY,
+                        type VARCHAR(50) NOT NULL,
+                        title VARCHAR(255) NOT NULL,
+                        question TEXT NOT NULL,
+                        correct_answer TEXT NOT NULL,
+                        explanation TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        game_data TEXT,
+                        nash_equilibria TEXT
+                    );
+                """)
+                # Coloane adăugate după prima versiune a tabelului:
+                # updated_at - folosit la amprenta exportului PDF
+                # game_data / nash_equilibria - datele jocului pentru întrebările Nash (JSON ca text)
+                cursor.execute("""
+                    ALTER TABLE questions
+                    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ADD COLUMN IF NOT EXISTS game_data TEXT,
+                    ADD COLUMN IF NOT EXISTS nash_equilibria TEXT;
+                """)
+                # O versiune anterioară a init-db crea coloanele ca TIMESTAMPTZ; le aducem la
+                # TIMESTAMP (ca în schema.sql), altfel cursoarele de paginare și filtrele de
+                # export pe dată s-ar compara diferit în funcție de cum a fost creată baza
+                cursor.execute("""
+                    DO $$
+                    BEGIN
+                        IF EXISTS (
+                            SELECT 1 FROM information_schema.columns
+                            WHERE table_schema = current_schema() AND table_name = 'questions'
+                              AND column_name IN ('created_at', 'updated_at')
+                              AND data_type = 'timestamp with time zone'
+                        ) THEN
+                            ALTER TABLE questions
+                                ALTER COLUMN created_at TYPE TIMESTAMP,
+                                ALTER COLUMN updated_at TYPE TIMESTAMP;
+                        END IF;
+                    END $$;
+                """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS question_stats (
+                        id SERIAL PRIMARY KEY,
+                        question_type VARCHAR(50) NOT NULL,
+                        total_generated INTEGER DEFAULT 0,
+                        last_generated TIMESTAMP,
+                        UNIQUE(question_type)
+                    );
+                """)
+                cursor.execute("""
+                    ALTER TABLE question_stats ADD COLUMN IF NOT EXISTS last_generated TIMESTAMP;
+                """)
+                execute_values(cursor, """
+                    INSERT INTO question_stats (question_type, total_generated)
+                    VALUES %s
+                    ON CONFLICT (question_type) DO NOTHING;
+                """, [(q_type, 0) for q_type in QUESTION_STATS_TYPES])
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_questions_type ON questions(type);
+                """)
+                # Index unic pe titlu - necesar pentru deduplicarea pe server (ON CONFLICT).
+                # O bază veche poate conține deja titluri duplicate: le eliminăm întâi
+                cursor.execute("SELECT to_regclass('idx_questions_title') IS NULL;")
+                if cursor.fetchone()[0]:
+                    removed_ids = self._remove_duplicate_titles(cursor)
+                cursor.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_title ON questions(title);
+                """)
+                # Constrângerea UNIQUE inline a versiunii anterioare a init-db dubla indexul de mai sus
+                cursor.execute("""
+                    ALTER TABLE questions DROP CONSTRAINT IF EXISTS questions_title_key;
+                """)
+                # Sortarea listei (paginare keyset) și filtrele pe dată ale exportului
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_questions_created ON questions(created_at DESC);
+                """)
+                cursor.execute("""
+                    CREATE OR REPLACE FUNCTION update_updated_at_column()
+                    RETURNS TRIGGER AS $$
+                    BEGIN
+                        NEW.updated_at = CURRENT_TIMESTAMP;
+                        RETURN NEW;
+                    END;
+                    $$ language 'plpgsql';
+                """)
+                cursor.execute("""
+                    DROP TRIGGER IF EXISTS update_questions_updated_at ON questions;
+                    CREATE TRIGGER update_questions_updated_at
+                        BEFORE UPDATE ON questions
+                        FOR EACH ROW
+                        EXECUTE FUNCTION update_updated_at_column();
+                """)
+                # Sesiuni de test - întrebările alese și cheia de răspuns precalculată
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS test_sessions (
+                        id VARCHAR(32) PRIMARY KEY,
+                        question_ids INTEGER[] NOT NULL,
+                        answer_key JSONB NOT NULL,
+                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                        expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                        submitted_at TIMESTAMP WITH TIME ZONE
+                    );
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_test_sessions_expires ON test_sessions(expires_at);
+                """)
+                # Generația ștergerilor - invalidează cache-urile de întrebări ale tuturor workerilor
+                cursor.execute("""
+                    CREATE SEQUENCE IF NOT EXISTS question_changes_seq;
+                """)
+
+        if removed_ids:
+            self._invalidate_id_index()
+            self._bump_cache_generation()
+            self._notify_change(removed_ids)
+        return len(removed_ids)
+
+    @staticmethod
+    def _remove_duplicate_titles(cursor):
+        """
+        Șterge întrebările cu titlu repetat, păstrând ID-ul cel mai mic pentru fiecare titlu,
+        și scade rândurile șterse din question_stats. Returnează ID-urile șterse.
+        """
+        cursor.execute("""
+            WITH deleted AS (
+                DELETE FROM questions q
+                USING questions keep
+                WHERE q.title = keep.title AND q.id > keep.id
+                RETURNING q.id, q.type
+            ), counts AS (
+                SELECT type, COUNT(*) AS n FROM deleted GROUP BY type
+            ), updated AS (
+                UPDATE question_stats s
+                SET total_generated = GREATEST(s.total_generated - c.n, 0)
+                FROM counts c
+                WHERE s.question_type = c.type
+            )
+            SELECT COALESCE(array_agg(id), '{}') FROM deleted;
+        """)
+        return cursor.fetchone()[0]
+
+    def check_schema(self):
+        """Returnează numele tabelelor necesare care lipsesc (listă goală = schema e completă)"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT name FROM unnest(%s::text[]) AS name
+                    WHERE to_regclass(name) IS NULL;
+                """, (['questions', 'question_stats', 'test_sessions'],))
+                return [row[0] for row in cursor.fetchall()]
+
+    def iter_existing_titles(self, itersize=None):
+        """Generator peste titlurile existente (șiruri simple), citite prin cursor pe server"""
+        for row in self._iter_server_side('existing_titles', "SELECT title FROM questions;",
+                                          itersize=itersize, cursor_factory=None):
+            yield row[0]
 
     def get_existing_titles(self):
         """
         Returnează un SET cu toate titlurile întrebărilor existente în baza de date.
-        Folosit pentru a filtra rapid duplicatele.
+        Folosit pentru a filtra rapid duplicatele (pentru seturi mari: filter_new_titles).
+        """
+        # Returnăm un set pentru căutare O(1)
+        return set(self.iter_existing_titles())
+
+    def filter_new_titles(self, titles):
+        """
+        Returnează titlurile din `titles` care NU există încă în baza de date.
+        Filtrarea se face pe server (anti-join pe un array de candidați), deci
+        nu se transferă titlurile existente. Ordinea candidaților e păstrată.
+        """
+        titles = list(titles)
+        if not titles:
+            return []
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT c.title
+                    FROM unnest(%s::text[]) WITH ORDINALITY AS c(title, pos)
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM questions q WHERE q.title = c.title
+                    )
+                    ORDER BY c.pos;
+                """, (titles,))
+                return [row[0] for row in cursor.fetchall()]
+
+    def save_questions_bulk(self, questions, page_size=500):
         """
+        Salvează un iterabil de întrebări într-o SINGURĂ tranzacție.
+        Rândurile sunt trimise în pagini de `page_size` (execute_values), fără
+        a materializa tot iterabilul; titlurile deja existente (sau repetate în
+        același lot) sunt raportate ca și conflicte, nu aruncă excepții.
+        Statisticile per tip sunt actualizate la final printr-un singur upsert.
+
+        Returnează: {'saved_ids': [...], 'saved_count': int,
+                     'conflicts': [{'index': i, 'title': titlu}, ...]}
+        """
+        saved_ids = []
+        saved_types = []
+        conflicts = []
+        type_counts = {}
+        seen_titles = set()
+        now = datetime.now()
+
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT title FROM questions;")
-                # Returnăm un set pentru căutare O(1)
-                return {row[0] for row in cursor.fetchall()}
+                page = []
+
+                def flush():
+                    inserted = execute_values(cursor, """
+                        INSERT INTO questions
+                        (title, question, correct_answer, explanation, type, game_data, nash_equilibria, created_at)
+                        VALUES %s
+                        ON CONFLICT (title) DO NOTHING
+                        RETURNING id, title, type;
+                    """, [row for _, row in page], page_size=len(page), fetch=True)
+
+                    inserted_titles = set()
+                    for new_id, title, q_type in inserted:
+                        saved_ids.append(new_id)
+                        saved_types.append(q_type)
+                        inserted_titles.add(title)
+                        type_counts[q_type] = type_counts.get(q_type, 0) + 1
+
+                    for index, row in page:
+                        if row[0] not in inserted_titles:
+                            conflicts.append({'index': index, 'title': row[0]})
+                    page.clear()
+
+                for index, q in enumerate(questions):
+                    if q['title'] in seen_titles:
+                        conflicts.append({'index': index, 'title': q['title']})
+                        continue
+                    seen_titles.add(q['title'])
+
+                    page.append((index, (
+                        q['title'],
+                        q['question'],
+                        q['correct_answer'],
+                        q['explanation'],
+                        q['type'],
+                        q.get('game_data', None),
+                        q.get('nash_equilibria', None),
+                        now
+                    )))
+                    if len(page) >= page_size:
+                        flush()
+
+                if page:
+                    flush()
+
+                self._increment_stats(cursor, type_counts)
+
+        if saved_ids:
+            self._update_id_index(added=zip(saved_ids, saved_types))
+            self._notify_change(saved_ids)
+
+        conflicts.sort(key=lambda c: c['index'])
+        return {
+            'saved_ids': saved_ids,
+            'saved_count': len(saved_ids),
+            'conflicts': conflicts
+        }
+
+    def _increment_stats(self, cursor, type_counts):
+        """Adaugă incrementele per tip în question_stats printr-un singur upsert"""
+        if not type_counts:
+            return
+        execute_values(cursor, """
+            INSERT INTO question_stats (question_type, total_generated)
+            VALUES %s
+            ON CONFLICT (question_type)
+            DO UPDATE SET total_generated = question_stats.total_generated + EXCLUDED.total_generated;
+        """, sorted(type_counts.items()))
 
     def save_question(self, question_data):
         """
@@ -75,80 +444,240 @@ class QuestionDBManager:
                 ))
                 new_id = cursor.fetchone()[0]
 
-                # 2. Actualizare/Creare în tabela question_stats
-                cursor.execute("SELECT total_generated FROM question_stats WHERE question_type = %s;", (question_data['type'],))
-                if cursor.fetchone():
-                    cursor.execute("""
-                        UPDATE question_stats SET total_generated = total_generated + 1
-                        WHERE question_type = %s;
-                    """, (question_data['type'],))
-                else:
-                    cursor.execute("""
-                        INSERT INTO question_stats (question_type, total_generated)
-                        VALUES (%s, 1);
-                    """, (question_data['type'],))
+                # 2. Incrementare atomică în question_stats (upsert, fără SELECT prealabil)
+                self._increment_stats(cursor, {question_data['type']: 1})
 
-                return new_id
+        self._update_id_index(added=[(new_id, question_data['type'])])
+        self._notify_change([new_id])
+        return new_id
+
+    def iter_all_questions(self, itersize=None):
+        """
+        Generator peste toate întrebările (doar meta-date), ca namedtuple
+        (id, title, type, created_at), citite prin cursor pe server.
+        """
+        return self._iter_server_side('all_questions', """
+            SELECT id, title, type, created_at
+            FROM questions 
+            ORDER BY created_at DESC, id DESC;
+        """, itersize=itersize)
 
     def get_all_questions(self):
         """
         Returnează toate întrebările. (Doar meta-date: id, title, type, created_at)
+        Pentru bănci mari folosiți iter_all_questions sau get_questions_page.
+        """
+        return [row._asdict() for row in self.iter_all_questions()]
+
+    # ======================= LISTARE PAGINATĂ (KEYSET) =======================
+
+    @staticmethod
+    def encode_page_cursor(created_at, q_id):
+        """Codifică poziția (created_at, id) a ultimului rând într-un cursor opac"""
+        raw = f"{created_at.isoformat()}|{q_id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_page_cursor(cursor_token):
+        """Decodifică un cursor; aruncă ValueError dacă este invalid"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor_token.encode('ascii')).decode('utf-8')
+            created_at, q_id = raw.rsplit('|', 1)
+            datetime.fromisoformat(created_at)
+            return created_at, int(q_id)
+        except Exception:
+            raise ValueError("Cursor de paginare invalid")
+
+    @staticmethod
+    def _listing_filters(q_type=None, title_prefix=None):
+        conditions = []
+        params = []
+        if q_type:
+            conditions.append("type = %s")
+            params.append(q_type)
+        if title_prefix:
+            escaped = title_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("title LIKE %s")
+            params.append(escaped + '%')
+        return conditions, params
+
+    def get_questions_page(self, page_size=50, cursor_token=None, q_type=None, title_prefix=None):
+        """
+        Returnează o pagină din lista scurtă de întrebări (id, title, type, created_at),
+        ordonată descrescător după (created_at, id), plus cursorul paginii următoare
+        (None dacă nu mai există rânduri). Paginarea e pe cheie, nu cu OFFSET.
         """
+        conditions, params = self._listing_filters(q_type, title_prefix)
+        if cursor_token:
+            created_at, last_id = self.decode_page_cursor(cursor_token)
+            conditions.append("(created_at, id) < (%s, %s)")
+            params.extend([created_at, last_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
         with self.get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                query = """
+                # Cerem un rând în plus ca să știm dacă există o pagină următoare
+                cursor.execute(f"""
                     SELECT id, title, type, created_at
-                    FROM questions 
-                    ORDER BY created_at DESC;
-                """
-                cursor.execute(query)
-                return cursor.fetchall()
+                    FROM questions
+                    {where}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT %s;
+                """, params + [page_size + 1])
+                rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = self.encode_page_cursor(last['created_at'], last['id'])
+
+        return rows, next_cursor
+
+    def count_questions(self, q_type=None, title_prefix=None, exact_limit=10000):
+        """
+        Numără ieftin întrebările care corespund filtrelor.
+        Returnează (număr, este_estimare). Fără filtre se folosește estimarea
+        din pg_class când tabela e mare; cu filtre numărătoarea se oprește la
+        exact_limit (rezultatul e atunci o limită inferioară).
+        """
+        conditions, params = self._listing_filters(q_type, title_prefix)
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                if not conditions:
+                    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = 'questions'::regclass;")
+                    estimate = cursor.fetchone()[0]
+                    if estimate is not None and estimate > exact_limit:
+                        return int(estimate), True
+
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                cursor.execute(f"""
+                    SELECT COUNT(*) FROM (
+                        SELECT 1 FROM questions {where} LIMIT %s
+                    ) AS limited;
+                """, params + [exact_limit + 1])
+                count = cursor.fetchone()[0]
+
+        if count > exact_limit:
+            return exact_limit, True
+        return count, False
+
+    # Coloanele păstrate în cache și returnate cu include_answer=True
+    FULL_QUESTION_COLUMNS = "id, title, question, correct_answer, explanation, type, game_data, nash_equilibria"
+    SHORT_QUESTION_FIELDS = ('id', 'title', 'question', 'type')
 
     def get_question_by_id(self, q_id, include_answer=True):
         """
         Returnează o întrebare după ID.
+        Cu cache activ, rândul complet e servit din memorie după prima citire.
         """
+        if self.cache:
+            self._sync_cache_generation()
+            cached = self.cache.get(q_id)
+            if cached is None:
+                generation = self.cache.generation
+                cached = self._fetch_question_full(q_id)
+                if cached is None:
+                    return None
+                self.cache.set(q_id, cached, generation=generation)
+                cached = dict(cached)
+            if include_answer:
+                return cached
+            return {field: cached[field] for field in self.SHORT_QUESTION_FIELDS}
+
+        if include_answer:
+            return self._fetch_question_full(q_id)
+
         with self.get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                if include_answer:
-                    query = """
-                        SELECT id, title, question, correct_answer, explanation, type, game_data, nash_equilibria
-                        FROM questions 
-                        WHERE id = %s;
-                    """
-                else:
-                    query = """
-                        SELECT id, title, question, type
-                        FROM questions 
-                        WHERE id = %s;
-                    """
+                query = """
+                    SELECT id, title, question, type
+                    FROM questions 
+                    WHERE id = %s;
+                """
                 cursor.execute(query, (q_id,))
                 return cursor.fetchone()
 
+    def _fetch_question_full(self, q_id):
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(f"""
+                    SELECT {self.FULL_QUESTION_COLUMNS}
+                    FROM questions 
+                    WHERE id = %s;
+                """, (q_id,))
+                return cursor.fetchone()
+
+    def get_cache_stats(self):
+        """Returnează statisticile cache-ului de întrebări (None dacă e dezactivat)"""
+        return self.cache.get_stats() if self.cache else None
+
+    # Generația curentă: 0 până la prima ștergere, apoi ultima valoare a secvenței
+    CACHE_GENERATION_QUERY = """
+        SELECT CASE WHEN is_called THEN last_value ELSE 0 END AS generation FROM question_changes_seq;
+    """
+
+    def _sync_cache_generation(self):
+        """
+        Citește (cel mult o dată la generation_check_interval) generația ștergerilor.
+        Dacă alt worker a șters întrebări între timp, cache-ul local e golit.
+        """
+        if not self.cache.generation_check_due():
+            return
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(self.CACHE_GENERATION_QUERY)
+                    generation = cursor.fetchone()[0]
+        except psycopg2.errors.UndefinedTable:
+            logger.warning("Lipsește question_changes_seq (rulați init-db) - "
+                           "ștergerile din alți workeri nu invalidează cache-ul local")
+            self.cache.generation_check_interval = None
+            return
+        self.cache.apply_generation(generation)
+
+    def _bump_cache_generation(self):
+        """
+        Avansează generația după ce ștergerea a fost confirmată (commit): ceilalți
+        workeri își golesc cache-ul la următoarea verificare. Apelat după commit,
+        altfel un worker ar putea reciti rândul încă vizibil sub generația nouă.
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT nextval('question_changes_seq');")
+        except psycopg2.errors.UndefinedTable:
+            pass
+
     def delete_question_by_id(self, q_id):
         """
         Șterge o întrebare după ID și actualizează statisticile.
+        Ștergerea și decrementarea contorului sunt o singură instrucțiune atomică.
         """
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                # 1. Obținem tipul întrebării înainte de a o șterge
-                cursor.execute("SELECT type FROM questions WHERE id = %s;", (q_id,))
-                result = cursor.fetchone()
-                if not result:
-                    return False
-
-                q_type = result[0]
-
-                # 2. Ștergem întrebarea
-                cursor.execute("DELETE FROM questions WHERE id = %s;", (q_id,))
-
-                # 3. Decrementăm contorul de statistici
                 cursor.execute("""
-                    UPDATE question_stats SET total_generated = total_generated - 1
-                    WHERE question_type = %s AND total_generated > 0;
-                    """, (q_type,))
+                    WITH deleted AS (
+                        DELETE FROM questions WHERE id = %s RETURNING type
+                    ), stats AS (
+                        UPDATE question_stats s SET total_generated = s.total_generated - 1
+                        FROM deleted d
+                        WHERE s.question_type = d.type AND s.total_generated > 0
+                    )
+                    SELECT type FROM deleted;
+                """, (q_id,))
+                row = cursor.fetchone()
+                deleted = row is not None
 
-                return True
+        if deleted:
+            self._update_id_index(removed=[(q_id, row[0])])
+            self._bump_cache_generation()
+            if self.cache:
+                self.cache.invalidate(q_id)
+            self._notify_change([q_id])
+        return deleted
 
 
     def get_count_by_type(self):
@@ -178,67 +707,304 @@ class QuestionDBManager:
     def clear_all_questions(self):
         """
         Șterge toate întrebările (ATENȚIE: operație periculoasă!)
+        Contoarele sunt decrementate cu exact câte rânduri s-au șters per tip,
+        în aceeași instrucțiune, astfel încât inserările concurente rămân numărate.
         """
         with self.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM questions;")
-                count = cursor.fetchone()[0]
-
-                cursor.execute("DELETE FROM questions;")
-                cursor.execute("UPDATE question_stats SET total_generated = 0;")
+                cursor.execute("""
+                    WITH deleted AS (
+                        DELETE FROM questions RETURNING type
+                    ), counts AS (
+                        SELECT type, COUNT(*) AS n FROM deleted GROUP BY type
+                    ), stats AS (
+                        UPDATE question_stats s
+                        SET total_generated = GREATEST(s.total_generated - c.n, 0)
+                        FROM counts c
+                        WHERE s.question_type = c.type
+                    )
+                    SELECT COALESCE(SUM(n), 0) FROM counts;
+                """)
+                count = int(cursor.fetchone()[0])
 
-                return count
+        self._invalidate_id_index()
+        self._bump_cache_generation()
+        if self.cache:
+            self.cache.clear()
+        self._notify_change(None)
+        return count
 
     # ======================= METODE PENTRU TEST =======================
 
-    def get_random_questions_by_type(self, q_type, count):
+    def _invalidate_id_index(self):
+        """Marchează indexul tip -> ID-uri ca expirat (după ștergeri în masă)"""
+        with self._id_index_lock:
+            self._id_index = None
+
+    def _update_id_index(self, added=(), removed=()):
         """
-        Returnează un număr specificat de întrebări (random) dintr-un anumit tip.
+        Actualizează incremental indexul tip -> ID-uri cu ID-urile cunoscute de scrieri
+        (perechi (id, tip)), fără a-l reciti din baza de date. Listele sunt înlocuite,
+        nu modificate pe loc, deci eșantionările în curs nu sunt afectate.
         """
+        with self._id_index_lock:
+            if self._id_index is None:
+                return  # încă neîncărcat: prima eșantionare îl citește complet
+            index = dict(self._id_index)
+
+            removed_by_type = {}
+            for q_id, q_type in removed:
+                removed_by_type.setdefault(q_type, set()).add(q_id)
+            for q_type, ids in removed_by_type.items():
+                if q_type in index:
+                    index[q_type] = [i for i in index[q_type] if i not in ids]
+
+            added_by_type = {}
+            for q_id, q_type in added:
+                added_by_type.setdefault(q_type, []).append(q_id)
+            for q_type, ids in added_by_type.items():
+                index[q_type] = index.get(q_type, []) + ids
+
+            self._id_index = index
+
+    def _get_id_index(self, refresh=False):
+        """
+        Returnează {tip: [id, ...]} pentru eșantionare. Scrierile din acest proces îl
+        actualizează incremental; reîncărcarea completă (doar ID-uri) are loc la expirarea
+        TTL-ului - plasa de siguranță pentru inserările altor procese.
+        """
+        with self._id_index_lock:
+            expired = time.monotonic() - self._id_index_loaded_at > self.id_index_ttl
+            if self._id_index is not None and not expired and not refresh:
+                return self._id_index
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT type, array_agg(id) FROM questions GROUP BY type;")
+                index = {q_type: ids for q_type, ids in cursor.fetchall()}
+
+        with self._id_index_lock:
+            self._id_index = index
+            self._id_index_loaded_at = time.monotonic()
+        return index
+
+    def _fetch_sample_rows(self, ids):
         with self.get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                query = """
-                    SELECT id, title, question, correct_answer, explanation, type
-                    FROM questions 
-                    WHERE type = %s
-                    ORDER BY RANDOM()
-                    LIMIT %s;
-                """
-                cursor.execute(query, (q_type, count))
+                cursor.execute("""
+                    SELECT id, title, question, correct_answer, explanation, type, nash_equilibria
+                    FROM questions
+                    WHERE id = ANY(%s);
+                """, (list(ids),))
                 return cursor.fetchall()
 
+    def get_random_questions_by_types(self, type_counts):
+        """
+        Eșantionează întrebări aleatorii pentru mai multe tipuri deodată.
+        type_counts: {tip: număr}. ID-urile sunt alese în memorie (fără ORDER BY RANDOM())
+        și rândurile sunt aduse într-o singură interogare după cheia primară.
+        Dacă indexul era învechit (ID-uri șterse de alt proces), ID-urile lipsă sunt
+        scoase din index și se eșantionează din nou; doar dacă lipsesc și a doua oară,
+        indexul e reîncărcat complet.
+        """
+        type_counts = {q_type: int(count) for q_type, count in type_counts.items() if int(count) > 0}
+        if not type_counts:
+            return []
+
+        rows = []
+        for attempt in range(3):
+            index = self._get_id_index(refresh=attempt == 2)
+            taken = {row['id'] for row in rows}
+
+            sampled = []
+            for q_type, count in type_counts.items():
+                available = [i for i in index.get(q_type, []) if i not in taken]
+                missing = count - sum(1 for row in rows if row['type'] == q_type)
+                if missing > 0 and available:
+                    sampled.extend((i, q_type) for i in random.sample(available, min(missing, len(available))))
+
+            if not sampled:
+                break
+
+            fetched = self._fetch_sample_rows([i for i, _ in sampled])
+            rows.extend(fetched)
+            if len(fetched) == len(sampled):
+                break
+
+            fetched_ids = {row['id'] for row in fetched}
+            self._update_id_index(removed=[(i, q_type) for i, q_type in sampled if i not in fetched_ids])
+
+        return rows
+
+    def get_random_questions_by_type(self, q_type, count):
+        """
+        Returnează un număr specificat de întrebări (random) dintr-un anumit tip.
+        """
+        return self.get_random_questions_by_types({q_type: count})
+
     def get_questions_by_ids(self, ids):
         """
         Returnează întrebările pentru o listă de ID-uri.
         Returnează un dicționar {id: question_data}.
+        Cu cache activ, doar ID-urile lipsă din cache sunt citite din DB.
         """
         if not ids:
             return {}
 
+        result = {}
+        missing = list(ids)
+        generation = None
+        if self.cache:
+            self._sync_cache_generation()
+            result, missing = self.cache.get_many(ids)
+            if not missing:
+                return result
+            generation = self.cache.generation
+
         with self.get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                query = """
-                    SELECT id, title, question, correct_answer, explanation, type, game_data, nash_equilibria
+                query = f"""
+                    SELECT {self.FULL_QUESTION_COLUMNS}
                     FROM questions 
                     WHERE id IN %s;
                 """
-                cursor.execute(query, (tuple(ids),))
+                cursor.execute(query, (tuple(missing),))
+
+                for q in cursor.fetchall():
+                    if self.cache:
+                        self.cache.set(q['id'], q, generation=generation)
+                        q = dict(q)
+                    result[q['id']] = q
+
+        return result
+
+    # ======================= SESIUNI DE TEST =======================
+
+    def create_test_session(self, entries, ttl=86400):
+        """
+        Salvează o sesiune de test cu cheia de răspuns precalculată.
+        entries: listă în ordinea testului de dict-uri {id, type, title, correct_answer,
+        explanation, answer_key} - tot ce trebuie pentru corectare și afișarea rezultatelor.
+        ttl: secunde după care sesiunea expiră (sesiunile expirate sunt șterse aici).
+        Returnează id-ul sesiunii.
+        """
+        session_id = uuid.uuid4().hex
+        answer_key = {str(entry['id']): {k: v for k, v in entry.items() if k != 'id'} for entry in entries}
 
-                return {q['id']: q for q in cursor.fetchall()}
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DELETE FROM test_sessions WHERE expires_at < NOW();")
+                cursor.execute("""
+                    INSERT INTO test_sessions (id, question_ids, answer_key, expires_at)
+                    VALUES (%s, %s, %s, NOW() + %s * INTERVAL '1 second');
+                """, (session_id, [entry['id'] for entry in entries], Json(answer_key), ttl))
+        return session_id
+
+    def get_test_session(self, session_id, mark_submitted=False):
+        """
+        Returnează sesiunea (id, question_ids, answer_key {id_str: intrare}, created_at,
+        submitted_at) sau None dacă nu există / a expirat. Cu mark_submitted=True
+        înregistrează și momentul primei trimiteri, în aceeași instrucțiune.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if mark_submitted:
+                    cursor.execute("""
+                        UPDATE test_sessions SET submitted_at = COALESCE(submitted_at, NOW())
+                        WHERE id = %s AND expires_at > NOW()
+                        RETURNING id, question_ids, answer_key, created_at, submitted_at;
+                    """, (session_id,))
+                else:
+                    cursor.execute("""
+                        SELECT id, question_ids, answer_key, created_at, submitted_at
+                        FROM test_sessions
+                        WHERE id = %s AND expires_at > NOW();
+                    """, (session_id,))
+                return cursor.fetchone()
 
     # ======================= METODĂ NOUĂ PENTRU EXPORT PDF =======================
 
+    def _export_filters(self, q_types=None, ids=None, date_from=None, date_to=None):
+        """
+        Condiții WHERE pentru export (toate opționale, combinate cu AND):
+        q_types - listă de tipuri (idx_questions_type), ids - listă de ID-uri (cheia primară),
+        date_from / date_to - interval [date_from, date_to) pe created_at (idx_questions_created)
+        """
+        conditions = []
+        params = []
+        if q_types:
+            conditions.append("type = ANY(%s)")
+            params.append(list(q_types))
+        if ids:
+            conditions.append("id = ANY(%s)")
+            params.append(list(ids))
+        if date_from:
+            conditions.append("created_at >= %s")
+            params.append(date_from)
+        if date_to:
+            conditions.append("created_at < %s")
+            params.append(date_to)
+        return conditions, params
+
+    def iter_questions_full(self, itersize=None, q_types=None, ids=None, date_from=None, date_to=None, limit=None):
+        """
+        Generator peste întrebări (cu răspuns și explicație), ca namedtuple, citite printr-un
+        cursor pe server în loturi de `itersize` rânduri, astfel încât memoria rămâne
+        constantă indiferent de mărimea băncii. Folosit pentru exportul PDF.
+        Filtrele (vezi _export_filters) și `limit` sunt aplicate în SQL. Cu `ids`,
+        întrebările vin în ordinea listei (ex. ordinea dintr-un test), altfel cele mai noi primele.
+        """
+        conditions, params = self._export_filters(q_types, ids, date_from, date_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if ids:
+            order_by = "array_position(%s, id)"
+            params.append(list(ids))
+        else:
+            order_by = "created_at DESC"
+
+        limit_sql = ""
+        if limit:
+            limit_sql = "LIMIT %s"
+            params.append(limit)
+
+        return self._iter_server_side('questions_full_export', f"""
+            SELECT id, title, question, correct_answer, explanation, type, created_at, updated_at
+            FROM questions 
+            {where}
+            ORDER BY {order_by}
+            {limit_sql};
+        """, params, itersize=itersize)
+
+    def count_export_questions(self, q_types=None, ids=None, date_from=None, date_to=None, limit=None):
+        """Numărul de întrebări pe care le-ar exporta iter_questions_full cu aceleași filtre"""
+        conditions, params = self._export_filters(q_types, ids, date_from, date_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM questions {where};", params)
+                count = cursor.fetchone()[0]
+        return min(count, limit) if limit else count
+
+    def get_catalogue_fingerprint(self):
+        """
+        Returnează (amprentă, număr de întrebări) pentru conținutul exportului PDF.
+        Amprenta e (număr, ID maxim, updated_at maxim): ID-urile vin dintr-o secvență,
+        iar trigger-ul actualizează updated_at, deci orice inserare, ștergere sau
+        modificare (inclusiv din alte procese) o schimbă - fără a citi toate rândurile.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT COUNT(*), MAX(id), MAX(updated_at)
+                    FROM questions;
+                """)
+                count, max_id, max_updated = cursor.fetchone()
+                return f"{count}:{max_id}:{max_updated}", count
+
     def get_all_questions_full(self):
         """
         Returnează TOATE întrebările, inclusiv răspunsul și explicația.
-        Folosit pentru exportul PDF.
+        Pentru export se folosește iter_questions_full (memorie constantă).
         """
-        with self.get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                query = """
-                    SELECT id, title, question, correct_answer, explanation, type, created_at
-                    FROM questions 
-                    ORDER BY created_at DESC;
-                """
-                cursor.execute(query)
-                return cursor.fetchall()
\ No newline at end of file
+        return [row._asdict() for row in self.iter_questions_full()]
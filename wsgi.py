@@ -0,0 +1,23 @@
+"""
+Punct de intrare WSGI pentru producție (mai mulți workeri, pre-fork)
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Cu preload_app (gunicorn.conf.py), modulul e importat o singură dată în procesul
+master: serviciile sunt construite și cache-urile (universul de întrebări, cheile
+de răspuns ale evaluatorului) sunt încălzite înainte de fork, deci memoria lor e
+partajată copy-on-write de toți workerii. Conexiunile la DB, cache-ul PDF și coada
+de joburi sunt create în fiecare worker după fork (app.init_worker).
+
+Schema bazei de date se creează separat, o singură dată: flask --app app init-db
+"""
+import gc
+
+from app import create_app, warm_caches
+
+application = create_app()
+warm_caches()
+
+# Obiectele de până aici trec în generația permanentă: colectările GC din workeri nu le
+# mai parcurg și nu le mai scriu antetele, deci nu mai provoacă copy-on-write pentru ele.
+# Refcount-urile se modifică în continuare la fiecare citire - unele pagini tot se copiază
+gc.freeze()